@@ -44,4 +44,9 @@ class Args:
 
     def get_args(self, args: Optional[List[str]] = None) -> argparse.Namespace:
         """Get parsed command-line arguments."""
-        return self.parser.parse_args(args)
+        parsed_args = self.parser.parse_args(args)
+        if getattr(parsed_args, "changed_lines_only", False) and not getattr(
+            parsed_args, "changed_since", None
+        ):
+            self.parser.error("--changed-lines-only requires --changed-since")
+        return parsed_args
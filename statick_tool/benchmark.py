@@ -0,0 +1,573 @@
+"""
+Benchmark the Statick core on synthetic packages.
+
+A package is generated with a configurable number of files, directory depth
+and mix of languages, along with output for tool plugins that lists issues in
+those files. Discovery, the parse_output of each tool plugin, the exception
+filter, and each reporting plugin are timed separately, without running any
+tools. Discovery is timed both with the cache of file types empty and with it
+filled by the previous discovery. Starting Statick, by importing it, finding its
+plugins and gathering their arguments, is timed in fresh interpreters. Results
+are saved as JSON and can be compared with an earlier run to flag regressions.
+
+Run with ``python -m statick_tool.benchmark``.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from statick_tool import __version__
+from statick_tool.discovery_plugin import DiscoveryPlugin
+from statick_tool.file_classifier import FileClassifier
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+from statick_tool.plugin_context import PluginContext
+from statick_tool.statick import Statick
+
+# Extension, lines before and after the body, line template and NOLINT
+# comment of the files generated for each language.
+LANGUAGES = OrderedDict(
+    [
+        ("c", (".c", [], [], "int value_{0} = {0};", "  // NOLINT")),
+        ("cpp", (".cpp", [], [], "static int value_{0} = {0};", "  // NOLINT")),
+        ("python", (".py", [], [], "VALUE_{0} = {0}", "  # NOLINT")),
+        ("shell", (".sh", ["#!/bin/sh"], [], "echo {0}", "  # NOLINT")),
+        ("yaml", (".yaml", ["---"], [], "key_{0}: {0}", "  # NOLINT")),
+        ("xml", (".xml", ["<root>"], ["</root>"], '<item id="{0}"/>', "")),
+    ]
+)  # type: Dict[str, Tuple[str, List[str], List[str], str, str]]
+
+# Languages of the files each tool reports issues in, how its output is passed
+# to parse_output, and the line template of its output.
+TOOL_OUTPUTS = OrderedDict(
+    [
+        (
+            "pylint",
+            (
+                ["python"],
+                "lines",
+                "{file}:{line}: [W0612(unused-variable), f] Unused variable 'value'",
+            ),
+        ),
+        (
+            "pycodestyle",
+            (
+                ["python"],
+                "lines",
+                "{file}:{line}: [E501] line too long (88 > 79 characters)",
+            ),
+        ),
+        (
+            "yamllint",
+            (
+                ["yaml"],
+                "lines",
+                "{file}:{line}:1: [warning] too many spaces after colon (colons)",
+            ),
+        ),
+        (
+            "xmllint",
+            (
+                ["xml"],
+                "lines",
+                "{file}:{line}: parser error : Opening and ending tag mismatch",
+            ),
+        ),
+        (
+            "flawfinder",
+            (
+                ["c", "cpp"],
+                "lines",
+                "{file}:{line}:  [2]  (buffer) char:  Statically-sized arrays can "
+                "be improperly restricted.",
+            ),
+        ),
+        (
+            "cppcheck",
+            (
+                ["c", "cpp"],
+                "text",
+                "[{file}:{line}]: (style unreadVariable) Variable 'value' is "
+                "assigned a value that is never used.",
+            ),
+        ),
+        (
+            "cpplint",
+            (
+                ["c", "cpp"],
+                "text",
+                "{file}:{line}:  Missing space before {{  [whitespace/braces] [5]",
+            ),
+        ),
+        (
+            "clang-tidy",
+            (
+                ["c", "cpp"],
+                "text",
+                "{file}:{line}:5: warning: variable 'value' is not initialized "
+                "[cppcoreguidelines-init-variables]",
+            ),
+        ),
+        (
+            "make",
+            (
+                ["c", "cpp"],
+                "package",
+                "{file}:{line}:5: warning: unused variable 'value' "
+                "[-Wunused-variable]",
+            ),
+        ),
+    ]
+)  # type: Dict[str, Tuple[List[str], str, str]]
+
+# Number of subdirectories in each directory of a generated package.
+BRANCHING = 4
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Parse a language mix such as c=2,python=1 into weights by language."""
+    mix = OrderedDict()  # type: Dict[str, int]
+    for item in value.split(","):
+        language, _, weight = item.partition("=")
+        language = language.strip()
+        if language not in LANGUAGES:
+            raise ValueError("Unknown language {}".format(language))
+        mix[language] = int(weight) if weight else 1
+    return mix
+
+
+def generate_package(
+    path: str,
+    files: int,
+    depth: int,
+    mix: Mapping[str, int],
+    lines: int = 40,
+    seed: int = 0,
+) -> Dict[str, List[str]]:
+    """
+    Generate a package of source files at path.
+
+    Files are spread over directories up to depth levels deep and their
+    languages are picked with the weights in mix. Every tenth line has a NOLINT
+    comment. Returns the paths of the generated files by language.
+    """
+    rng = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "package.xml"), "w") as fname:
+        fname.write(
+            '<?xml version="1.0"?>\n<package format="2">\n'
+            "  <name>{}</name>\n</package>\n".format(os.path.basename(path))
+        )
+    population = [language for language in mix for _ in range(mix[language])]
+    generated = OrderedDict(
+        (language, []) for language in mix
+    )  # type: Dict[str, List[str]]
+    for index in range(files):
+        language = rng.choice(population)
+        extension, header, footer, template, nolint = LANGUAGES[language]
+        directory = os.path.join(
+            path,
+            *[
+                "dir{}".format(rng.randrange(BRANCHING))
+                for _ in range(rng.randint(0, depth))
+            ]
+        )
+        os.makedirs(directory, exist_ok=True)
+        filename = os.path.join(directory, "file{}{}".format(index, extension))
+        body = [
+            template.format(line) + (nolint if line % 10 == 0 else "")
+            for line in range(lines)
+        ]
+        with open(filename, "w") as fname:
+            fname.write("\n".join(header + body + footer) + "\n")
+        generated[language].append(filename)
+    return generated
+
+
+def generate_tool_output(
+    tool: str, files: Mapping[str, List[str]], issues: int, lines: int, seed: int = 0
+) -> str:
+    """
+    Generate output of a tool listing issues in the generated files.
+
+    Returns an empty string if there are no files the tool reports issues in.
+    """
+    rng = random.Random(seed)
+    languages, _, template = TOOL_OUTPUTS[tool]
+    tool_files = [
+        filename for language in languages for filename in files.get(language, [])
+    ]
+    if not tool_files:
+        return ""
+    return "\n".join(
+        template.format(
+            file=tool_files[index % len(tool_files)], line=rng.randint(1, lines)
+        )
+        for index in range(issues)
+    )
+
+
+def parse_tool_output(plugin: Any, package: Package, output: str) -> List[Issue]:
+    """Pass generated output to the parse_output of a tool plugin."""
+    style = TOOL_OUTPUTS[plugin.get_name()][1]
+    if style == "lines":
+        return plugin.parse_output([output])  # type: ignore
+    if style == "package":
+        return plugin.parse_output(package, output)  # type: ignore
+    return plugin.parse_output(output)  # type: ignore
+
+
+@contextlib.contextmanager
+def quiet() -> Iterator[None]:
+    """
+    Discard what plugins print and pause garbage collection.
+
+    Like timeit, garbage is collected before and not during a timed step, so
+    steps aren't charged for collecting the garbage of earlier steps.
+    """
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(os.devnull, "w") as devnull:
+            with contextlib.redirect_stdout(devnull):
+                yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+# Times starting Statick in a fresh interpreter, and prints the times and the
+# plugins imported as JSON.
+STARTUP_SCRIPT = """
+import argparse
+import json
+import time
+
+times = [(time.perf_counter(), time.process_time())]
+from statick_tool.statick import Statick
+times.append((time.perf_counter(), time.process_time()))
+statick = Statick([])
+times.append((time.perf_counter(), time.process_time()))
+statick.gather_args(argparse.ArgumentParser())
+times.append((time.perf_counter(), time.process_time()))
+plugins = [statick.discovery_plugins, statick.tool_plugins, statick.reporting_plugins]
+print(json.dumps({
+    "times": [
+        [end[0] - start[0], end[1] - start[1]] for start, end in zip(times, times[1:])
+    ],
+    "imported_plugins": sorted(
+        name for category in plugins for name in category if category.is_loaded(name)
+    ),
+}))
+"""
+STARTUP_STEPS = ["import", "find_plugins", "gather_args"]
+
+
+def run_startup() -> Dict[str, Any]:
+    """Start Statick in a fresh interpreter and get its startup times."""
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(
+        [root] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+    )
+    output = subprocess.check_output(
+        [sys.executable, "-c", STARTUP_SCRIPT], env=env, universal_newlines=True
+    )
+    startup = json.loads(output.splitlines()[-1])  # type: Dict[str, Any]
+    return startup
+
+
+def run_startup_benchmarks(repeat: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Time starting Statick repeat times.
+
+    Returns the median and minimum wall time and the median CPU time of each
+    step, keyed by startup/step, and the number of plugins imported to gather
+    arguments.
+    """
+    runs = [run_startup() for _ in range(repeat)]
+    results = OrderedDict()  # type: Dict[str, Dict[str, Any]]
+    for index, step in enumerate(STARTUP_STEPS):
+        results["startup/" + step] = OrderedDict(
+            [
+                (
+                    "wall_time",
+                    statistics.median(run["times"][index][0] for run in runs),
+                ),
+                ("min_wall_time", min(run["times"][index][0] for run in runs)),
+                ("cpu_time", statistics.median(run["times"][index][1] for run in runs)),
+                ("repeat", repeat),
+            ]
+        )
+    results["startup/gather_args"]["imported_plugins"] = len(
+        runs[0]["imported_plugins"]
+    )
+    return results
+
+
+def run_benchmarks(  # pylint: disable=too-many-arguments, too-many-locals
+    statick: Statick,
+    args: argparse.Namespace,
+    path: str,
+    files: Mapping[str, List[str]],
+    level: str,
+    issue_count: int,
+    lines: int,
+    repeat: int,
+    seed: int = 0,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Time discovery, parsing, filtering and reporting on a generated package.
+
+    The output of each tool lists issue_count issues in the files generated in
+    the package at path. Each step is run repeat times, using the Statick
+    arguments args. Discovery is timed as discovery/all with an empty cache of
+    file types, then as discovery/warm with the cache filled. Returns the median
+    and minimum wall time, the median CPU time and the number of issues of each
+    step, keyed by phase/name.
+    """
+    assert statick.config is not None
+    plugin_context = PluginContext(args, statick.resources, statick.config)
+    outputs = OrderedDict(
+        (tool, generate_tool_output(tool, files, issue_count, lines, seed))
+        for tool in TOOL_OUTPUTS
+        if tool in statick.tool_plugins
+    )
+    counts = {}  # type: Dict[str, int]
+    timings = statick.timings
+    timings.package = os.path.basename(path)
+    first = len(timings)
+    for _ in range(repeat):
+        # Each discovery indexes a new package. The first starts without any
+        # cached file types, and the second reuses those the first found.
+        DiscoveryPlugin.file_classifier = FileClassifier()
+        for name in ["all", "warm"]:
+            package = Package(os.path.basename(path), path)
+            with quiet():
+                with timings.measure("discovery", name):
+                    if not statick.run_discovery_plugins(
+                        package, level, plugin_context
+                    ):
+                        raise ValueError("Unable to run discovery plugins")
+
+        issues = OrderedDict()  # type: Dict[str, List[Issue]]
+        for tool, output in outputs.items():
+            plugin = statick.tool_plugins[tool]
+            plugin.set_plugin_context(plugin_context)
+            with quiet(), timings.measure("parse_output", tool):
+                issues[tool] = parse_tool_output(plugin, package, output)
+            counts["parse_output/" + tool] = len(issues[tool])
+
+        if statick.exceptions is not None:
+            to_filter = {
+                tool: list(tool_issues) for tool, tool_issues in issues.items()
+            }
+            with quiet(), timings.measure("filter", "exceptions"):
+                issues = statick.exceptions.filter_issues(package, to_filter)
+            counts["filter/exceptions"] = sum(len(value) for value in issues.values())
+
+        for name, plugin in statick.reporting_plugins.items():
+            plugin.set_plugin_context(plugin_context)
+            with quiet(), timings.measure("reporting", name):
+                plugin.report(package, issues, level)
+
+    measured = OrderedDict()  # type: Dict[str, List[Any]]
+    for timing in timings.get_timings()[first:]:
+        measured.setdefault(timing.phase + "/" + timing.name, []).append(timing)
+    results = OrderedDict()  # type: Dict[str, Dict[str, Any]]
+    for key, key_timings in measured.items():
+        results[key] = OrderedDict(
+            [
+                (
+                    "wall_time",
+                    statistics.median(timing.wall_time for timing in key_timings),
+                ),
+                ("min_wall_time", min(timing.wall_time for timing in key_timings)),
+                (
+                    "cpu_time",
+                    statistics.median(timing.cpu_time for timing in key_timings),
+                ),
+                ("repeat", len(key_timings)),
+            ]
+        )
+        if key in counts:
+            results[key]["issues"] = counts[key]
+    return results
+
+
+def compare_results(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    threshold: float,
+    min_time: float = 0.01,
+) -> List[str]:
+    """
+    Compare benchmark results with earlier results.
+
+    A step regressed if its minimum wall time, which varies less between runs
+    than the median, grew by more than threshold, as a fraction, and by more
+    than min_time seconds, so noise in very short steps is not flagged. Returns
+    a description of each regression.
+    """
+    regressions = []  # type: List[str]
+    baseline_results = baseline.get("results", {})
+    for key, result in current.get("results", {}).items():
+        if key not in baseline_results:
+            continue
+        before = baseline_results[key]["min_wall_time"]
+        after = result["min_wall_time"]
+        if after > before * (1 + threshold) and after - before > min_time:
+            regressions.append(
+                "{}: {:.4f}s -> {:.4f}s ({:+.0%})".format(
+                    key, before, after, (after - before) / before if before else 1
+                )
+            )
+    return regressions
+
+
+def get_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the benchmark arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Statick core on a synthetic package"
+    )
+    parser.add_argument(
+        "--files", type=int, default=1000, help="Number of files to generate"
+    )
+    parser.add_argument(
+        "--depth", type=int, default=3, help="Maximum depth of generated directories"
+    )
+    parser.add_argument(
+        "--lines", type=int, default=40, help="Number of lines in each file"
+    )
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix(",".join(LANGUAGES)),
+        help="Weights of the languages of generated files, such as c=2,python=1 "
+        "(languages: {})".format(", ".join(LANGUAGES)),
+    )
+    parser.add_argument(
+        "--issues",
+        type=int,
+        default=10000,
+        help="Number of issues in the generated output of each tool",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of times to run each step"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed for generating the package"
+    )
+    parser.add_argument(
+        "--level", default="sei_cert", help="Level whose plugins are benchmarked"
+    )
+    parser.add_argument(
+        "--package-directory",
+        help="Generate the package here and keep it, instead of in a temporary "
+        "directory",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--compare", help="Compare the results with those in this JSON file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Fraction a step can slow down by before it is a regression",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:  # pylint: disable=too-many-locals
+    """Run the benchmarks and return 1 if any step regressed."""
+    args = get_args(argv)
+    results = run_startup_benchmarks(args.repeat)
+    statick = Statick([])
+    with tempfile.TemporaryDirectory(prefix="statick-benchmark-") as tmp_dir:
+        parser = argparse.ArgumentParser()
+        statick.gather_args(parser)
+        statick_args = parser.parse_args(["--output-directory", tmp_dir])
+        statick.get_config(statick_args)
+        statick.get_exceptions(statick_args)
+
+        path = os.path.abspath(
+            args.package_directory or os.path.join(tmp_dir, "benchmark_package")
+        )
+        files = generate_package(
+            path, args.files, args.depth, args.mix, args.lines, args.seed
+        )
+        results.update(
+            run_benchmarks(
+                statick,
+                statick_args,
+                path,
+                files,
+                args.level,
+                args.issues,
+                args.lines,
+                args.repeat,
+                args.seed,
+            )
+        )
+
+    report = OrderedDict(
+        [
+            ("statick_version", __version__),
+            ("python_version", platform.python_version()),
+            ("platform", sys.platform),
+            (
+                "parameters",
+                OrderedDict(
+                    [
+                        ("files", args.files),
+                        ("depth", args.depth),
+                        ("lines", args.lines),
+                        ("mix", args.mix),
+                        ("issues", args.issues),
+                        ("repeat", args.repeat),
+                        ("seed", args.seed),
+                        ("level", args.level),
+                    ]
+                ),
+            ),
+            ("results", results),
+        ]
+    )
+    for key, result in results.items():
+        print(
+            "{:40} {:10.4f}s {:10.4f}s".format(
+                key, result["wall_time"], result["cpu_time"]
+            )
+        )
+    if args.output:
+        with open(args.output, "w") as fname:
+            json.dump(report, fname, indent=2)
+            fname.write("\n")
+
+    if args.compare:
+        with open(args.compare, "r") as fname:
+            baseline = json.load(fname)
+        if baseline.get("parameters") != report["parameters"]:
+            print("Warning: results were measured with different parameters.")
+        regressions = compare_results(baseline, report, args.threshold)
+        for regression in regressions:
+            print("Regression: " + regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
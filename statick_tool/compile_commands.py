@@ -0,0 +1,215 @@
+"""
+Find the C/C++ targets of a package from an existing CMake build.
+
+Configuring a package with CMake only to find its targets can take minutes.
+Packages that were already built, for example by colcon or catkin, have that
+information in their build directory: in a compilation database
+(compile_commands.json) or in a reply of the CMake File API. Reading those
+directly gives the targets, sources and include directories of a package in
+milliseconds.
+"""
+import collections
+import glob
+import json
+import os
+import re
+import shlex
+from typing import Any, Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+COMPILE_COMMANDS = "compile_commands.json"
+# Location of CMake File API replies in a build directory.
+REPLY_DIR = os.path.join(".cmake", "api", "v1", "reply")
+# Object files generated by CMake are in a directory named after their target.
+OBJECT_TARGET_RE = re.compile(
+    r"CMakeFiles[/\\]([^/\\]+)\.dir[/\\]"
+)  # type: Pattern[str]
+INCLUDE_FLAGS = ("-I", "-isystem", "-iquote", "-idirafter")
+
+BuildInfo = NamedTuple(
+    "BuildInfo",
+    [
+        ("bin_dir", str),
+        ("targets", List[Dict[str, Any]]),
+        ("compile_commands", Optional[str]),
+    ],
+)
+
+# Parsed JSON files by path, with the modification time and size they had when
+# they were read, so a workspace-wide compilation database is only parsed once.
+JSON_CACHE = {}  # type: Dict[str, Tuple[int, int, Any]]
+
+
+def load_json(path: str) -> Any:
+    """Load a JSON file, reusing the result while the file is unchanged."""
+    stat = os.stat(path)
+    cached = JSON_CACHE.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    with open(path, "r") as fname:
+        data = json.load(fname)
+    JSON_CACHE[path] = (stat.st_mtime_ns, stat.st_size, data)
+    return data
+
+
+def load_build_info(
+    path: str, package_path: str, package_name: str
+) -> Optional[BuildInfo]:
+    """
+    Get the targets of a package from an existing build.
+
+    The path is a compile_commands.json file, a CMake File API reply directory,
+    or a build directory containing either one. A File API reply is preferred,
+    since it has the real target names. If path has a subdirectory named after
+    the package, as the build base of a colcon or catkin workspace does, that is
+    searched first. Only sources inside the package are used, so a database
+    covering a whole workspace works too. Returns None if nothing was found.
+    """
+    if os.path.isfile(path):
+        return read_compile_commands(path, package_path)
+    for build_dir in [os.path.join(path, package_name), path]:
+        for reply_dir in [os.path.join(build_dir, REPLY_DIR), build_dir]:
+            if glob.glob(os.path.join(reply_dir, "index-*.json")):
+                build_info = read_file_api(reply_dir, package_path)
+                if build_info is not None:
+                    return build_info
+        compile_commands = os.path.join(build_dir, COMPILE_COMMANDS)
+        if os.path.isfile(compile_commands):
+            return read_compile_commands(compile_commands, package_path)
+    return None
+
+
+def is_in_package(path: str, package_path: str) -> bool:
+    """Check whether path is inside the package."""
+    return os.path.realpath(path).startswith(
+        os.path.join(os.path.realpath(package_path), "")
+    )
+
+
+def get_include_dirs(arguments: List[str], directory: str) -> List[str]:
+    """Get the include directories passed to a compiler."""
+    include_dirs = []  # type: List[str]
+    remaining = iter(arguments)
+    for argument in remaining:
+        for flag in INCLUDE_FLAGS:
+            if argument == flag:
+                include_dir = next(remaining, None)  # type: Optional[str]
+            elif argument.startswith(flag):
+                include_dir = argument[len(flag) :]
+            else:
+                continue
+            if include_dir:
+                include_dirs.append(
+                    os.path.normpath(os.path.join(directory, include_dir))
+                )
+            break
+    return include_dirs
+
+
+def add_unique(values: List[str], new_values: List[str]) -> None:
+    """Add new_values to values, leaving out values that are already there."""
+    for value in new_values:
+        if value not in values:
+            values.append(value)
+
+
+def read_compile_commands(path: str, package_path: str) -> Optional[BuildInfo]:
+    """
+    Get the targets of a package from a compilation database.
+
+    Sources are grouped into targets by the directory CMake puts their object
+    files in. Sources whose target can't be found are put in a target named
+    after the package.
+    """
+    try:
+        entries = load_json(path)
+        targets = collections.OrderedDict()  # type: Dict[str, Dict[str, Any]]
+        for entry in entries:
+            directory = entry.get("directory", os.path.dirname(path))
+            src = os.path.normpath(os.path.join(directory, entry["file"]))
+            if not is_in_package(src, package_path):
+                continue
+            if "arguments" in entry:
+                arguments = list(entry["arguments"])
+            else:
+                arguments = shlex.split(entry["command"])
+            output = entry.get("output")
+            if output is None and "-o" in arguments[:-1]:
+                output = arguments[arguments.index("-o") + 1]
+            match = OBJECT_TARGET_RE.search(output or "")
+            name = match.group(1) if match else os.path.basename(package_path)
+            target = targets.setdefault(
+                name,
+                {
+                    "name": name,
+                    "src_dir": package_path,
+                    "include_dirs": [],
+                    "src": [],
+                },
+            )
+            add_unique(target["src"], [src])
+            add_unique(target["include_dirs"], get_include_dirs(arguments, directory))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as ex:
+        print("Unable to read compilation database {}: {}".format(path, ex))
+        return None
+    path = os.path.abspath(path)
+    return BuildInfo(os.path.dirname(path), list(targets.values()), path)
+
+
+def read_file_api(reply_dir: str, package_path: str) -> Optional[BuildInfo]:
+    """
+    Get the targets of a package from a CMake File API reply.
+
+    Uses the code model of the first configuration in the latest reply. Returns
+    None if the reply doesn't include a code model.
+    """
+    try:
+        index = load_json(
+            sorted(glob.glob(os.path.join(reply_dir, "index-*.json")))[-1]
+        )
+        codemodel_files = [
+            reply_object["jsonFile"]
+            for reply_object in index.get("objects", [])
+            if reply_object.get("kind") == "codemodel"
+        ]
+        if not codemodel_files:
+            return None
+        codemodel = load_json(os.path.join(reply_dir, codemodel_files[0]))
+        source_root = codemodel["paths"]["source"]
+        build_root = codemodel["paths"]["build"]
+        targets = []  # type: List[Dict[str, Any]]
+        for target_ref in codemodel["configurations"][0]["targets"]:
+            target = load_json(os.path.join(reply_dir, target_ref["jsonFile"]))
+            src = [
+                os.path.normpath(os.path.join(source_root, source["path"]))
+                for source in target.get("sources", [])
+                if "compileGroupIndex" in source and not source.get("isGenerated")
+            ]
+            src = [path for path in src if is_in_package(path, package_path)]
+            if not src:
+                continue
+            include_dirs = []  # type: List[str]
+            for compile_group in target.get("compileGroups", []):
+                add_unique(
+                    include_dirs,
+                    [
+                        os.path.normpath(os.path.join(source_root, include["path"]))
+                        for include in compile_group.get("includes", [])
+                    ],
+                )
+            targets.append(
+                {
+                    "name": target["name"],
+                    "src_dir": os.path.normpath(
+                        os.path.join(source_root, target["paths"]["source"])
+                    ),
+                    "include_dirs": include_dirs,
+                    "src": src,
+                }
+            )
+    except (OSError, ValueError, KeyError, TypeError, IndexError) as ex:
+        print("Unable to read CMake File API reply in {}: {}".format(reply_dir, ex))
+        return None
+    compile_commands = os.path.join(build_root, COMPILE_COMMANDS)  # type: Optional[str]
+    if not os.path.isfile(str(compile_commands)):
+        compile_commands = None
+    return BuildInfo(build_root, targets, compile_commands)
@@ -5,10 +5,28 @@ Sets what flags are used for each plugin at those levels.
 """
 import os
 from collections import OrderedDict
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, NamedTuple, Optional, Union
 
 import yaml
 
+from statick_tool.resources import load_yaml
+
+PLUGIN_TYPES = ["discovery", "reporting", "tool"]
+
+# A level with its inheritance flattened. plugins holds the enabled plugins of
+# each plugin type, the level's own first. plugin_configs holds the
+# configuration of each plugin of each plugin type, with the keys a level sets
+# itself replacing those it inherits. missing_level is the name of a level in
+# the inheritance chain that isn't defined, if any.
+ResolvedLevel = NamedTuple(
+    "ResolvedLevel",
+    [
+        ("plugins", Dict[str, List[str]]),
+        ("plugin_configs", Dict[str, Dict[str, Dict[str, Any]]]),
+        ("missing_level", Optional[str]),
+    ],
+)
+
 
 class Config:
     """
@@ -19,32 +37,115 @@ class Config:
 
     def __init__(self, filename: Optional[str]) -> None:
         """Initialize configuration."""
+        self.resolved_levels = {}  # type: Dict[str, ResolvedLevel]
         if filename is None or not os.path.exists(filename):
-            self.config = []  # type: Any
+            self.config = []
             return
-        with open(filename) as fname:
-            try:
-                self.config = yaml.safe_load(fname)
-            except (yaml.YAMLError, yaml.scanner.ScannerError) as ex:
-                raise ValueError(
-                    "{} is not a valid YAML file: {}".format(filename, ex)
-                ) from ex
+        try:
+            self.config = load_yaml(filename)
+        except (yaml.YAMLError, yaml.scanner.ScannerError) as ex:
+            raise ValueError(
+                "{} is not a valid YAML file: {}".format(filename, ex)
+            ) from ex
+        for level in self.get_levels():
+            self.get_inheritance_chain(level)
+
+    @property
+    def config(self) -> Any:
+        """Get the configuration read from the file."""
+        return self._config
+
+    @config.setter
+    def config(self, config: Any) -> None:
+        """Replace the configuration, dropping the levels resolved from the old one."""
+        self._config = config
+        self.resolved_levels = {}
+
+    def get_levels(self) -> Dict[str, Any]:
+        """Get the configuration of each level."""
+        if not self.config or not self.config.get("levels"):
+            return {}
+        levels = self.config["levels"]  # type: Dict[str, Any]
+        return levels
 
     def has_level(self, level: Optional[str]) -> bool:
         """Check if given level exists in config."""
-        return "levels" in self.config and level in self.config["levels"]
+        return level in self.get_levels()
+
+    def get_inheritance_chain(self, level: str) -> List[str]:
+        """
+        Get a level followed by the levels it inherits from, nearest first.
+
+        The chain stops at a level that isn't defined. A level that inherits from
+        itself, directly or through other levels, raises a ValueError.
+        """
+        levels = self.get_levels()
+        chain = [level]
+        while level in levels and levels[level] and "inherits_from" in levels[level]:
+            level = levels[level]["inherits_from"]
+            if level in chain:
+                raise ValueError(
+                    "Level {} inherits from itself: {}".format(
+                        level, " -> ".join(chain[chain.index(level) :] + [level])
+                    )
+                )
+            chain.append(level)
+        return chain
+
+    def resolve_level(self, level: str) -> ResolvedLevel:
+        """Flatten the inheritance of a level, once per level."""
+        resolved = self.resolved_levels.get(level)
+        if resolved is not None:
+            return resolved
+
+        levels = self.get_levels()
+        plugins = {
+            plugin_type: [] for plugin_type in PLUGIN_TYPES
+        }  # type: Dict[str, List[str]]
+        plugin_configs = {
+            plugin_type: {} for plugin_type in PLUGIN_TYPES
+        }  # type: Dict[str, Dict[str, Dict[str, Any]]]
+        missing_level = None  # type: Optional[str]
+        # Apply the furthest level first, so nearer levels replace its keys.
+        for chain_level in reversed(self.get_inheritance_chain(level)):
+            if chain_level not in levels:
+                missing_level = chain_level
+                continue
+            self.merge_level(levels[chain_level] or {}, plugins, plugin_configs)
+        for plugin_type, type_plugins in plugins.items():
+            plugins[plugin_type] = list(OrderedDict.fromkeys(type_plugins))
+
+        resolved = ResolvedLevel(plugins, plugin_configs, missing_level)
+        self.resolved_levels[level] = resolved
+        return resolved
+
+    @staticmethod
+    def merge_level(
+        level_config: Dict[str, Any],
+        plugins: Dict[str, List[str]],
+        plugin_configs: Dict[str, Dict[str, Dict[str, Any]]],
+    ) -> None:
+        """Merge the plugins of a level over those of the levels it inherits from."""
+        for plugin_type, type_config in level_config.items():
+            if plugin_type == "inherits_from" or not type_config:
+                continue
+            plugins[plugin_type] = list(type_config) + plugins.get(plugin_type, [])
+            # Plugins can be listed without any configuration.
+            if not isinstance(type_config, dict):
+                continue
+            configs = plugin_configs.setdefault(plugin_type, {})
+            for plugin, plugin_config in type_config.items():
+                configs[plugin] = dict(configs.get(plugin, {}))
+                configs[plugin].update(plugin_config or {})
 
     def get_enabled_plugins(self, level: str, plugin_type: str) -> List[str]:
         """Get what plugins are enabled for a certain level."""
-        level_config = self.config["levels"][level]
-        plugins = []  # type: List[str]
-        if plugin_type in level_config:
-            plugins += list(level_config[plugin_type])
-        if "inherits_from" in level_config:
-            inherited_level = level_config["inherits_from"]
-            plugins += self.get_enabled_plugins(inherited_level, plugin_type)
-        plugins = list(OrderedDict.fromkeys(plugins))
-        return plugins
+        if level not in self.get_levels():
+            raise KeyError(level)
+        resolved = self.resolve_level(level)
+        if resolved.missing_level is not None:
+            raise KeyError(resolved.missing_level)
+        return list(resolved.plugins.get(plugin_type, []))
 
     def get_enabled_tool_plugins(self, level: str) -> List[str]:
         """Get what tool plugins are enabled for a certain level."""
@@ -67,21 +168,14 @@ class Config:
         default: Optional[str] = None,
     ) -> Optional[Union[str, Any]]:
         """Get flags to use for a plugin at a certain level."""
-        if level not in self.config["levels"].keys():
+        if level not in self.get_levels():
+            return default
+        plugin_config = (
+            self.resolve_level(level).plugin_configs.get(plugin_type, {}).get(plugin)
+        )
+        if plugin_config is None or key not in plugin_config:
             return default
-        level_config = self.config["levels"][level]
-        if plugin_type in level_config:
-            type_config = level_config[plugin_type]
-            if plugin in type_config:
-                plugin_config = type_config[plugin]
-                if key in plugin_config:
-                    return plugin_config[key]
-        if "inherits_from" in level_config:
-            inherited_level = level_config["inherits_from"]
-            return self.get_plugin_config(
-                plugin_type, plugin, inherited_level, key, default
-            )
-        return default
+        return plugin_config[key]
 
     def get_tool_config(
         self, plugin: str, level: str, key: str, default: Optional[str] = None
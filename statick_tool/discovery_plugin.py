@@ -6,6 +6,8 @@ from typing import Any, List, Optional, Union
 from yapsy.IPlugin import IPlugin
 
 from statick_tool.exceptions import Exceptions
+from statick_tool.file_classifier import FileClassifier
+from statick_tool.file_index import FileIndex
 from statick_tool.package import Package
 from statick_tool.plugin_context import PluginContext
 
@@ -15,6 +17,9 @@ class DiscoveryPlugin(IPlugin):  # type: ignore
 
     plugin_context = None
 
+    # Shared by all discovery plugins so each file is only read once per scan.
+    file_classifier = FileClassifier()
+
     def get_name(self) -> Optional[str]:
         """Get name of plugin."""
 
@@ -36,6 +41,22 @@ class DiscoveryPlugin(IPlugin):  # type: ignore
         use it to filter which files the plugin detects.
         """
 
+    @classmethod
+    def get_file_index(
+        cls, package: Package, exceptions: Optional[Exceptions] = None
+    ) -> FileIndex:
+        """
+        Get the index of files in package.
+
+        The index is built the first time any discovery plugin asks for it, so the
+        package tree is only walked once per scan.
+        """
+        if package.file_index is None:
+            package.file_index = FileIndex(package.path, cls.file_classifier)
+        if exceptions:
+            package.file_index.apply_exceptions(package, exceptions)
+        return package.file_index
+
     def set_plugin_context(self, plugin_context: Union[None, PluginContext]) -> None:
         """Set the plugin context."""
         self.plugin_context = plugin_context
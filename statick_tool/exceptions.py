@@ -12,14 +12,208 @@ to be ignored. The path for the issue is set in the tool plugin that
 generates the issues.
 """
 import fnmatch
+import mmap
 import os
 import re
-from typing import Any, Dict, List, Match, Optional, Pattern
+from typing import Any, Dict, List, Optional, Pattern, Tuple
 
 import yaml
 
 from statick_tool.issue import Issue
 from statick_tool.package import Package
+from statick_tool.resources import load_yaml
+
+# Issues in files under this prefix would all match "*/build/*", so the prefix
+# is removed before matching that pattern.
+TRAVIS_BUILD_PREFIX = "/home/travis/build/"
+TRAVIS_BUILD_PATTERN = "*/build/*"
+
+
+class GlobMatcher:
+    """
+    Match file names against a list of glob patterns.
+
+    The patterns are translated and compiled into a single regular expression,
+    so a file name is matched against all of them at once.
+    """
+
+    def __init__(self, globs: List[str], travis_hack: bool = True) -> None:
+        """
+        Initialize matcher for globs.
+
+        With travis_hack, the Travis CI build prefix is removed from file names
+        before they are matched against "*/build/*".
+        """
+        if not travis_hack:
+            self.pattern = self.compile(globs)  # type: Optional[Pattern[str]]
+        else:
+            self.pattern = self.compile(
+                [pattern for pattern in globs if pattern != TRAVIS_BUILD_PATTERN]
+            )
+        self.travis_pattern = None  # type: Optional[Pattern[str]]
+        if travis_hack and TRAVIS_BUILD_PATTERN in globs:
+            self.travis_pattern = self.compile([TRAVIS_BUILD_PATTERN])
+
+    @classmethod
+    def compile(cls, globs: List[str]) -> Optional[Pattern[str]]:
+        """Compile globs into one regular expression, normalizing case like fnmatch."""
+        if not globs:
+            return None
+        return re.compile(
+            "|".join(
+                fnmatch.translate(os.path.normcase(pattern)) for pattern in globs
+            )
+        )
+
+    def match(self, filename: str, rel_path: Optional[str] = None) -> bool:
+        """Check whether filename, or its path relative to the package, matches."""
+        names = [os.path.normcase(filename)]
+        if rel_path is not None:
+            names.append(os.path.normcase(rel_path))
+        if self.pattern is not None and any(self.pattern.match(name) for name in names):
+            return True
+        if self.travis_pattern is not None:
+            # Hack to avoid exceptions for everything on Travis CI.
+            if filename.startswith(TRAVIS_BUILD_PREFIX):
+                names[0] = os.path.normcase(filename[len(TRAVIS_BUILD_PREFIX) :])
+            return any(self.travis_pattern.match(name) for name in names)
+        return False
+
+
+# A compiled message regex and the matcher for its optional file globs.
+RegexMatcher = Tuple[Pattern[str], Optional[GlobMatcher]]
+
+
+class FileExceptionMatchers:
+    """Glob matchers for the file exceptions that apply to each tool."""
+
+    def __init__(self, exceptions: List[Any]) -> None:
+        """Initialize matchers for file exceptions."""
+        self.exceptions = exceptions
+        self.matchers = {}  # type: Dict[str, Optional[GlobMatcher]]
+
+    def get(self, tool: str) -> Optional[GlobMatcher]:
+        """Get the matcher for tool, or None if no exceptions apply to it."""
+        if tool not in self.matchers:
+            globs = [
+                pattern
+                for exception in self.exceptions
+                if exception["tools"] == "all" or tool in exception["tools"]
+                for pattern in exception["globs"]
+            ]
+            self.matchers[tool] = GlobMatcher(globs) if globs else None
+        return self.matchers[tool]
+
+
+class RegexExceptionMatchers:
+    """Compiled message regex exceptions that apply to each tool."""
+
+    def __init__(self, exceptions: List[Any]) -> None:
+        """Initialize matchers for message regex exceptions."""
+        self.exceptions = []  # type: List[Tuple[Any, RegexMatcher]]
+        for exception in exceptions:
+            try:
+                compiled_re = re.compile(exception["regex"])  # type: Pattern[str]
+            except re.error:
+                print(
+                    "Invalid regular expression in exception: {}".format(
+                        exception["regex"]
+                    )
+                )
+                continue
+            globs = None  # type: Optional[GlobMatcher]
+            if "globs" in exception and exception["globs"]:
+                globs = GlobMatcher(exception["globs"], travis_hack=False)
+            self.exceptions.append((exception["tools"], (compiled_re, globs)))
+        self.matchers = {}  # type: Dict[str, List[RegexMatcher]]
+
+    def get(self, tool: str) -> List[RegexMatcher]:
+        """Get the regular expressions and file globs that apply to tool."""
+        if tool not in self.matchers:
+            self.matchers[tool] = [
+                matcher
+                for tools, matcher in self.exceptions
+                if tools == "all" or tool in tools
+            ]
+        return self.matchers[tool]
+
+
+# NOLINT applies to its own line and NOLINTNEXTLINE to the line after it. Either
+# one can be limited to some issue types, as in NOLINT(whitespace/tab) or
+# NOLINTNEXTLINE(google-explicit-constructor, cert-*).
+NOLINT_RE = re.compile(rb"NOLINT(NEXTLINE)?(?:\(([^)]*)\))?")  # type: Pattern[bytes]
+
+
+def read_nolint_annotations(filename: str) -> Dict[int, List[Optional[List[str]]]]:
+    """
+    Find the NOLINT annotations in a file.
+
+    Maps each line number to the issue types suppressed on that line by each
+    annotation that applies to it, or None if an annotation suppresses all
+    issues. Only the lines containing NOLINT are looked at.
+    """
+    annotations = {}  # type: Dict[int, List[Optional[List[str]]]]
+    try:
+        with open(filename, "rb") as fname:
+            try:
+                data = mmap.mmap(fname.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped.
+                return annotations
+    except OSError:
+        return annotations
+
+    with data:
+        line_number = 1
+        counted = 0
+        position = data.find(b"NOLINT")
+        while position != -1:
+            line_number += data[counted:position].count(b"\n")
+            start = data.rfind(b"\n", 0, position) + 1
+            end = data.find(b"\n", position)
+            if end == -1:
+                end = len(data)
+            for match in NOLINT_RE.finditer(data[start:end]):
+                categories = None  # type: Optional[List[str]]
+                if match.group(2) is not None:
+                    categories = [
+                        category.strip()
+                        for category in match.group(2)
+                        .decode("utf-8", errors="replace")
+                        .split(",")
+                        if category.strip()
+                    ]
+                    if not categories or "*" in categories:
+                        categories = None
+                target = line_number + 1 if match.group(1) else line_number
+                annotations.setdefault(target, []).append(categories)
+            counted = end
+            position = data.find(b"NOLINT", end)
+    return annotations
+
+
+def is_nolint(issue: Issue, annotations: Dict[int, List[Optional[List[str]]]]) -> bool:
+    """Check whether issue is suppressed by the NOLINT annotations in its file."""
+    try:
+        line_number = int(issue.line_number)
+    except ValueError:
+        return False
+    if line_number not in annotations:
+        return False
+    issue_types = [issue.issue_type]
+    # Types such as "warning/google-explicit-constructor" include the level.
+    level, _, check = issue.issue_type.partition("/")
+    if level in ("warning", "error") and check:
+        issue_types.append(check)
+    for categories in annotations[line_number]:
+        if categories is None:
+            return True
+        for category in categories:
+            if any(
+                fnmatch.fnmatchcase(issue_type, category) for issue_type in issue_types
+            ):
+                return True
+    return False
 
 
 class Exceptions:
@@ -29,13 +223,12 @@ class Exceptions:
         """Initialize exceptions interface."""
         if not filename:
             raise ValueError("{} is not a valid file".format(filename))
-        with open(filename) as fname:
-            try:
-                self.exceptions = yaml.safe_load(fname)  # type: Dict[Any, Any]
-            except (yaml.YAMLError, yaml.scanner.ScannerError) as ex:
-                raise ValueError(
-                    "{} is not a valid YAML file: {}".format(filename, ex)
-                ) from ex
+        try:
+            self.exceptions = load_yaml(filename)  # type: Dict[Any, Any]
+        except (yaml.YAMLError, yaml.scanner.ScannerError) as ex:
+            raise ValueError(
+                "{} is not a valid YAML file: {}".format(filename, ex)
+            ) from ex
 
     def get_ignore_packages(self) -> List[str]:
         """Get list of packages to skip when scanning a workspace."""
@@ -90,55 +283,44 @@ class Exceptions:
         plugins against files which will be ignored anyway).
         """
         exceptions = self.get_exceptions(package)  # type: Dict[Any, Any]
-        to_remove = []
-        for filename in file_list:
-            removed = False
-            for exception in exceptions["file"]:
-                if exception["tools"] == "all":
-                    for pattern in exception["globs"]:
-                        # Hack to avoid exceptions for everything on Travis CI.
-                        fname = filename
-                        prefix = "/home/travis/build/"
-                        if pattern == "*/build/*" and fname.startswith(prefix):
-                            fname = fname[len(prefix) :]
-                        if fnmatch.fnmatch(fname, pattern):
-                            to_remove.append(filename)
-                            removed = True
-                            break
-                    if removed:
-                        break
-        file_list = [filename for filename in file_list if filename not in to_remove]
-        return file_list
+        globs = [
+            pattern
+            for exception in exceptions["file"]
+            if exception["tools"] == "all"
+            for pattern in exception["globs"]
+        ]  # type: List[str]
+        if not globs:
+            return file_list
+        matcher = GlobMatcher(globs)
+        return [filename for filename in file_list if not matcher.match(filename)]
 
     def filter_file_exceptions(
         self, package: Package, exceptions: List[Any], issues: Dict[str, List[Issue]]
     ) -> Dict[str, List[Issue]]:
         """Filter issues based on file pattern exceptions list."""
-        for tool, tool_issues in list(  # pylint: disable=too-many-nested-blocks
-            issues.items()
-        ):
+        matchers = FileExceptionMatchers(exceptions)
+        for tool, tool_issues in list(issues.items()):
+            matcher = matchers.get(tool)
+            if matcher is None:
+                continue
             warning_printed = False
-            to_remove = []  # type: List[Issue]
+            # Tools usually report many issues per file, so match each file once.
+            removed = {}  # type: Dict[str, bool]
+            kept = []  # type: List[Issue]
             for issue in tool_issues:
                 if not os.path.isabs(issue.filename):
                     if not warning_printed:
                         self.print_exception_warning(tool)
                         warning_printed = True
+                    kept.append(issue)
                     continue
-                rel_path = os.path.relpath(issue.filename, package.path)  # type: str
-                for exception in exceptions:
-                    if exception["tools"] == "all" or tool in exception["tools"]:
-                        for pattern in exception["globs"]:
-                            # Hack to avoid exceptions for everything on Travis CI.
-                            fname = issue.filename  # type: str
-                            prefix = "/home/travis/build/"  # type: str
-                            if pattern == "*/build/*" and fname.startswith(prefix):
-                                fname = fname[len(prefix) :]
-                            if fnmatch.fnmatch(fname, pattern) or fnmatch.fnmatch(
-                                rel_path, pattern
-                            ):
-                                to_remove.append(issue)
-            issues[tool] = [issue for issue in tool_issues if issue not in to_remove]
+                if issue.filename not in removed:
+                    removed[issue.filename] = matcher.match(
+                        issue.filename, os.path.relpath(issue.filename, package.path)
+                    )
+                if not removed[issue.filename]:
+                    kept.append(issue)
+            issues[tool] = kept
 
         return issues
 
@@ -147,40 +329,20 @@ class Exceptions:
         cls, exceptions: List[Any], issues: Dict[str, List[Issue]]
     ) -> Dict[str, List[Issue]]:
         """Filter issues based on message regex exceptions list."""
-        for exception in exceptions:  # pylint: disable=too-many-nested-blocks
-            exception_re = exception["regex"]
-            exception_tools = exception["tools"]
-            exception_globs = []
-            if "globs" in exception:
-                exception_globs = exception["globs"]
-            try:
-                compiled_re = re.compile(exception_re)  # type: Pattern[str]
-            except re.error:
-                print(
-                    "Invalid regular expression in exception: {}".format(exception_re)
-                )
+        matchers = RegexExceptionMatchers(exceptions)
+        for tool, tool_issues in list(issues.items()):
+            tool_matchers = matchers.get(tool)
+            if not tool_matchers:
                 continue
-            for tool, tool_issues in list(issues.items()):
-                to_remove = []
-                if exception_tools == "all" or tool in exception_tools:
-                    for issue in tool_issues:
-                        if exception_globs:
-                            for pattern in exception_globs:
-                                if fnmatch.fnmatch(issue.filename, pattern):
-                                    match = compiled_re.match(
-                                        issue.message
-                                    )  # type: Optional[Match[str]]
-                                    if match:
-                                        to_remove.append(issue)
-                        else:
-                            match_re = compiled_re.match(
-                                issue.message
-                            )  # type: Optional[Match[str]]
-                            if match_re:
-                                to_remove.append(issue)
-                issues[tool] = [
-                    issue for issue in tool_issues if issue not in to_remove
-                ]
+            issues[tool] = [
+                issue
+                for issue in tool_issues
+                if not any(
+                    compiled_re.match(issue.message)
+                    and (globs is None or globs.match(issue.filename))
+                    for compiled_re, globs in tool_matchers
+                )
+            ]
         return issues
 
     def filter_nolint(self, issues: Dict[str, List[Issue]]) -> Dict[str, List[Issue]]:
@@ -188,22 +350,27 @@ class Exceptions:
         Filter out lines that have an explicit NOLINT on them.
 
         Sometimes the tools themselves don't properly filter these out if
-        there is a complex macro or something.
+        there is a complex macro or something. Each file is read once, no
+        matter how many issues were found in it.
         """
+        annotations = {}  # type: Dict[str, Dict[int, List[Optional[List[str]]]]]
         for tool, tool_issues in list(issues.items()):
             warning_printed = False  # type: bool
-            to_remove = []  # type: List[Issue]
+            kept = []  # type: List[Issue]
             for issue in tool_issues:
                 if not os.path.isabs(issue.filename):
                     if not warning_printed:
                         self.print_exception_warning(tool)
                         warning_printed = True
+                    kept.append(issue)
                     continue
-                lines = open(issue.filename, "r+", encoding="utf-8").readlines()
-                line_number = int(issue.line_number) - 1
-                if line_number < len(lines) and "NOLINT" in lines[line_number]:
-                    to_remove.append(issue)
-            issues[tool] = [issue for issue in tool_issues if issue not in to_remove]
+                if issue.filename not in annotations:
+                    annotations[issue.filename] = read_nolint_annotations(
+                        issue.filename
+                    )
+                if not is_nolint(issue, annotations[issue.filename]):
+                    kept.append(issue)
+            issues[tool] = kept
         return issues
 
     def filter_issues(
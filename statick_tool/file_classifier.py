@@ -0,0 +1,174 @@
+"""
+Classify source files by their contents.
+
+Discovery plugins used to run the `file` command on every file in a package to
+find source files without a recognized extension. The classifier reads only the
+start of each file and applies the same kinds of checks `file` does for the
+languages Statick supports: binary content, the interpreter named on a shebang
+line, and characteristic source lines.
+"""
+import codecs
+import os
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+C = "c"
+CPP = "c++"
+PERL = "perl"
+PERL_MODULE = "perl module"
+# Text that `file` recognizes as something other than a source file Statick scans,
+# such as HTML or JavaScript.
+OTHER = "other"
+PYTHON = "python"
+SHELL = "shell"
+
+# The file command searches the first 8 KiB of a file for source patterns.
+HEADER_SIZE = 8192
+
+# Interpreters on a shebang line that `file` reports as scripts of each type.
+INTERPRETERS = [
+    (re.compile(r"python[0-9.]*$"), PYTHON),
+    (re.compile(r"perl[0-9.]*(-[\w-]+)?$"), PERL),
+    (re.compile(r"(sh|bash|dash|zsh|ksh|csh|tcsh)$"), SHELL),
+]  # type: List[Tuple[Pattern[str], str]]
+
+# Content patterns, strongest first, following the magic used by `file`. Like
+# `file`, a pattern is only tried when its keyword appears in the text.
+CONTENT_PATTERNS = [
+    ("using", r"^using\s+(namespace )?std(::)?[a-zA-Z]*\s*;", CPP),
+    ("namespace", r"^namespace\s+[_a-zA-Z]{1,30}\s*\{", CPP),
+    ("public:", r"^\s*public:", CPP),
+    ("protected:", r"^\s*protected:", CPP),
+    ("private:", r"^\s*private:", CPP),
+    ("template", r"^\s*template\s*<.*>\s*$", CPP),
+    ("virtual", r"^\s*virtual\s+.*[};]\s*$", CPP),
+    ("class", r"^\s*class\s+[0-9a-zA-Z:_]+\s*\{[\s\S]*\}(;)?$", CPP),
+    ('"""', r"\A\"\"\"", PYTHON),
+    ("import", r"^from[ \t]+[A-Za-z0-9_.]+[ \t]+import.*$", PYTHON),
+    ("def __init__", r"def __init__[\s\S]{0,64}self", PYTHON),
+    ("if __name__", r"if __name__[\s\S]*['\"]__main__['\"]", PYTHON),
+    ("class", r"^class [_a-zA-Z]+(\(.*\))?( )*:([ \t]+pass)?$", PYTHON),
+    ("try:", r"try:[\s\S]*(^\s*except.*:$|finally:)", PYTHON),
+    ("def ", r"^\s{0,50}def {1,50}[_a-zA-Z]{1,100}[\s\S]*?\([a-zA-Z*_, ]*\):$", PYTHON),
+    ("package", r"^package[ \t]+[0-9A-Za-z_:]+ *;", PERL_MODULE),
+    ("exec", r"eval[ \t]+[\"']exec[ \t]+\S*perl", PERL),
+    ("BEGIN", r"^\s{0,100}BEGIN\s{0,100}\{", PERL),
+    ("<", r"(?i)<(!doctype html|html|head|title|script)[ >]|<a href=", OTHER),
+    (" from ", r"^(import|export).* from ", OTHER),
+    ("function", r"\((async )?function[( ]", OTHER),
+    ("use strict", r"[\"']use strict[\"']", OTHER),
+    ("require(", r"^(const|var|let).*=.*require\(", OTHER),
+    ("exports", r"module(\.|\[[\"'])exports.*=", OTHER),
+    ("import", r"^import.*;$", OTHER),
+    ("+++ ", r"^--- .*\n\+\+\+ ", OTHER),
+    ("#include", r"^#include", C),
+    ("pragma", r"^#\s*pragma", C),
+    ("def", r"^#\s*(if|ifn)def[\s\S]*^#\s*(endif$|define)", C),
+    ("char", r"^\s*char( \*|\*)(.+)(=.*)?;\s*$", C),
+    ("double", r"^\s*double( \*|\*)(.+)(=.*)?;\s*$", C),
+    ("float", r"^\s*float( \*|\*)(.+)(=.*)?;\s*$", C),
+    ("extern", r"^\s*extern\s+", C),
+    ("struct", r"^struct\s+", C),
+    ("union", r"^union\s+", C),
+    ("main(", r"main\([\s\S]*\)\s*\{", C),
+]
+COMPILED_CONTENT_PATTERNS = [
+    (keyword, re.compile(pattern, re.MULTILINE), file_type)
+    for keyword, pattern, file_type in CONTENT_PATTERNS
+]  # type: List[Tuple[str, Pattern[str], str]]
+
+
+class FileClassifier:
+    """
+    Classify source files by their contents.
+
+    Results are cached by path, modification time and size, so several discovery
+    plugins can ask about the same file while only reading it once.
+    """
+
+    def __init__(self) -> None:
+        """Initialize file classifier."""
+        self.file_types = {}  # type: Dict[str, Tuple[int, int, Optional[str]]]
+
+    def get_file_type(self, path: str) -> Optional[str]:
+        """
+        Get the type of source file at path.
+
+        Returns one of the type constants in this module, or None if the file
+        isn't a recognized source file or can't be read.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        cached = self.file_types.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        file_type = None  # type: Optional[str]
+        try:
+            with open(path, "rb") as fname:
+                file_type = self.classify(fname.read(HEADER_SIZE))
+        except OSError:
+            pass
+        self.file_types[path] = (stat.st_mtime_ns, stat.st_size, file_type)
+        return file_type
+
+    @classmethod
+    def classify(cls, header: bytes) -> Optional[str]:
+        """Get the type of source file that starts with header."""
+        text = cls.decode(header)
+        if not text:
+            return None
+
+        if text.startswith("#!"):
+            return cls.get_interpreter_type(text.splitlines()[0][2:])
+
+        for keyword, pattern, file_type in COMPILED_CONTENT_PATTERNS:
+            if keyword in text and pattern.search(text):
+                return file_type
+        return None
+
+    @classmethod
+    def decode(cls, header: bytes) -> Optional[str]:
+        """
+        Decode the start of a file to text.
+
+        Returns None for binary files. Text that isn't UTF-16 is decoded as
+        Latin-1, which keeps ASCII intact for any 8-bit encoding.
+        """
+        if header.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return header.decode("utf-16", errors="ignore")
+        if b"\0" in header:
+            return None
+        if header.startswith(codecs.BOM_UTF8):
+            header = header[len(codecs.BOM_UTF8) :]
+        return header.decode("latin-1")
+
+    @classmethod
+    def get_interpreter_type(cls, shebang: str) -> Optional[str]:
+        """
+        Get the type of script run by the interpreter on a shebang line.
+
+        Scripts for other interpreters are reported as OTHER, since `file`
+        describes them by their interpreter rather than by their contents.
+        """
+        words = shebang.split()
+        if not words:
+            return None
+        interpreter = os.path.basename(words[0])
+        if interpreter == "env":
+            # Skip options and variable assignments, as in
+            # "#!/usr/bin/env -S VAR=1 python3 -u".
+            commands = [
+                word
+                for word in words[1:]
+                if not word.startswith("-") and "=" not in word
+            ]
+            if not commands:
+                return None
+            interpreter = os.path.basename(commands[0])
+        for pattern, file_type in INTERPRETERS:
+            if pattern.match(interpreter):
+                return file_type
+        return OTHER
@@ -0,0 +1,108 @@
+"""
+Index of the files in a package.
+
+Discovery plugins used to walk the package tree on their own, so a package was
+traversed once per discovery plugin. The index walks the tree once with
+`os.scandir` and lets each discovery plugin query it by glob, extension, or the
+type found by the file classifier. File exceptions that apply to all tools are
+matched once, when they are first applied to the index, instead of once per
+discovery plugin.
+"""
+import fnmatch
+import os
+from typing import Iterable, List, Optional, Sequence, Set
+
+from statick_tool.exceptions import Exceptions
+from statick_tool.file_classifier import FileClassifier
+from statick_tool.package import Package
+
+
+class FileIndex:
+    """Index of the files in a package."""
+
+    def __init__(
+        self, path: str, file_classifier: Optional[FileClassifier] = None
+    ) -> None:
+        """Initialize file index by walking the tree at path."""
+        if file_classifier is None:
+            file_classifier = FileClassifier()
+        self.file_classifier = file_classifier
+        self.files = self.walk(os.path.abspath(path))  # type: List[str]
+        self.excluded = set()  # type: Set[str]
+        self.exceptions = None  # type: Optional[Exceptions]
+
+    @staticmethod
+    def walk(path: str) -> List[str]:
+        """
+        Get the absolute paths of all files under path.
+
+        Files are listed in the same order as `os.walk`: the files in a directory
+        come before the files in its subdirectories. Symbolic links to directories
+        are not followed.
+        """
+        files = []  # type: List[str]
+        directories = [path]
+        while directories:
+            directory = directories.pop()
+            subdirectories = []  # type: List[str]
+            try:
+                # Read all entries at once, which closes the directory. The
+                # scandir iterator is only a context manager from Python 3.6.
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(entry.path)
+                elif not entry.is_symlink():
+                    subdirectories.append(entry.path)
+            directories.extend(reversed(subdirectories))
+        return files
+
+    def apply_exceptions(self, package: Package, exceptions: Exceptions) -> None:
+        """Find the files excluded from all tools by exceptions."""
+        if exceptions is self.exceptions:
+            return
+        kept = set(exceptions.filter_file_exceptions_early(package, self.files))
+        self.excluded = {path for path in self.files if path not in kept}
+        self.exceptions = exceptions
+
+    def filter_excluded(self, files: Iterable[str]) -> List[str]:
+        """Remove files excluded by exceptions from files."""
+        return [path for path in files if path not in self.excluded]
+
+    def find(
+        self,
+        globs: Sequence[str] = (),
+        extensions: Sequence[str] = (),
+        file_types: Sequence[str] = (),
+        unclassified_extensions: Sequence[str] = (),
+    ) -> List[str]:
+        """
+        Find files by name or contents.
+
+        A file matches if its name matches one of globs, if its name ends with
+        one of extensions (ignoring case), or if the file classifier finds that
+        it is one of file_types. Files matched by name are not classified, and
+        files ending in one of unclassified_extensions are never classified.
+        """
+        extensions = tuple(extension.lower() for extension in extensions)
+        unclassified = tuple(unclassified_extensions)
+        found = []  # type: List[str]
+        for path in self.files:
+            name = os.path.basename(path)
+            if extensions and name.lower().endswith(extensions):
+                found.append(path)
+            elif any(fnmatch.fnmatch(name, glob) for glob in globs):
+                found.append(path)
+            elif (
+                file_types
+                and not (unclassified and name.endswith(unclassified))
+                and self.file_classifier.get_file_type(path) in file_types
+            ):
+                found.append(path)
+        return found
@@ -0,0 +1,179 @@
+"""
+Limit a scan to the files changed in git.
+
+For pre-merge checks only the files changed against a base reference matter.
+The functions here find those files with git, remove every other file from the
+lists built by the discovery plugins, and optionally drop issues reported on
+lines that did not change.
+"""
+import os
+import re
+import subprocess
+from typing import Dict, List, Match, Optional, Pattern, Set
+
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+
+# Lists of files built by discovery plugins that tools scan one file at a time.
+SOURCE_KEYS = [
+    "c_src",
+    "headers",
+    "java_src",
+    "perl_src",
+    "python_src",
+    "shell_src",
+    "xml",
+    "yaml",
+]
+
+
+def run_git(path: str, args: List[str]) -> Optional[str]:
+    """Run git in path and return its output, or None if it failed."""
+    try:
+        return subprocess.check_output(
+            ["git", "-C", path, "-c", "core.quotePath=false"] + args,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+        )
+    except subprocess.CalledProcessError as ex:
+        print("git {} failed! Returncode = {}".format(" ".join(args), ex.returncode))
+        print("{}".format(ex.output))
+    except OSError as ex:
+        print("Couldn't find git executable! ({})".format(ex))
+    return None
+
+
+def get_toplevel(path: str) -> Optional[str]:
+    """Get the top-level directory of the git repository containing path."""
+    output = run_git(path, ["rev-parse", "--show-toplevel"])
+    if output is None:
+        return None
+    return os.path.realpath(output.strip())
+
+
+def get_changed_files(path: str, ref: str) -> Optional[Set[str]]:
+    """
+    Get the files changed since ref in the git repository containing path.
+
+    Files that git doesn't track yet count as changed. Returns real paths, or
+    None if git failed.
+    """
+    toplevel = get_toplevel(path)
+    if toplevel is None:
+        return None
+    changed = run_git(toplevel, ["diff", "--name-only", "-z", ref, "--"])
+    untracked = run_git(toplevel, ["ls-files", "--others", "--exclude-standard", "-z"])
+    if changed is None or untracked is None:
+        return None
+    return {
+        os.path.join(toplevel, name)
+        for name in (changed + untracked).split("\0")
+        if name
+    }
+
+
+def get_changed_lines(path: str, ref: str) -> Optional[Dict[str, Optional[Set[int]]]]:
+    """
+    Get the lines changed since ref in the git repository containing path.
+
+    Maps the real path of each changed file to the numbers of the added or
+    modified lines. Files that git doesn't track yet map to None, meaning every
+    line changed. Returns None if git failed.
+    """
+    toplevel = get_toplevel(path)
+    if toplevel is None:
+        return None
+    diff = run_git(
+        toplevel,
+        [
+            "diff",
+            "-U0",
+            "--no-color",
+            "--no-ext-diff",
+            "--src-prefix=a/",
+            "--dst-prefix=b/",
+            ref,
+            "--",
+        ],
+    )
+    untracked = run_git(toplevel, ["ls-files", "--others", "--exclude-standard", "-z"])
+    if diff is None or untracked is None:
+        return None
+
+    changed_lines = {}  # type: Dict[str, Optional[Set[int]]]
+    file_re = re.compile(r"\+\+\+ b/(.+)")  # type: Pattern[str]
+    hunk_re = re.compile(
+        r"@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@"
+    )  # type: Pattern[str]
+    lines = None  # type: Optional[Set[int]]
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            match = file_re.match(line)  # type: Optional[Match[str]]
+            lines = None
+            if match:
+                lines = set()
+                changed_lines[os.path.join(toplevel, match.group(1))] = lines
+        elif line.startswith("@@") and lines is not None:
+            match = hunk_re.match(line)
+            if match:
+                start = int(match.group(1))
+                count = int(match.group(2)) if match.group(2) is not None else 1
+                lines.update(range(start, start + count))
+    for name in untracked.split("\0"):
+        if name:
+            changed_lines[os.path.join(toplevel, name)] = None
+    return changed_lines
+
+
+def filter_package(package: Package, changed_files: Set[str]) -> None:
+    """Remove files that did not change from the source lists of package."""
+    package.changed_files = changed_files
+    for key in SOURCE_KEYS:
+        if key in package and package[key]:
+            package[key] = [
+                path for path in package[key] if os.path.realpath(path) in changed_files
+            ]
+    for target in package.get("make_targets", []):
+        target["src"] = [
+            path for path in target["src"] if os.path.realpath(path) in changed_files
+        ]
+
+
+def filter_issues(
+    package: Package,
+    issues: Dict[str, List[Issue]],
+    changed_lines: Dict[str, Optional[Set[int]]],
+    tool_dir: Optional[str] = None,
+) -> Dict[str, List[Issue]]:
+    """
+    Remove issues that are not on changed lines.
+
+    Relative file names are looked up in tool_dir, the directory the tools ran
+    in, and then in the package. Issues in files that can't be found in either
+    place, such as files named relative to a build directory, are kept.
+    Issues on line 0 are about a whole file, and are kept if the file changed.
+    """
+    base_dirs = [package.path]
+    if tool_dir is not None:
+        base_dirs.insert(0, tool_dir)
+    filtered = {}  # type: Dict[str, List[Issue]]
+    for tool, tool_issues in issues.items():
+        filtered[tool] = []
+        for issue in tool_issues:
+            paths = [
+                os.path.realpath(os.path.join(base_dir, issue.filename))
+                for base_dir in base_dirs
+            ]
+            path = next((path for path in paths if path in changed_lines), None)
+            if path is None:
+                if not any(os.path.exists(path) for path in paths):
+                    filtered[tool].append(issue)
+                continue
+            lines = changed_lines[path]
+            try:
+                line_number = int(issue.line_number)
+            except ValueError:
+                line_number = 0
+            if lines is None or line_number == 0 or line_number in lines:
+                filtered[tool].append(issue)
+    return filtered
@@ -0,0 +1,98 @@
+"""
+Collect the issues of many packages on disk.
+
+statick_ws reports the issues of every package in a workspace together. Instead
+of keeping the issues of all packages in memory until the end, the spool writes
+each package's issues to a file per tool as soon as the package is done. The
+overall report reads them back one issue at a time, so only a single package's
+issues are in memory at once.
+"""
+import collections
+import json
+import os
+import tempfile
+from typing import Dict, Iterable, Iterator, Mapping, Optional, TextIO
+
+from statick_tool.issue import Issue
+
+
+class SpooledIssues:
+    """Issues found by one tool, read from the spool each time they are iterated."""
+
+    def __init__(self, path: str, count: int) -> None:
+        """Initialize spooled issues stored in the file at path."""
+        self.path = path
+        self.count = count
+
+    def __iter__(self) -> Iterator[Issue]:
+        """Read the issues in the order they were added."""
+        with open(self.path, "r") as fname:
+            for line in fname:
+                yield Issue(*json.loads(line))
+
+    def __len__(self) -> int:
+        """Get the number of issues."""
+        return self.count
+
+
+class IssueSpool:
+    """Issues of many packages, kept in temporary files until they are reported."""
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        """Initialize issue spool in a new temporary directory under directory."""
+        # The temporary directory is removed when the spool is closed or, if the
+        # run exits early, when the interpreter exits.
+        self.tmp_dir = tempfile.TemporaryDirectory(
+            prefix="statick-issues-", dir=directory
+        )  # pylint: disable=consider-using-with
+        self.files = collections.OrderedDict()  # type: Dict[str, TextIO]
+        self.counts = {}  # type: Dict[str, int]
+        self.encoder = json.JSONEncoder()
+
+    def __enter__(self) -> "IssueSpool":
+        """Use issue spool as a context manager."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Remove the spooled issues."""
+        self.close()
+
+    def add(self, issues: Mapping[str, Iterable[Issue]]) -> None:
+        """Add the issues of a package, keyed by tool."""
+        for tool, tool_issues in issues.items():
+            if tool not in self.files:
+                path = os.path.join(
+                    self.tmp_dir.name, "{}.jsonl".format(len(self.files))
+                )
+                self.files[tool] = open(
+                    path, "w"
+                )  # pylint: disable=consider-using-with
+                self.counts[tool] = 0
+            out = self.files[tool]
+            for issue in tool_issues:
+                out.write(self.encoder.encode(list(issue)))
+                out.write("\n")
+                self.counts[tool] += 1
+
+    def count(self) -> int:
+        """Get the total number of issues."""
+        return sum(self.counts.values())
+
+    def get_issues(self) -> Dict[str, SpooledIssues]:
+        """
+        Get the issues of all packages keyed by tool.
+
+        Each tool's issues are read from disk while they are iterated.
+        """
+        issues = collections.OrderedDict()  # type: Dict[str, SpooledIssues]
+        for tool, out in self.files.items():
+            out.flush()
+            issues[tool] = SpooledIssues(out.name, self.counts[tool])
+        return issues
+
+    def close(self) -> None:
+        """Remove the spooled issues."""
+        for out in self.files.values():
+            out.close()
+        self.files.clear()
+        self.tmp_dir.cleanup()
@@ -0,0 +1,105 @@
+"""
+In-memory store of the issues found in a scan.
+
+Issues are passed to plugins as a dict mapping tool names to lists of Issue
+tuples of strings. Large scans hold many copies of the same filenames, tool
+names and issue types, and removing duplicates by searching a list takes
+quadratic time. The store keeps each issue once per tool using hash lookups,
+interns the strings that repeat across issues, keeps severities as an integer
+column, and indexes issues by tool. Plugins that expect the dict of lists get it
+from as_dict.
+"""
+import collections
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+from statick_tool.issue import Issue
+
+
+def to_int(value: Optional[str]) -> int:
+    """Convert a severity to an integer, using 0 if it isn't one."""
+    try:
+        return int(value)  # type: ignore
+    except (TypeError, ValueError):
+        return 0
+
+
+def intern(value: Any) -> Any:
+    """Intern value if it is a string."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+class IssueStore:
+    """Deduplicated issues indexed by tool, with a column of integer severities."""
+
+    def __init__(self, issues: Optional[Mapping[str, Iterable[Issue]]] = None) -> None:
+        """Initialize issue store, adding issues keyed by tool if given."""
+        self.issues = []  # type: List[Issue]
+        self.severities = array("l")
+        self.by_tool = collections.OrderedDict()  # type: Dict[str, List[int]]
+        self.seen = {}  # type: Dict[str, Set[Issue]]
+        if issues is not None:
+            for tool, tool_issues in issues.items():
+                self.extend(tool, tool_issues)
+
+    def __len__(self) -> int:
+        """Get the number of issues in the store."""
+        return len(self.issues)
+
+    @staticmethod
+    def intern_issue(issue: Issue) -> Issue:
+        """Get a copy of issue that shares the strings repeated across issues."""
+        return Issue(
+            intern(issue.filename),
+            intern(issue.line_number),
+            intern(issue.tool),
+            intern(issue.issue_type),
+            intern(issue.severity),
+            issue.message,
+            intern(issue.cert_reference),
+        )
+
+    def add(self, tool: str, issue: Issue) -> bool:
+        """Add an issue found by tool, unless tool already found it."""
+        tool = sys.intern(tool)
+        seen = self.seen.setdefault(tool, set())
+        if issue in seen:
+            return False
+        issue = self.intern_issue(issue)
+        seen.add(issue)
+
+        self.by_tool.setdefault(tool, []).append(len(self.issues))
+        self.issues.append(issue)
+        self.severities.append(to_int(issue.severity))
+        return True
+
+    def extend(self, tool: str, issues: Iterable[Issue]) -> None:
+        """
+        Add the issues found by tool.
+
+        The tool is listed by the store even if it found no issues.
+        """
+        self.by_tool.setdefault(sys.intern(tool), [])
+        for issue in issues:
+            self.add(tool, issue)
+
+    def get_tools(self) -> List[str]:
+        """Get the names of the tools in the order they were added."""
+        return list(self.by_tool)
+
+    def get_tool(self, tool: str) -> List[Issue]:
+        """Get the issues found by tool."""
+        return [self.issues[row] for row in self.by_tool.get(tool, [])]
+
+    def count_by_severity(self) -> Dict[int, int]:
+        """Get the number of issues with each severity, in order of severity."""
+        return collections.OrderedDict(
+            sorted(collections.Counter(self.severities).items())
+        )
+
+    def as_dict(self) -> Dict[str, List[Issue]]:
+        """Get the issues as new lists keyed by tool."""
+        return {tool: self.get_tool(tool) for tool in self.by_tool}
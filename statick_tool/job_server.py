@@ -0,0 +1,151 @@
+"""
+Share a budget of jobs between everything a scan runs at the same time.
+
+Tool plugins can run in parallel (--max-procs), statick_ws can scan several
+packages at once (--parallel), and some tools such as make start parallel jobs
+of their own. Without a shared limit these multiply and oversubscribe the
+machine.
+
+The job server works like the one in GNU make: a pipe holds one token per job
+in the budget. A tool plugin takes a token before it runs and puts it back when
+it is done. Processes started by the scan, including package workers and make
+itself, inherit the pipe, so make can take extra tokens for its parallel jobs
+and every process draws from the same budget.
+"""
+import contextlib
+import functools
+import os
+import re
+import stat
+import subprocess
+from typing import Dict, Iterator, Optional, Tuple
+
+# Environment variable holding the file descriptors of the job server pipe.
+JOB_SERVER_ENV = "STATICK_JOB_SERVER"
+# First line of the output of make --version, such as "GNU Make 4.3".
+MAKE_VERSION_RE = re.compile(r"GNU Make (\d+)\.(\d+)")
+
+
+@functools.lru_cache(maxsize=None)
+def get_make_version(make: str = "make") -> Optional[Tuple[int, int]]:
+    """Get the major and minor version of GNU make, or None if it's unknown."""
+    try:
+        output = subprocess.check_output(
+            [make, "--version"], stderr=subprocess.DEVNULL, universal_newlines=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    match = MAKE_VERSION_RE.match(output)
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+class JobServer:
+    """Pipe of job tokens shared with child processes."""
+
+    def __init__(self, read_fd: int, write_fd: int) -> None:
+        """Initialize job server using an existing token pipe."""
+        self.read_fd = read_fd
+        self.write_fd = write_fd
+
+    @classmethod
+    def create(cls, jobs: int) -> Optional["JobServer"]:
+        """
+        Create a job server with a budget of jobs tokens.
+
+        The pipe is named in the environment so that processes started from
+        here find it. Returns None where file descriptors can't be passed to
+        child processes.
+        """
+        if os.name != "posix":
+            return None
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"+" * max(jobs, 1))
+        os.environ[JOB_SERVER_ENV] = "{},{}".format(read_fd, write_fd)
+        return cls(read_fd, write_fd)
+
+    @classmethod
+    def from_environment(cls) -> Optional["JobServer"]:
+        """Get the job server inherited from a parent process, if any."""
+        value = os.environ.get(JOB_SERVER_ENV)
+        if not value:
+            return None
+        try:
+            read_fd, write_fd = [int(fd) for fd in value.split(",")]
+            if not all(
+                stat.S_ISFIFO(os.fstat(fd).st_mode) for fd in (read_fd, write_fd)
+            ):
+                return None
+        except (ValueError, OSError):
+            # The descriptors weren't inherited, such as by a spawned process.
+            return None
+        return cls(read_fd, write_fd)
+
+    def acquire(self) -> None:
+        """Take a token, waiting until one is free."""
+        os.read(self.read_fd, 1)
+
+    def release(self) -> None:
+        """Put a token back."""
+        os.write(self.write_fd, b"+")
+
+    @contextlib.contextmanager
+    def job(self) -> Iterator[None]:
+        """Hold a token while running a job."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_pass_fds(self) -> Tuple[int, int]:
+        """Get the file descriptors a child process needs to use the job server."""
+        return (self.read_fd, self.write_fd)
+
+    def get_make_env(self, make: str = "make") -> Dict[str, str]:
+        """
+        Get an environment in which make takes its jobs from the job server.
+
+        The token held by the tool plugin running make is the one make uses for
+        its first job, so any further jobs only run when tokens are free.
+
+        Make 4.2 names the pipe with --jobserver-auth, and older versions with
+        --jobserver-fds. Make ignores an option it doesn't know and would run
+        with -j and no limit, so when the version is unknown the environment is
+        left as it is and make runs one job at a time.
+        """
+        env = dict(os.environ)
+        version = get_make_version(make)
+        if version is None:
+            return env
+        option = "--jobserver-auth" if version >= (4, 2) else "--jobserver-fds"
+        env["MAKEFLAGS"] = "{} -j {}={},{}".format(
+            env.get("MAKEFLAGS", ""), option, self.read_fd, self.write_fd
+        ).strip()
+        return env
+
+
+# Job server of this process, see get_job_server.
+JOB_SERVER = None  # type: Optional[JobServer]
+
+
+def start_job_server(jobs: int) -> Optional[JobServer]:
+    """
+    Start sharing a budget of jobs with this process and its children.
+
+    A job server inherited from a parent process is used instead of starting a
+    new one, so a budget set for a whole workspace applies to each package.
+    """
+    global JOB_SERVER  # pylint: disable=global-statement
+    if JOB_SERVER is None:
+        JOB_SERVER = JobServer.from_environment() or JobServer.create(jobs)
+    return JOB_SERVER
+
+
+def get_job_server() -> Optional[JobServer]:
+    """Get the job server of this process, or None if there is no job budget."""
+    global JOB_SERVER  # pylint: disable=global-statement
+    if JOB_SERVER is None:
+        JOB_SERVER = JobServer.from_environment()
+    return JOB_SERVER
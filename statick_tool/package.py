@@ -1,4 +1,8 @@
 """Package interface."""
+from typing import TYPE_CHECKING, Optional, Set
+
+if TYPE_CHECKING:
+    from statick_tool.file_index import FileIndex  # pylint: disable=cyclic-import
 
 
 class Package(dict):  # type: ignore
@@ -10,3 +14,6 @@ class Package(dict):  # type: ignore
         """Initialize package interface."""
         self.name = name
         self.path = path
+        self.file_index = None  # type: Optional[FileIndex]
+        # Real paths of files changed in git, if only changed files are scanned.
+        self.changed_files = None  # type: Optional[Set[str]]
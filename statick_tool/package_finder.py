@@ -0,0 +1,165 @@
+"""
+Find the packages in a workspace.
+
+The workspace is walked once, listing each directory a single time. Subtrees
+that can't hold packages to scan are not entered: directories with an ignore
+marker file, and build, install and log directories that are not packages
+themselves.
+
+The packages found can be kept in an index file, along with the modification
+time of each directory that was listed. Adding or removing a file or
+directory changes the modification time of the directory holding it, so the
+index is used until one of those directories changes.
+"""
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+# Marker files that exclude a directory and everything below it.
+IGNORE_MARKERS = ["AMENT_IGNORE", "CATKIN_IGNORE", "COLCON_IGNORE"]
+# Output directories of colcon and catkin builds, skipped unless they hold a
+# package themselves.
+PRUNED_DIRECTORIES = ["build", "install", "log"]
+PACKAGE_MANIFEST = "package.xml"
+INDEX_VERSION = 1
+
+
+def list_directory(path: str) -> Tuple[List[str], List[Tuple[str, bool]]]:
+    """
+    List a directory.
+
+    Returns the names of its files, and the names of its subdirectories along
+    with whether each is a symbolic link, both sorted by name.
+    """
+    files = []  # type: List[str]
+    dirs = []  # type: List[Tuple[str, bool]]
+    try:
+        # Read all entries at once, which closes the directory. The scandir
+        # iterator is only a context manager from Python 3.6.
+        entries = list(os.scandir(path))
+    except OSError:
+        entries = []
+    for entry in entries:
+        try:
+            if entry.is_dir():
+                dirs.append((entry.name, entry.is_symlink()))
+            else:
+                files.append(entry.name)
+        except OSError:
+            continue
+    return sorted(files), sorted(dirs)
+
+
+def walk_packages(path: str) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
+    """
+    Walk a workspace for packages.
+
+    Returns the name and path of each package below path, and the modification
+    time of each directory listed, keyed by path relative to the workspace.
+    Packages are found below other packages too, but symbolic links to
+    directories are only checked for a package and not walked.
+    """
+    packages = []  # type: List[Tuple[str, str]]
+    directories = {}  # type: Dict[str, int]
+
+    def list_and_record(directory: str) -> Tuple[List[str], List[Tuple[str, bool]]]:
+        """List a directory, recording its modification time."""
+        try:
+            directories[os.path.relpath(directory, path)] = os.stat(
+                directory
+            ).st_mtime_ns
+        except OSError:
+            return [], []
+        return list_directory(directory)
+
+    # Each directory is listed once, when its parent is walked, and its
+    # listing is kept until it is walked itself.
+    stack = [(path, list_and_record(path)[1])]
+    while stack:
+        root, dirs = stack.pop()
+        to_walk = []  # type: List[Tuple[str, List[Tuple[str, bool]]]]
+        for name, is_symlink in dirs:
+            full_dir = os.path.join(root, name)
+            files, sub_dirs = list_and_record(full_dir)
+            if any(marker in files for marker in IGNORE_MARKERS):
+                continue
+            is_package = PACKAGE_MANIFEST in files
+            if is_package:
+                packages.append((name, full_dir))
+            if is_symlink or (name in PRUNED_DIRECTORIES and not is_package):
+                continue
+            to_walk.append((full_dir, sub_dirs))
+        # Walked in name order, depth first.
+        stack.extend(reversed(to_walk))
+    return packages, directories
+
+
+def read_index(path: str, index_file: str) -> Optional[List[Tuple[str, str]]]:
+    """Read the packages from an index, or None if it's missing or out of date."""
+    try:
+        with open(index_file, "r") as fname:
+            index = json.load(fname)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(index, dict)
+        or index.get("version") != INDEX_VERSION
+        or index.get("path") != path
+    ):
+        return None
+    for directory, mtime in index["directories"].items():
+        try:
+            if os.stat(os.path.join(path, directory)).st_mtime_ns != mtime:
+                return None
+        except OSError:
+            return None
+    return [(name, os.path.join(path, package)) for name, package in index["packages"]]
+
+
+def write_index(
+    path: str,
+    index_file: str,
+    packages: List[Tuple[str, str]],
+    directories: Dict[str, int],
+) -> None:
+    """Write the packages found in a workspace to an index."""
+    index = {
+        "version": INDEX_VERSION,
+        "path": path,
+        "directories": directories,
+        "packages": [
+            [name, os.path.relpath(package, path)] for name, package in packages
+        ],
+    }
+    try:
+        with open(index_file, "w") as fname:
+            json.dump(index, fname)
+    except OSError as ex:
+        print("Unable to write package index {}: {}".format(index_file, ex))
+
+
+def find_packages(
+    path: str,
+    ignore_packages: Optional[List[str]] = None,
+    index_file: Optional[str] = None,
+) -> List[Tuple[str, str]]:
+    """
+    Find the packages in a workspace.
+
+    Returns the name and path of each package, leaving out packages named in
+    ignore_packages. If index_file is given, the packages are read from it
+    when the workspace hasn't changed, and written to it after a walk.
+    """
+    path = os.path.abspath(path)
+    packages = None  # type: Optional[List[Tuple[str, str]]]
+    if index_file is not None:
+        packages = read_index(path, index_file)
+    if packages is None:
+        packages, directories = walk_packages(path)
+        if index_file is not None:
+            write_index(path, index_file, packages, directories)
+    if ignore_packages:
+        packages = [
+            package for package in packages if package[0] not in ignore_packages
+        ]
+    return packages
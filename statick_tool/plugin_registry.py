@@ -0,0 +1,229 @@
+"""
+Find plugins from their yapsy plugin info files and import them when used.
+
+Plugin info files of Statick plugins carry a Statick section with the name the
+plugin returns from get_name, its category, and whether it adds command line
+arguments, so plugins can be listed without importing them:
+
+    [Core]
+    Name = Pylint Tool Plugin
+    Module = pylint_tool_plugin
+
+    [Statick]
+    Name = pylint
+    Category = Tool
+    Arguments = no
+
+Plugins without a Statick section are imported as soon as they are found.
+"""
+import configparser
+import importlib.util
+import logging
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from types import ModuleType
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+PLUGIN_INFO_EXTENSION = ".yapsy-plugin"
+
+PluginInfo = NamedTuple(
+    "PluginInfo",
+    [
+        ("name", str),
+        ("category", str),
+        ("arguments", bool),
+        ("info_file", str),
+        ("module", str),
+    ],
+)
+
+
+def read_plugin_info(info_file: str) -> Tuple[str, Optional[PluginInfo]]:
+    """
+    Read a plugin info file.
+
+    Returns the name of the plugin's module, and the plugin's Statick metadata
+    if the file has a Statick section.
+    """
+    parser = configparser.ConfigParser()
+    parser.read(info_file)
+    module = parser.get("Core", "Module")
+    if not parser.has_section("Statick"):
+        return module, None
+    return module, PluginInfo(
+        parser.get("Statick", "Name"),
+        parser.get("Statick", "Category"),
+        parser.getboolean("Statick", "Arguments", fallback=False),
+        info_file,
+        module,
+    )
+
+
+def import_plugin_module(info_file: str, module: str) -> ModuleType:
+    """Import the module of a plugin, as a file or a package next to its info file."""
+    path = os.path.join(os.path.dirname(info_file), module)
+    module_name = "statick_plugin_" + re.sub(r"\W", "_", module)
+    suffix = 0
+    while "{}_{}".format(module_name, suffix) in sys.modules:
+        suffix += 1
+    module_name = "{}_{}".format(module_name, suffix)
+
+    if os.path.isdir(path):
+        spec = importlib.util.spec_from_file_location(
+            module_name,
+            os.path.join(path, "__init__.py"),
+            submodule_search_locations=[path],
+        )
+    else:
+        spec = importlib.util.spec_from_file_location(module_name, path + ".py")
+    if spec is None or spec.loader is None:
+        raise ImportError("No plugin module found at {}".format(path))
+    plugin_module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = plugin_module
+    try:
+        spec.loader.exec_module(plugin_module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return plugin_module
+
+
+def create_plugin(
+    plugin_module: ModuleType, interfaces: Mapping[str, type]
+) -> Optional[Tuple[str, Any]]:
+    """
+    Create the plugin defined by a module.
+
+    Like yapsy, the plugin is the first class of the module, in name order,
+    that implements one of the plugin interfaces. Returns the category of the
+    plugin and the plugin, or None if the module has no plugin.
+    """
+    for name in dir(plugin_module):
+        element = getattr(plugin_module, name)
+        if not isinstance(element, type):
+            continue
+        for category, interface in interfaces.items():
+            if issubclass(element, interface) and element is not interface:
+                return category, element()
+    return None
+
+
+def load_plugin(info_file: str, module: str, interfaces: Mapping[str, type]) -> Any:
+    """Import and create a plugin, logging why if it can't be loaded."""
+    try:
+        plugin = create_plugin(import_plugin_module(info_file, module), interfaces)
+    except Exception:  # pylint: disable=broad-except
+        logging.error("Unable to import plugin: %s", info_file, exc_info=True)
+        return None
+    if plugin is None:
+        logging.error("No plugin found in %s", info_file)
+    return plugin
+
+
+class LazyPlugins(Mapping[str, Any]):
+    """
+    Plugins of one category, keyed by name, imported the first time they are used.
+
+    A plugin that can't be imported is reported when it is first used, and is
+    then treated as missing.
+    """
+
+    def __init__(self, interfaces: Mapping[str, type]) -> None:
+        """Initialize an empty set of plugins."""
+        self.interfaces = interfaces
+        self.infos = OrderedDict()  # type: Dict[str, Optional[PluginInfo]]
+        self.plugins = {}  # type: Dict[str, Any]
+        self.lock = threading.RLock()
+
+    def add_info(self, info: PluginInfo) -> None:
+        """Add a plugin to import when it is first used."""
+        with self.lock:
+            self.infos.pop(info.name, None)
+            self.plugins.pop(info.name, None)
+            self.infos[info.name] = info
+
+    def add_plugin(self, name: str, plugin: Any) -> None:
+        """Add a plugin that has already been created."""
+        with self.lock:
+            self.infos.pop(name, None)
+            self.infos[name] = None
+            self.plugins[name] = plugin
+
+    def is_loaded(self, name: str) -> bool:
+        """Check if a plugin has been imported."""
+        return name in self.plugins
+
+    def get_argument_plugins(self) -> List[str]:
+        """Get the names of the plugins that may add command line arguments."""
+        return [
+            name for name, info in self.infos.items() if info is None or info.arguments
+        ]
+
+    def __getitem__(self, name: str) -> Any:
+        """Get a plugin, importing it if it hasn't been used before."""
+        with self.lock:
+            if name in self.plugins:
+                return self.plugins[name]
+            info = self.infos[name]
+            assert info is not None
+            plugin = load_plugin(info.info_file, info.module, self.interfaces)
+            if plugin is None or plugin[0] != info.category:
+                if plugin is not None:
+                    logging.error(
+                        "%s is a %s plugin, not a %s plugin",
+                        info.info_file,
+                        plugin[0],
+                        info.category,
+                    )
+                del self.infos[name]
+                raise KeyError(name)
+            if plugin[1].get_name() != name:
+                logging.warning(
+                    "%s names plugin %s, but the plugin is named %s",
+                    info.info_file,
+                    name,
+                    plugin[1].get_name(),
+                )
+            self.plugins[name] = plugin[1]
+            return plugin[1]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names of the plugins."""
+        return iter(list(self.infos))
+
+    def __len__(self) -> int:
+        """Get the number of plugins."""
+        return len(self.infos)
+
+
+def find_plugins(
+    plugin_paths: List[str], interfaces: Mapping[str, type]
+) -> Dict[str, LazyPlugins]:
+    """
+    Find the plugins of each category under the plugin paths.
+
+    Plugins found later replace plugins with the same name found earlier.
+    """
+    plugins = {category: LazyPlugins(interfaces) for category in interfaces}
+    for plugin_path in plugin_paths:
+        for root, dirs, files in os.walk(plugin_path):
+            dirs.sort()
+            for filename in sorted(files):
+                if not filename.endswith(PLUGIN_INFO_EXTENSION):
+                    continue
+                info_file = os.path.join(root, filename)
+                try:
+                    module, info = read_plugin_info(info_file)
+                except configparser.Error as ex:
+                    logging.error("Invalid plugin info file %s: %s", info_file, ex)
+                    continue
+                if info is not None and info.category in plugins:
+                    plugins[info.category].add_info(info)
+                    continue
+                plugin = load_plugin(info_file, module, interfaces)
+                if plugin is not None:
+                    plugins[plugin[0]].add_plugin(plugin[1].get_name(), plugin[1])
+    return plugins
@@ -1,14 +1,23 @@
 """Discovery plugin to find CMake-based projects."""
+
 import argparse
+import filecmp
+import hashlib
+import json
 import os
 import re
 import shutil
 import subprocess
-from typing import List, Match, Optional, Pattern, Union
+from typing import List, Match, Optional, Pattern, Tuple, Union
 
+from statick_tool.compile_commands import BuildInfo, load_build_info
 from statick_tool.discovery_plugin import DiscoveryPlugin
 from statick_tool.exceptions import Exceptions
 from statick_tool.package import Package
+from statick_tool.result_cache import hash_file
+
+# File in a persistent build directory that records how it was configured.
+CONFIGURE_STAMP = "statick_configure.json"
 
 
 class CMakeDiscoveryPlugin(DiscoveryPlugin):
@@ -28,6 +37,20 @@ class CMakeDiscoveryPlugin(DiscoveryPlugin):
         args.add_argument(
             "--cmake-flags", dest="cmake_flags", type=str, help="CMake flags"
         )
+        args.add_argument(
+            "--cmake-build-directory",
+            dest="cmake_build_directory",
+            type=str,
+            help="Directory to keep CMake build directories in between scans, "
+            "so packages are configured and built incrementally",
+        )
+        args.add_argument(
+            "--cmake-compile-commands",
+            dest="cmake_compile_commands",
+            type=str,
+            help="Find targets in an existing compile_commands.json, CMake File "
+            "API reply, or build directory instead of running CMake",
+        )
 
     def scan(
         self, package: Package, level: str, exceptions: Optional[Exceptions] = None
@@ -49,8 +72,27 @@ class CMakeDiscoveryPlugin(DiscoveryPlugin):
 
         print("  Found cmake package {}".format(cmake_file))
 
-        cmake_template = self.plugin_context.resources.get_file("CMakeLists.txt.in")
-        shutil.copyfile(cmake_template, "CMakeLists.txt")  # type: ignore
+        compile_commands = getattr(
+            self.plugin_context.args, "cmake_compile_commands", None
+        )  # type: Optional[str]
+        if compile_commands:
+            build_info = load_build_info(
+                compile_commands, package.path, package.name
+            )  # type: Optional[BuildInfo]
+            if build_info is not None:
+                self.process_build_info(build_info, package)
+                print("  {} make targets found.".format(len(package["make_targets"])))
+                return
+            print(
+                "  No existing build found in {}, running CMake.".format(
+                    compile_commands
+                )
+            )
+
+        cmake_template = self.plugin_context.resources.get_file(
+            "CMakeLists.txt.in"
+        )  # type: Optional[str]
+        assert cmake_template is not None
 
         tool_flags = self.plugin_context.config.get_tool_config(
             "make", level, "flags", ""
@@ -97,29 +139,150 @@ class CMakeDiscoveryPlugin(DiscoveryPlugin):
             subproc_args.extend(default_flags)
         subproc_args.extend(path_flags)
 
+        build_directory = getattr(
+            self.plugin_context.args, "cmake_build_directory", None
+        )  # type: Optional[str]
+        if build_directory:
+            output = self.configure_persistent(
+                package, cmake_template, subproc_args, build_directory
+            )  # type: Optional[str]
+        else:
+            shutil.copyfile(cmake_template, "CMakeLists.txt")
+            output, _ = self.run_cmake(subproc_args)
+        if output is None:
+            return
+
+        if self.plugin_context.args.output_directory:
+            with open("cmake.log", "w") as fname:
+                fname.write(output)
+
+        self.process_output(output, package)
+
+        print("  {} make targets found.".format(len(package["make_targets"])))
+
+    def run_cmake(
+        self, subproc_args: List[str], cwd: Optional[str] = None
+    ) -> Tuple[Optional[str], bool]:
+        """
+        Run CMake in cwd.
+
+        Returns the output, or None if CMake couldn't be run, and whether CMake
+        succeeded.
+        """
+        assert self.plugin_context is not None
         try:
             output = subprocess.check_output(
-                subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
+                subproc_args, stderr=subprocess.STDOUT, universal_newlines=True, cwd=cwd
             )  # type: str
             if self.plugin_context.args.show_tool_output:
                 print("{}".format(output))
         except subprocess.CalledProcessError as ex:
             output = ex.output
             print("Problem running CMake! Returncode = {}".format(str(ex.returncode)))
-            print("From {}, running {}".format(os.getcwd(), subproc_args))
+            print("From {}, running {}".format(cwd or os.getcwd(), subproc_args))
             print("{}".format(ex.output))
+            return output, False
 
         except OSError:
             print("Couldn't find cmake executable!")
-            return
+            return None, False
+
+        return output, True
+
+    def configure_persistent(
+        self,
+        package: Package,
+        cmake_template: str,
+        subproc_args: List[str],
+        build_directory: str,
+    ) -> Optional[str]:
+        """
+        Configure package in a build directory that is kept between scans.
+
+        Each combination of package path and CMake arguments gets its own build
+        directory under build_directory. CMake is only run again when the
+        arguments or the CMake files of the package changed since the last
+        successful configuration, otherwise the output of that run is reused.
+        """
+        key = hashlib.sha256(
+            json.dumps([os.path.realpath(package.path), subproc_args]).encode("utf-8")
+        ).hexdigest()[:16]
+        build_dir = os.path.join(
+            os.path.abspath(build_directory), "{}-{}".format(package.name, key)
+        )
+        package["cmake_build_dir"] = build_dir
+        configure_hash = self.get_configure_hash(package, cmake_template, subproc_args)
+        stamp_path = os.path.join(build_dir, CONFIGURE_STAMP)
 
-        if self.plugin_context.args.output_directory:
-            with open("cmake.log", "w") as fname:
-                fname.write(output)
+        try:
+            with open(stamp_path, "r") as fname:
+                stamp = json.load(fname)
+            if stamp["hash"] == configure_hash and os.path.isfile(
+                os.path.join(build_dir, "CMakeCache.txt")
+            ):
+                print("  Reusing CMake configuration in {}".format(build_dir))
+                return str(stamp["output"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
 
-        self.process_output(output, package)
+        try:
+            os.makedirs(build_dir, exist_ok=True)
+            # Copying the template again would make it look newer than the build
+            # files, and make would configure the package all over again.
+            build_cmake_file = os.path.join(build_dir, "CMakeLists.txt")
+            if not os.path.isfile(build_cmake_file) or not filecmp.cmp(
+                cmake_template, build_cmake_file, shallow=False
+            ):
+                shutil.copyfile(cmake_template, build_cmake_file)
+        except OSError as ex:
+            print("Unable to set up CMake build directory {}: {}".format(build_dir, ex))
+            return None
+
+        print("  Configuring CMake build directory {}".format(build_dir))
+        output, succeeded = self.run_cmake(subproc_args, build_dir)
+        if output is None or not succeeded:
+            return output
 
-        print("  {} make targets found.".format(len(package["make_targets"])))
+        try:
+            with open(stamp_path, "w") as fname:
+                json.dump({"hash": configure_hash, "output": output}, fname)
+        except OSError as ex:
+            print("Unable to write {}: {}".format(stamp_path, ex))
+        return output
+
+    def get_configure_hash(
+        self, package: Package, cmake_template: str, subproc_args: List[str]
+    ) -> str:
+        """Get a hash of everything that affects how CMake configures package."""
+        digest = hashlib.sha256()
+        digest.update(json.dumps(subproc_args).encode("utf-8"))
+        digest.update(str(hash_file(cmake_template)).encode("utf-8"))
+        file_index = self.get_file_index(package)
+        for path in sorted(
+            file_index.find(globs=["CMakeLists.txt", "*.cmake", "package.xml"])
+        ):
+            digest.update(path.encode("utf-8"))
+            digest.update(str(hash_file(path)).encode("utf-8"))
+        return digest.hexdigest()
+
+    def process_build_info(self, build_info: BuildInfo, package: Package) -> None:
+        """Use the targets of an existing build instead of running CMake."""
+        package["make_targets"] = build_info.targets
+        package["src_dir"] = package.path
+        package["bin_dir"] = build_info.bin_dir
+        if build_info.compile_commands is not None:
+            package["compile_commands"] = build_info.compile_commands
+        package["cpplint"] = "cpplint"
+        package["cmake_prebuilt"] = True
+        # The same headers the CMake template lists for a project.
+        include_dir = os.path.join(package.path, "include", "")
+        package["headers"] = [
+            path
+            for path in self.get_file_index(package).find(
+                extensions=[".h", ".hpp", ".hxx"]
+            )
+            if path.startswith(include_dir)
+        ]
 
     @classmethod
     def process_output(  # pylint: disable=too-many-locals
@@ -152,9 +315,11 @@ class CMakeDiscoveryPlugin(DiscoveryPlugin):
                     if not qt_p.match(src)
                 ]
                 src = [
-                    src
-                    if os.path.isabs(src)  # noqa F812
-                    else os.path.join(src_dir, src)
+                    (
+                        src
+                        if os.path.isabs(src)  # noqa F812
+                        else os.path.join(src_dir, src)
+                    )
                     for src in src
                 ]  # NOLINT  # noqa F812
 
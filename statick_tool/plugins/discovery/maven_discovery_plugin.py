@@ -1,7 +1,5 @@
 """Discover Maven POM files to analyze."""
-import fnmatch
 import os
-from collections import OrderedDict
 from typing import List, Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -24,25 +22,19 @@ class MavenDiscoveryPlugin(DiscoveryPlugin):
         all_poms = []  # type: List[str]
         deepest_pom_level = 999999
 
-        for root, _, files in os.walk(package.path):
-            for f in fnmatch.filter(files, "pom.xml"):
-                full_path = os.path.join(root, f)
-                # Kind of an ugly hack, but it makes sure long paths don't
-                # mess up our depth tracking
-                if exceptions and not exceptions.filter_file_exceptions_early(
-                    package, [full_path]
-                ):
-                    continue
-                depth = full_path.count(os.sep)
-                if depth < deepest_pom_level:
-                    deepest_pom_level = depth
-                    top_poms = []
-                if depth == deepest_pom_level:
-                    top_poms.append(full_path)
-                all_poms.append(full_path)
-
-        top_poms = list(OrderedDict.fromkeys(top_poms))
-        all_poms = list(OrderedDict.fromkeys(all_poms))
+        file_index = self.get_file_index(package, exceptions)
+        poms = file_index.find(globs=["pom.xml"])
+        if exceptions:
+            poms = file_index.filter_excluded(poms)
+
+        for full_path in poms:
+            depth = full_path.count(os.sep)
+            if depth < deepest_pom_level:
+                deepest_pom_level = depth
+                top_poms = []
+            if depth == deepest_pom_level:
+                top_poms.append(full_path)
+            all_poms.append(full_path)
 
         print("  {} Maven POM files found.".format(len(all_poms)))
         print("  {} top-level Maven POM files found.".format(len(top_poms)))
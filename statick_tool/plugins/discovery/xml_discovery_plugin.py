@@ -1,7 +1,4 @@
 """Discover XML files to analyze."""
-import fnmatch
-import os
-from collections import OrderedDict
 from typing import List, Optional
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
@@ -20,22 +17,15 @@ class XMLDiscoveryPlugin(DiscoveryPlugin):
         self, package: Package, level: str, exceptions: Optional[Exceptions] = None
     ) -> None:
         """Scan package looking for XML files."""
-        xml_files = []  # type: List[str]
         globs = ["*.xml", "*.launch"]  # type: List[str]
 
-        root = ""
-        for root, _, files in os.walk(package.path):
-            for glob in globs:
-                for f in fnmatch.filter(files, glob):
-                    full_path = os.path.join(root, f)
-                    xml_files.append(os.path.abspath(full_path))
-
-        xml_files = list(OrderedDict.fromkeys(xml_files))
+        file_index = self.get_file_index(package, exceptions)
+        xml_files = file_index.find(globs=globs)
 
         print("  {} XML files found.".format(len(xml_files)))
         if exceptions:
             original_file_count = len(xml_files)
-            xml_files = exceptions.filter_file_exceptions_early(package, xml_files)
+            xml_files = file_index.filter_excluded(xml_files)
             if original_file_count > len(xml_files):
                 print(
                     "  After filtering, {} XML files will be scanned.".format(
@@ -1,8 +1,8 @@
 """Write issue reports to the console."""
-from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple
 
 from statick_tool.issue import Issue
+from statick_tool.issue_store import IssueStore
 from statick_tool.package import Package
 from statick_tool.reporting_plugin import ReportingPlugin
 
@@ -28,8 +28,14 @@ class PrintToConsoleReportingPlugin(ReportingPlugin):
             level: (:obj:`str`): Name of the level used in the scan
         """
         total = 0  # type: int
-        for key, value in issues.items():
-            unique_issues = list(OrderedDict.fromkeys(value))
+        severities = {}  # type: Dict[int, int]
+        # Duplicates are removed one tool at a time, so only the issues of a
+        # single tool are held in memory when the issues are spooled to disk.
+        for key, tool_issues in issues.items():
+            store = IssueStore({key: tool_issues})
+            unique_issues = store.get_tool(key)
+            for severity, count in store.count_by_severity().items():
+                severities[severity] = severities.get(severity, 0) + count
             print("Tool {}: {} unique issues".format(key, len(unique_issues)))
             for issue in unique_issues:
                 if issue.cert_reference:
@@ -58,5 +64,7 @@ class PrintToConsoleReportingPlugin(ReportingPlugin):
 
             total += len(unique_issues)
         print("{} total unique issues".format(total))
+        for severity, count in sorted(severities.items()):
+            print("  severity {}: {} unique issues".format(severity, count))
 
         return None, True
@@ -1,12 +1,61 @@
 """Write Statick results to Jenkins Warnings-NG plugin json-log compatible output."""
+
+import argparse
+import gzip
 import json
 import os
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 
 from statick_tool.issue import Issue
 from statick_tool.package import Package
 from statick_tool.reporting_plugin import ReportingPlugin
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore  # pylint: disable=invalid-name
+
+# Size of the buffer reports are written through, and the number of records
+# encoded before they are written out together.
+BUFFER_SIZE = 1 << 20
+CHUNK_SIZE = 1024
+
+
+def compute_severity(severity: Any) -> str:
+    """Convert a Statick severity to a Warnings-NG severity."""
+    result = "LOW"
+    try:
+        if int(severity) > 0:
+            result = "NORMAL"
+        if int(severity) > 2:
+            result = "HIGH"
+        if int(severity) > 4:
+            result = "ERROR"
+    except ValueError as ex:
+        print(
+            "Invalid severity integer ({}), using default 'LOW' severity. "
+            "Error = {}".format(severity, ex)
+        )
+    return result
+
+
+# Warnings-NG severities for the severities Statick tools report. Other values
+# are added as they are seen.
+SEVERITIES = {
+    severity: compute_severity(severity)
+    for severity in list(range(6)) + [str(value) for value in range(6)]
+}  # type: Dict[Any, str]
+
+
+def get_severity(severity: Any) -> str:
+    """Get the Warnings-NG severity for a Statick severity."""
+    try:
+        return SEVERITIES[severity]
+    except KeyError:
+        result = compute_severity(severity)
+        SEVERITIES[severity] = result
+        return result
+
 
 class WriteJenkinsWarningsNGReportingPlugin(ReportingPlugin):
     """Writes Statick results to Jenkins Warnings-NG plugin json-log compatible output."""
@@ -15,6 +64,22 @@ class WriteJenkinsWarningsNGReportingPlugin(ReportingPlugin):
         """Return the plugin name."""
         return "write_jenkins_warnings_ng"
 
+    def gather_args(self, args: argparse.Namespace) -> None:
+        """Gather arguments."""
+        args.add_argument(
+            "--jenkins-warnings-ng-gzip",
+            dest="jenkins_warnings_ng_gzip",
+            action="store_true",
+            help="Compress Jenkins Warnings-NG reports with gzip",
+        )
+        args.add_argument(
+            "--jenkins-warnings-ng-output",
+            dest="jenkins_warnings_ng_output",
+            type=str,
+            help="Append the issues of every package to one Jenkins Warnings-NG "
+            "report file instead of writing a file per package",
+        )
+
     def report(
         self, package: Package, issues: Dict[str, List[Issue]], level: str
     ) -> Tuple[Optional[None], bool]:
@@ -31,6 +96,15 @@ class WriteJenkinsWarningsNGReportingPlugin(ReportingPlugin):
         if self.plugin_context is None:
             return None, False
 
+        compress = getattr(self.plugin_context.args, "jenkins_warnings_ng_gzip", False)
+        append_file = getattr(
+            self.plugin_context.args, "jenkins_warnings_ng_output", None
+        )  # type: Optional[str]
+        if append_file:
+            print("Appending output to {}".format(append_file))
+            self.write_report(append_file, issues, compress, append=True)
+            return None, True
+
         # Do not write report to file if no output directory is given.
         if not self.plugin_context.args.output_directory:
             return None, True
@@ -49,32 +123,65 @@ class WriteJenkinsWarningsNGReportingPlugin(ReportingPlugin):
         output_file = os.path.join(
             output_dir, package.name + "-" + level + ".json.statick"
         )
+        if compress:
+            output_file += ".gz"
         print("Writing output to {}".format(output_file))
-        with open(output_file, "w") as out:
-            for _, value in issues.items():
-                for issue in value:
-                    severity = "LOW"
-                    try:
-                        if int(issue.severity) > 0:
-                            severity = "NORMAL"
-                        if int(issue.severity) > 2:
-                            severity = "HIGH"
-                        if int(issue.severity) > 4:
-                            severity = "ERROR"
-                    except ValueError as ex:
-                        print(
-                            "Invalid severity integer ({}), using default 'LOW' severity. "
-                            "Error = {}".format(issue.severity, ex)
-                        )
-                    issue_dict = {
-                        "fileName": issue.filename,
-                        "severity": severity,
-                        "lineStart": issue.line_number,
-                        "message": issue.message,
-                        "category": issue.tool,
-                        "type": issue.issue_type,
-                    }
-                    line = json.dumps(issue_dict, sort_keys=True) + "\n"
-                    out.write(line)
+        self.write_report(output_file, issues, compress)
 
         return None, True
+
+    def write_report(
+        self,
+        path: str,
+        issues: Mapping[str, Iterable[Issue]],
+        compress: bool,
+        append: bool = False,
+    ) -> None:
+        """
+        Write issues to a report file.
+
+        When appending, the file is locked while the issues are written, so
+        package scans running at the same time can share one report file without
+        mixing their records. A compressed report gets one gzip member per
+        package, which gzip readers decompress as one stream.
+        """
+        with open(path, "ab" if append else "wb", buffering=BUFFER_SIZE) as out:
+            if append and fcntl is not None:
+                # Released when the file is closed, after the buffer is flushed.
+                fcntl.lockf(out, fcntl.LOCK_EX)
+            if compress:
+                with gzip.GzipFile(fileobj=out, mode="wb") as compressed:
+                    self.write_issues(compressed.write, issues)
+            else:
+                self.write_issues(out.write, issues)
+
+    @classmethod
+    def write_issues(
+        cls,
+        write: Callable[[bytes], Any],
+        issues: Mapping[str, Iterable[Issue]],
+    ) -> None:
+        """Write one JSON record per issue with write."""
+        # Keys are added in sorted order, so the records are the same as those
+        # written with sort_keys without sorting each record.
+        encode = json.JSONEncoder().encode
+        lines = []  # type: List[str]
+        for tool_issues in issues.values():
+            for issue in tool_issues:
+                lines.append(
+                    encode(
+                        {
+                            "category": issue.tool,
+                            "fileName": issue.filename,
+                            "lineStart": issue.line_number,
+                            "message": issue.message,
+                            "severity": get_severity(issue.severity),
+                            "type": issue.issue_type,
+                        }
+                    )
+                )
+                if len(lines) >= CHUNK_SIZE:
+                    write(("\n".join(lines) + "\n").encode("utf-8"))
+                    lines = []
+        if lines:
+            write(("\n".join(lines) + "\n").encode("utf-8"))
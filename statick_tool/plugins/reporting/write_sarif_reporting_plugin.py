@@ -0,0 +1,195 @@
+"""Write Statick results to a SARIF 2.1.0 log."""
+
+import json
+import os
+import pathlib
+from collections import OrderedDict
+from typing import IO, Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+from urllib.parse import quote
+
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+from statick_tool.reporting_plugin import ReportingPlugin
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+# Base of the artifact locations of files inside the package.
+SRCROOT = "SRCROOT"
+# Size of the buffer the log is written through.
+BUFFER_SIZE = 1 << 20
+
+
+def get_level(severity: Any) -> str:
+    """Convert a Statick severity to a SARIF result level."""
+    try:
+        value = int(severity)
+    except (TypeError, ValueError):
+        return "warning"
+    if value > 4:
+        return "error"
+    if value > 2:
+        return "warning"
+    return "note"
+
+
+class WriteSarifReportingPlugin(ReportingPlugin):
+    """Writes Statick results to a SARIF 2.1.0 log."""
+
+    def get_name(self) -> str:
+        """Return the plugin name."""
+        return "write_sarif"
+
+    def report(
+        self, package: Package, issues: Dict[str, List[Issue]], level: str
+    ) -> Tuple[Optional[None], bool]:
+        """
+        Write the results to a SARIF file.
+
+        Args:
+            package (:obj:`Package`): The Package object that was analyzed.
+            issues (:obj:`dict` of :obj:`str` to :obj:`Issue`): The issues
+                found by the Statick analysis, keyed by the tool that found
+                them.
+            level: (:obj:`str`): Name of the level used in the scan.
+        """
+        if self.plugin_context is None:
+            return None, False
+
+        # Do not write report to file if no output directory is given.
+        if not self.plugin_context.args.output_directory:
+            return None, True
+
+        output_dir = os.path.join(
+            self.plugin_context.args.output_directory, package.name + "-" + level
+        )
+
+        if not os.path.exists(output_dir):
+            os.mkdir(output_dir)
+        if not os.path.isdir(output_dir):
+            print("Unable to create output directory at {}!".format(output_dir))
+            return None, False
+
+        output_file = os.path.join(output_dir, package.name + "-" + level + ".sarif")
+        print("Writing output to {}".format(output_file))
+        with open(output_file, "w", buffering=BUFFER_SIZE, encoding="utf-8") as out:
+            self.write_log(out, package, issues)
+
+        return None, True
+
+    @classmethod
+    def write_log(
+        cls, out: IO[str], package: Package, issues: Mapping[str, Iterable[Issue]]
+    ) -> None:
+        """
+        Write a SARIF log with one run per tool.
+
+        Results are written as they are read, so the issues of a tool never have
+        to be in memory at once. The rules of a run are only known once all of
+        its results have been seen, so they come after the results.
+        """
+        encode = json.JSONEncoder().encode
+        out.write(
+            '{{"$schema": {}, "version": {}, "runs": ['.format(
+                encode(SARIF_SCHEMA), encode(SARIF_VERSION)
+            )
+        )
+        root = os.path.abspath(package.path)
+        for index, (tool, tool_issues) in enumerate(issues.items()):
+            if index:
+                out.write(",")
+            out.write('\n{"results": [')
+            rules = OrderedDict()  # type: Dict[str, Tuple[int, Set[str]]]
+            artifact_locations = {}  # type: Dict[str, Dict[str, str]]
+            for result_index, issue in enumerate(tool_issues):
+                if result_index:
+                    out.write(",")
+                filename = str(issue.filename)
+                artifact_location = artifact_locations.get(filename)
+                if artifact_location is None:
+                    artifact_location = cls.get_artifact_location(filename, root)
+                    artifact_locations[filename] = artifact_location
+                out.write("\n")
+                out.write(encode(cls.get_result(issue, artifact_location, rules)))
+            out.write(
+                '\n], "tool": {}, "originalUriBaseIds": {}}}'.format(
+                    encode({"driver": cls.get_driver(tool, rules)}),
+                    encode({SRCROOT: {"uri": pathlib.Path(root).as_uri() + "/"}}),
+                )
+            )
+        out.write("\n]}\n")
+
+    @staticmethod
+    def get_artifact_location(filename: str, root: str) -> Dict[str, str]:
+        """Get the SARIF artifact location of a file, relative to root if inside it."""
+        path = os.path.normpath(os.path.join(root, filename))
+        if path.startswith(os.path.join(root, "")):
+            return OrderedDict(
+                [
+                    ("uri", quote(os.path.relpath(path, root).replace(os.sep, "/"))),
+                    ("uriBaseId", SRCROOT),
+                ]
+            )
+        if os.path.isabs(filename):
+            return {"uri": pathlib.Path(filename).as_uri()}
+        return {"uri": quote(filename.replace(os.sep, "/"))}
+
+    @staticmethod
+    def get_result(
+        issue: Issue,
+        artifact_location: Dict[str, str],
+        rules: Dict[str, Tuple[int, Set[str]]],
+    ) -> Dict[str, Any]:
+        """
+        Get the SARIF result of an issue.
+
+        The issue type is the rule of the result. Rules are added to rules
+        as they are seen, with their index and the CERT references of their
+        issues.
+        """
+        rule_id = str(issue.issue_type)
+        rule = rules.get(rule_id)
+        if rule is None:
+            rule = rules[rule_id] = (len(rules), set())
+        if issue.cert_reference:
+            rule[1].add(issue.cert_reference)
+
+        physical_location = OrderedDict(
+            [("artifactLocation", artifact_location)]
+        )  # type: Dict[str, Any]
+        try:
+            line_number = int(issue.line_number)
+        except (TypeError, ValueError):
+            line_number = 0
+        if line_number > 0:
+            physical_location["region"] = {"startLine": line_number}
+
+        result = OrderedDict(
+            [
+                ("ruleId", rule_id),
+                ("ruleIndex", rule[0]),
+                ("level", get_level(issue.severity)),
+                ("message", {"text": issue.message}),
+                ("locations", [{"physicalLocation": physical_location}]),
+                ("properties", {"severity": str(issue.severity)}),
+            ]
+        )  # type: Dict[str, Any]
+        if issue.cert_reference:
+            result["properties"]["certReference"] = issue.cert_reference
+        return result
+
+    @staticmethod
+    def get_driver(
+        tool: str, rules: Mapping[str, Tuple[int, Set[str]]]
+    ) -> Dict[str, Any]:
+        """Get the SARIF tool component of a tool and the rules of its results."""
+        driver_rules = []  # type: List[Dict[str, Any]]
+        for rule_id, (_, cert_references) in rules.items():
+            rule = OrderedDict([("id", rule_id)])  # type: Dict[str, Any]
+            if cert_references:
+                rule["properties"] = {
+                    "tags": [
+                        "CERT " + reference for reference in sorted(cert_references)
+                    ]
+                }
+            driver_rules.append(rule)
+        return OrderedDict([("name", tool), ("rules", driver_rules)])
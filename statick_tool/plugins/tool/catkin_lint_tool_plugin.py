@@ -1,4 +1,5 @@
 """Apply catkin_lint tool and gather results."""
+
 import os
 import re
 import subprocess
@@ -16,6 +17,10 @@ class CatkinLintToolPlugin(ToolPlugin):
         """Get name of tool."""
         return "catkin_lint"
 
+    def inputs_changed(self, package: Package) -> bool:
+        """Return whether any CMake or package files have changed."""
+        return self.any_file_changed(package, ["CMakeLists.txt", "package.xml"])
+
     def scan(self, package: Package, level: str) -> Optional[List[Issue]]:
         """Run tool and gather output."""
         if "catkin" not in package or not package["catkin"]:
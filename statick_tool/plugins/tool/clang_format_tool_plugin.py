@@ -79,21 +79,23 @@ class ClangFormatToolPlugin(ToolPlugin):
         if not check:
             return []
 
+        def run_clang_format(src: str) -> str:
+            output = subprocess.check_output(
+                [clang_format_bin, src, "-output-replacements-xml"],
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+            )
+            return src + "\n" + output
+
         total_output = []  # type: List[str]
 
         try:
-            for src in files:
-                output = subprocess.check_output(
-                    [clang_format_bin, src, "-output-replacements-xml"],
-                    stderr=subprocess.STDOUT,
-                    universal_newlines=True,
-                )
-                output = src + "\n" + output
-                if (
-                    self.plugin_context
-                    and self.plugin_context.args.clang_format_raise_exception
-                ):
-                    total_output.append(output)
+            outputs = self.map_files(run_clang_format, files)
+            if (
+                self.plugin_context
+                and self.plugin_context.args.clang_format_raise_exception
+            ):
+                total_output = outputs
 
         except (IOError, OSError) as ex:
             print("clang-format binary failed: {}".format(clang_format_bin))
@@ -1,13 +1,33 @@
 """Apply clang-tidy tool and gather results."""
+
 import argparse
+import contextlib
+import os
 import re
-import subprocess
-from typing import List, Match, Optional, Pattern
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Match,
+    Optional,
+    Pattern,
+    Set,
+    TextIO,
+    Tuple,
+)
 
 from statick_tool.issue import Issue
+from statick_tool.job_server import get_job_server
 from statick_tool.package import Package
 from statick_tool.tool_plugin import ToolPlugin
 
+CLANG_TIDY_RE = re.compile(
+    r"(.+):(\d+):(\d+):\s(.+):\s(.+)\s\[(.+)\]"
+)  # type: Pattern[str]
+
 
 class ClangTidyToolPlugin(ToolPlugin):
     """Apply clang-tidy tool and gather results."""
@@ -29,6 +49,13 @@ class ClangTidyToolPlugin(ToolPlugin):
             type=str,
             help="clang-tidy binary path",
         )
+        args.add_argument(
+            "--clang-tidy-jobs",
+            dest="clang_tidy_jobs",
+            type=int,
+            default=1,
+            help="Number of clang-tidy processes to split the source files between",
+        )
 
     def scan(self, package: Package, level: str) -> Optional[List[Issue]]:
         """Run tool and gather output."""
@@ -55,10 +82,15 @@ class ClangTidyToolPlugin(ToolPlugin):
         if self.plugin_context.args.clang_tidy_bin is not None:
             clang_tidy_bin = self.plugin_context.args.clang_tidy_bin
 
+        # An existing build names the compilation database it was found in.
+        build_path = package["bin_dir"]
+        if package.get("compile_commands"):
+            build_path = os.path.dirname(package["compile_commands"])
+
         flags = [
             "-header-filter=" + package["src_dir"] + "/.*",
             "-p",
-            package["bin_dir"] + "/compile_commands.json",
+            build_path,
             "-extra-arg=-fopenmp=libomp",
         ]  # type: List[str]
         flags += self.get_user_flags(level)
@@ -68,37 +100,116 @@ class ClangTidyToolPlugin(ToolPlugin):
             for target in package["make_targets"]:
                 files += target["src"]
 
+        jobs = getattr(self.plugin_context.args, "clang_tidy_jobs", 1) or 1
+        shards = self.get_shards(files, jobs)
+        command = [clang_tidy_bin] + flags
         try:
-            output = subprocess.check_output(
-                [clang_tidy_bin] + flags + files,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-            )
-            if (
-                "clang-diagnostic-error" in output
-            ):  # pylint: disable=unsupported-membership-test
-                raise subprocess.CalledProcessError(-1, clang_tidy_bin, output)
-        except subprocess.CalledProcessError as ex:
-            output = ex.output
-            if ex.returncode != 1:
-                print("clang-tidy failed! Returncode = {}".format(str(ex.returncode)))
-                print("{}".format(ex.output))
-                return None
-
+            with self.open_log() as log:
+                if len(shards) == 1:
+                    results = [self.run_shard(command + shards[0], log)]
+                else:
+                    results = self.run_shards(command, shards, log)
         except OSError as ex:
             print("Couldn't find {}! ({})".format(clang_tidy_bin, ex))
             return None
 
-        if self.plugin_context.args.show_tool_output:
-            print("{}".format(output))
-
-        if self.plugin_context.args.output_directory:
-            with open(self.get_name() + ".log", "w") as fname:
-                fname.write(output)
+        for _, returncode, tail in results:
+            if returncode not in (0, 1):
+                print("clang-tidy failed! Returncode = {}".format(str(returncode)))
+                print("{}".format(tail))
+                return None
 
-        issues = self.parse_output(output)  # type: List[Issue]
+        # Each translation unit reports the issues in the headers it includes,
+        # so the same header issue can be found by several shards.
+        issues = []  # type: List[Issue]
+        found = set()  # type: Set[Issue]
+        for shard_issues, _, _ in results:
+            for issue in shard_issues:
+                if issue not in found:
+                    found.add(issue)
+                    issues.append(issue)
         return issues
 
+    @staticmethod
+    def get_shards(files: List[str], jobs: int) -> List[List[str]]:
+        """
+        Split files into at most jobs shards of about the same size.
+
+        Files stay in order, so issues from the shards can be put back together
+        in the order a single clang-tidy run would report them.
+        """
+        count = max(1, min(jobs, len(files)))
+        size, extra = divmod(len(files), count)
+        shards = []  # type: List[List[str]]
+        start = 0
+        for i in range(count):
+            end = start + size + (1 if i < extra else 0)
+            shards.append(files[start:end])
+            start = end
+        return shards
+
+    def run_shard(
+        self, command: List[str], log: TextIO
+    ) -> Tuple[List[Issue], int, str]:
+        """
+        Run clang-tidy once and parse its output while it runs.
+
+        Returns the issues found, the return code, and the last lines of output.
+        A clang-diagnostic-error in the output counts as a failure.
+        """
+        diagnostic_error = []  # type: List[str]
+
+        def check_lines(lines: Iterable[str]) -> Iterator[str]:
+            for line in lines:
+                if "clang-diagnostic-error" in line:
+                    diagnostic_error.append(line)
+                yield line
+
+        # Issues are parsed while clang-tidy runs, so its output, which can be
+        # very large, is never held in memory all at once.
+        with self.start_process(command, log) as process:
+            issues = self.parse_lines(check_lines(process))
+            returncode = process.wait()
+        if diagnostic_error:
+            returncode = -1
+        return issues, returncode, process.get_tail()
+
+    def run_shards(
+        self, command: List[str], shards: List[List[str]], log: TextIO
+    ) -> List[Tuple[List[Issue], int, str]]:
+        """
+        Run clang-tidy on each shard of files at the same time.
+
+        Each shard logs to a temporary file, and the shard logs are added to log
+        in order once all shards are done, so the output of different shards
+        isn't mixed together. With a job budget, every shard but the first waits
+        for a free job.
+        """
+        job_server = get_job_server()
+
+        def run_job(
+            index: int, shard: List[str], shard_log: TextIO
+        ) -> Tuple[List[Issue], int, str]:
+            if index == 0 or job_server is None:
+                return self.run_shard(command + shard, shard_log)
+            with job_server.job():
+                return self.run_shard(command + shard, shard_log)
+
+        with contextlib.ExitStack() as stack:
+            shard_logs = [
+                stack.enter_context(tempfile.TemporaryFile("w+")) for _ in shards
+            ]
+            with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+                futures = [
+                    executor.submit(run_job, index, shard, shard_log)
+                    for index, (shard, shard_log) in enumerate(zip(shards, shard_logs))
+                ]
+                results = [future.result() for future in futures]
+            for shard_log in shard_logs:
+                shard_log.seek(0)
+                shutil.copyfileobj(shard_log, log)
+        return results
+
     @classmethod
     def check_for_exceptions(cls, match: Match[str]) -> bool:
         """Manual exceptions."""
@@ -111,13 +222,15 @@ class ClangTidyToolPlugin(ToolPlugin):
 
     def parse_output(self, output: str) -> List[Issue]:
         """Parse tool output and report issues."""
-        clang_tidy_re = r"(.+):(\d+):(\d+):\s(.+):\s(.+)\s\[(.+)\]"
-        parse = re.compile(clang_tidy_re)  # type: Pattern[str]
+        return self.parse_lines(output.splitlines())
+
+    def parse_lines(self, lines: Iterable[str]) -> List[Issue]:
+        """Parse lines of tool output, as they are read, and report issues."""
         issues = []
         # Load the plugin mapping if possible
         warnings_mapping = self.load_mapping()
-        for line in output.splitlines():
-            match = parse.match(line)  # type: Optional[Match[str]]
+        for line in lines:
+            match = CLANG_TIDY_RE.match(line)  # type: Optional[Match[str]]
             if match and not self.check_for_exceptions(match):
                 if (
                     line[1] != "*"
@@ -1,4 +1,5 @@
 """Apply cmakelint tool and gather results."""
+
 import os
 import re
 import subprocess
@@ -16,6 +17,10 @@ class CMakelintToolPlugin(ToolPlugin):
         """Get name of tool."""
         return "cmakelint"
 
+    def inputs_changed(self, package: Package) -> bool:
+        """Return whether any CMake files have changed."""
+        return self.any_file_changed(package, ["CMakeLists.txt"])
+
     def scan(self, package: Package, level: str) -> Optional[List[Issue]]:
         """Run tool and gather output."""
         if "cmake" not in package or not package["cmake"]:
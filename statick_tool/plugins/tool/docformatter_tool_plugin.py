@@ -29,9 +29,9 @@ class DocformatterToolPlugin(ToolPlugin):
         tool_bin = "docformatter"
         total_output = []  # type: List[str]
 
-        for src in package["python_src"]:
+        for chunk in self.get_file_chunks(package["python_src"]):
             try:
-                subproc_args = [tool_bin, src] + flags
+                subproc_args = [tool_bin] + chunk + flags
                 output = subprocess.check_output(
                     subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
                 )
@@ -1,4 +1,6 @@
 """Apply lizard tool and gather results."""
+import fnmatch
+import os
 import re
 import subprocess
 from typing import List, Match, Optional, Pattern
@@ -7,6 +9,23 @@ from statick_tool.issue import Issue
 from statick_tool.package import Package
 from statick_tool.tool_plugin import ToolPlugin
 
+# Source files of the languages lizard measures.
+SOURCE_GLOBS = [
+    "*.c",
+    "*.cc",
+    "*.cpp",
+    "*.cxx",
+    "*.h",
+    "*.hpp",
+    "*.hxx",
+    "*.java",
+    "*.js",
+    "*.m",
+    "*.py",
+    "*.rb",
+    "*.swift",
+]
+
 
 class LizardToolPlugin(ToolPlugin):
     """Apply Lizard tool and gather results."""
@@ -15,14 +34,42 @@ class LizardToolPlugin(ToolPlugin):
         """Get name of tool."""
         return "lizard"
 
+    def inputs_changed(self, package: Package) -> bool:
+        """Return whether any source files lizard measures have changed."""
+        return self.any_file_changed(package, SOURCE_GLOBS)
+
+    @staticmethod
+    def get_paths(package: Package) -> List[str]:
+        """
+        Get the paths to run lizard on.
+
+        That is the whole package, or only the changed source files when
+        scanning files changed in git.
+        """
+        if package.changed_files is None:
+            return [package.path]
+        package_path = os.path.join(os.path.realpath(package.path), "")
+        return sorted(
+            path
+            for path in package.changed_files
+            if path.startswith(package_path)
+            and any(
+                fnmatch.fnmatch(os.path.basename(path), glob) for glob in SOURCE_GLOBS
+            )
+        )
+
     def scan(self, package: Package, level: str) -> Optional[List[Issue]]:
         """Run tool and gather output."""
         if not package.path:
             return []
 
+        paths = self.get_paths(package)
+        if not paths:
+            return []
+
         try:
             output = subprocess.check_output(
-                ["lizard", "-w", package.path], universal_newlines=True
+                ["lizard", "-w"] + paths, universal_newlines=True
             )
 
         except subprocess.CalledProcessError as ex:
@@ -1,12 +1,28 @@
 """Apply make tool and gather results."""
+
+import json
+import os
 import re
 import subprocess
-from typing import Any, List, Match, Optional, Pattern
+from typing import Any, Dict, Iterable, Iterator, List, Match, Optional, Pattern, Set
 
 from statick_tool.issue import Issue
+from statick_tool.job_server import get_job_server, get_make_version
 from statick_tool.package import Package
 from statick_tool.tool_plugin import ToolPlugin
 
+MAKE_RE = re.compile(r"(.+):(\d+):(\d+):\s(.+):\s(.+)")  # type: Pattern[str]
+MAKE_WARNING_RE = re.compile(r".*\[(.+)\].*")  # type: Pattern[str]
+# Progress lines printed by Makefiles generated by CMake. The compiler output for
+# an object file comes after the line saying it is being built.
+BUILDING_RE = re.compile(r"\[\s*\d+%\] Building \w+ object (.+)")  # type: Pattern[str]
+PROGRESS_RE = re.compile(
+    r"\[\s*\d+%\] |Scanning dependencies of target "
+)  # type: Pattern[str]
+
+# File in a persistent build directory with the warnings for each object file.
+WARNINGS_CACHE = "statick_make_warnings.json"
+
 
 class MakeToolPlugin(ToolPlugin):
     """Apply Make tool and gather results."""
@@ -15,25 +31,65 @@ class MakeToolPlugin(ToolPlugin):
         """Get name of tool."""
         return "make"
 
+    def inputs_changed(self, package: Package) -> bool:
+        """Return whether any C/C++ source or CMake files have changed."""
+        return self.any_file_changed(
+            package,
+            [
+                "*.c",
+                "*.cc",
+                "*.cpp",
+                "*.cxx",
+                "*.h",
+                "*.hpp",
+                "*.hxx",
+                "CMakeLists.txt",
+                "*.cmake",
+            ],
+        )
+
     def scan(self, package: Package, level: str) -> Optional[List[Issue]]:
         """Run tool and gather output."""
         if "make_targets" not in package or not package["make_targets"]:
             print("  Skipping make. No targets.")
             return []
+        if package.get("cmake_prebuilt"):
+            print("  Skipping make. Targets were found in an existing build.")
+            return []
 
-        output = None
         make_args = ["make", "statick_cmake_target"]
+        process_args = {}  # type: Dict[str, Any]
+        job_server = get_job_server()
+        if job_server is not None:
+            # Build in parallel using the shared job budget. Output sync, from
+            # make 4.0, keeps each object's progress line and compiler output
+            # together instead of interleaving lines from different jobs.
+            version = get_make_version()
+            if version is not None and version >= (4, 0):
+                make_args.append("--output-sync=target")
+            process_args["env"] = job_server.get_make_env()
+            process_args["pass_fds"] = job_server.get_pass_fds()
+        # With a persistent build directory, only objects whose sources changed
+        # are rebuilt, and warnings for the others are replayed from a cache.
+        build_dir = package.get("cmake_build_dir")  # type: Optional[str]
+        objects = None  # type: Optional[Dict[str, List[Issue]]]
+        if build_dir is not None:
+            objects = {}
 
         try:
-            output = subprocess.check_output(["make", "clean"], universal_newlines=True)
-            output = subprocess.check_output(
-                make_args, stderr=subprocess.STDOUT, universal_newlines=True
-            )
-            if self.plugin_context and self.plugin_context.args.show_tool_output:
-                print("{}".format(output))
+            if build_dir is None:
+                subprocess.check_output(["make", "clean"], universal_newlines=True)
+            # Issues are parsed while make runs, so its output, which can be very
+            # large, is never held in memory all at once.
+            with self.open_log() as log, self.start_process(
+                make_args, log, cwd=build_dir, **process_args
+            ) as process:
+                issues = self.parse_lines(package, process, objects)
+                returncode = process.wait()
+            if build_dir is not None and objects is not None:
+                issues = self.replay_warnings(build_dir, issues, objects)
 
         except subprocess.CalledProcessError as ex:
-            output = ex.output
             print("Make failed! Returncode = {}".format(ex.returncode))
             print("Exception output: {}".format(ex.output))
             return None
@@ -42,11 +98,11 @@ class MakeToolPlugin(ToolPlugin):
             print("Couldn't find make executable! ({})".format(ex))
             return None
 
-        if self.plugin_context and self.plugin_context.args.output_directory:
-            with open(self.get_name() + ".log", "w") as fname:
-                fname.write(output)
+        if returncode != 0:
+            print("Make failed! Returncode = {}".format(returncode))
+            print("Exception output: {}".format(process.get_tail()))
+            return None
 
-        issues = self.parse_output(package, output)
         return issues
 
     @classmethod
@@ -55,51 +111,115 @@ class MakeToolPlugin(ToolPlugin):
         return match.group(4) == "note"
 
     @classmethod
-    def filter_matches(cls, matches: Any, package: Package) -> Any:
+    def filter_matches(cls, matches: Iterable[Any], package: Package) -> Iterator[Any]:
         """Filter matches."""
-        i = 0
-        result = []
-        while i < len(matches):
-            cur_match = matches[i]
-            if "overloaded-virtual" in cur_match[4] and i + 1 < len(matches):
-                next_match = matches[i + 1]
-                if next_match[0].startswith(package.path):
-                    result.append(
-                        (
-                            next_match[0],
-                            next_match[1],
-                            next_match[2],
-                            cur_match[3],
-                            cur_match[4] + next_match[4],
-                        )
-                    )
-                i += 1  # Skip next match.
+        matches = iter(matches)
+        for cur_match in matches:
+            if "overloaded-virtual" in cur_match[4]:
+                next_match = next(matches, None)
+                if next_match is None:
+                    yield cur_match
+                elif next_match[0].startswith(package.path):
+                    yield (
+                        next_match[0],
+                        next_match[1],
+                        next_match[2],
+                        cur_match[3],
+                        cur_match[4] + next_match[4],
+                    ) + tuple(next_match[5:])
             else:
-                result.append(cur_match)
-            i += 1
-        return result
+                yield cur_match
 
-    def parse_output(  # pylint: disable=too-many-locals, too-many-branches
-        self, package: Package, output: str
+    @staticmethod
+    def replay_warnings(
+        build_dir: str, issues: List[Issue], objects: Dict[str, List[Issue]]
     ) -> List[Issue]:
+        """
+        Add the cached warnings for object files that weren't rebuilt to issues.
+
+        The cache is updated with the warnings of the objects that were rebuilt,
+        given by object file name, and objects that no longer exist are removed.
+        """
+        path = os.path.join(build_dir, WARNINGS_CACHE)
+        cached = {}  # type: Dict[str, List[Issue]]
+        try:
+            with open(path, "r") as fname:
+                cached = {
+                    name: [Issue(*entry) for entry in entries]
+                    for name, entries in json.load(fname).items()
+                }
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+        cached.update(objects)
+        cached = {
+            name: object_issues
+            for name, object_issues in cached.items()
+            if os.path.exists(os.path.join(build_dir, name))
+        }
+        try:
+            with open(path, "w") as fname:
+                json.dump(
+                    {
+                        name: [list(issue) for issue in object_issues]
+                        for name, object_issues in cached.items()
+                    },
+                    fname,
+                )
+        except OSError as ex:
+            print("Unable to write {}: {}".format(path, ex))
+
+        found = set(issues)  # type: Set[Issue]
+        issues = list(issues)
+        for name in sorted(cached):
+            if name in objects:
+                continue
+            for issue in cached[name]:
+                if issue not in found:
+                    found.add(issue)
+                    issues.append(issue)
+        return issues
+
+    def parse_output(self, package: Package, output: str) -> List[Issue]:
         """Parse tool output and report issues."""
-        make_re = r"(.+):(\d+):(\d+):\s(.+):\s(.+)"
-        make_warning_re = r".*\[(.+)\].*"
-        parse = re.compile(make_re)  # type: Pattern[str]
-        warning_parse = re.compile(make_warning_re)  # type: Pattern[str]
-        matches = []  # type: Any
+        return self.parse_lines(package, output.splitlines())
+
+    def parse_lines(  # pylint: disable=too-many-branches
+        self,
+        package: Package,
+        lines: Iterable[str],
+        objects: Optional[Dict[str, List[Issue]]] = None,
+    ) -> List[Issue]:
+        """
+        Parse lines of tool output, as they are read, and report issues.
+
+        If objects is given, it is filled with the issues found while building
+        each object file, including objects built without any issues.
+        """
+        linker_failed = False
+
+        def get_matches() -> Iterator[Any]:
+            nonlocal linker_failed
+            current_object = None  # type: Optional[str]
+            for line in lines:
+                if line == "collect2: ld returned 1 exit status":
+                    linker_failed = True
+                if PROGRESS_RE.match(line):
+                    building = BUILDING_RE.match(line)  # type: Optional[Match[str]]
+                    current_object = building.group(1) if building else None
+                    if current_object is not None and objects is not None:
+                        objects.setdefault(current_object, [])
+                    continue
+                match = MAKE_RE.match(line)  # type: Optional[Match[str]]
+                if match and not self.check_for_exceptions(match):
+                    yield match.groups() + (current_object,)
+
         # Load the plugin mapping if possible
         warnings_mapping = self.load_mapping()
-        for line in output.splitlines():
-            match = parse.match(line)  # type: Optional[Match[str]]
-            if match and not self.check_for_exceptions(match):
-                matches.append(match.groups())
-
-        filtered_matches = self.filter_matches(matches, package)
         issues = []  # type: List[Issue]
-        for item in filtered_matches:
+        found = set()  # type: Set[Issue]
+        for item in self.filter_matches(get_matches(), package):
             cert_reference = None
-            warning_list = warning_parse.match(item[4])
+            warning_list = MAKE_WARNING_RE.match(item[4])
             if (
                 warning_list is not None
                 and warning_list.groups("1")[0] in warnings_mapping
@@ -133,11 +253,13 @@ class MakeToolPlugin(ToolPlugin):
                 item[4],
                 cert_reference,
             )
-            if issue not in issues:
+            if objects is not None and len(item) > 5 and item[5] is not None:
+                objects[item[5]].append(issue)
+            if issue not in found:
+                found.add(issue)
                 issues.append(issue)
 
-        lines = output.splitlines()
-        if "collect2: ld returned 1 exit status" in lines:
+        if linker_failed:
             issues.append(
                 Issue(
                     "Linker",
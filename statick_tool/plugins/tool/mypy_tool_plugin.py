@@ -33,9 +33,11 @@ class MypyToolPlugin(ToolPlugin):
         tool_bin = "mypy"
         total_output = []  # type: List[str]
 
-        for src in package["python_src"]:
+        chunks = self.get_file_chunks(package["python_src"])
+        while chunks:
+            chunk = chunks.pop(0)
             try:
-                subproc_args = [tool_bin, src] + flags
+                subproc_args = [tool_bin] + chunk + flags
                 output = subprocess.check_output(
                     subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
                 )
@@ -46,6 +48,12 @@ class MypyToolPlugin(ToolPlugin):
                 return []
 
             except subprocess.CalledProcessError as ex:
+                # Blocking errors, such as a syntax error or duplicate module
+                # names, stop mypy from checking any of the other files it was
+                # given. Check each file on its own so the rest still get results.
+                if ex.returncode == 2 and len(chunk) > 1:
+                    chunks = [[src] for src in chunk] + chunks
+                    continue
                 print("mypy binary failed: {}.".format(tool_bin))
                 print("Returncode: {}".format(str(ex.returncode)))
                 print("Error: {}".format(ex.output))
@@ -23,9 +23,9 @@ class PydocstyleToolPlugin(ToolPlugin):
         total_output = []
 
         tool_bin = "pydocstyle"
-        for src in package["python_src"]:
+        for chunk in self.get_file_chunks(package["python_src"]):
             try:
-                subproc_args = [tool_bin, src] + flags
+                subproc_args = [tool_bin] + chunk + flags
                 output = subprocess.check_output(
                     subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
                 )
@@ -1,7 +1,8 @@
 """Apply pyflakes tool and gather results."""
 import re
 import subprocess
-from typing import List, Match, Optional, Pattern
+from collections import OrderedDict
+from typing import Dict, List, Match, Optional, Pattern
 
 from statick_tool.issue import Issue
 from statick_tool.package import Package
@@ -19,12 +20,13 @@ class PyflakesToolPlugin(ToolPlugin):
         """Run tool and gather output."""
         flags = []  # type: List[str]
         flags += self.get_user_flags(level)
+        cached_scan = self.get_cached_scan(package["python_src"], level, flags)
 
         total_output = []
 
-        for src in package["python_src"]:
+        for chunk in self.get_file_chunks(cached_scan.files_to_scan):
             try:
-                subproc_args = ["pyflakes", src] + flags
+                subproc_args = ["pyflakes"] + chunk + flags
                 output = subprocess.check_output(
                     subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
                 )
@@ -45,16 +47,37 @@ class PyflakesToolPlugin(ToolPlugin):
             if self.plugin_context and self.plugin_context.args.show_tool_output:
                 print("{}".format(output))
 
-            total_output.append(output)
+            total_output += self.split_output_by_file(output, chunk)
 
         if self.plugin_context and self.plugin_context.args.output_directory:
             with open(self.get_name() + ".log", "w") as fname:
                 for output in total_output:
                     fname.write(output)
 
-        issues = self.parse_output(total_output)
+        issues = cached_scan.merge(self.parse_output(total_output))
         return issues
 
+    @classmethod
+    def split_output_by_file(cls, output: str, files: List[str]) -> List[str]:
+        """
+        Split the output of one pyflakes run over several files into per-file output.
+
+        Pyflakes reports syntax errors on stderr and other warnings on stdout, so
+        the lines for one file are not always contiguous. Lines that do not start
+        with a filename, such as the source excerpt after a syntax error, belong
+        to the file reported on the line before them.
+        """
+        parse = re.compile(r"(.+?):\d+")  # type: Pattern[str]
+        file_set = set(files)
+        file_output = OrderedDict()  # type: Dict[Optional[str], List[str]]
+        current = None  # type: Optional[str]
+        for line in output.splitlines():
+            match = parse.match(line)  # type: Optional[Match[str]]
+            if match and match.group(1) in file_set:
+                current = match.group(1)
+            file_output.setdefault(current, []).append(line)
+        return ["\n".join(lines) + "\n" for lines in file_output.values()]
+
     def parse_output(  # pylint: disable=too-many-locals
         self, total_output: List[str]
     ) -> List[Issue]:
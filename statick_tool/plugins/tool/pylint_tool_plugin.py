@@ -17,17 +17,22 @@ class PylintToolPlugin(ToolPlugin):
 
     def scan(self, package: Package, level: str) -> Optional[List[Issue]]:
         """Run tool and gather output."""
+        # Files are checked in batches, so checks across files such as
+        # duplicate-code would report different issues depending on how the
+        # files are split. Users can enable it again in their flags.
         flags = [
             "--msg-template='{abspath}:{line}: [{msg_id}({symbol}), {obj}] {msg}'",
             "--reports=no",
+            "--disable=duplicate-code",
         ]
         flags += self.get_user_flags(level)
+        cached_scan = self.get_cached_scan(package["python_src"], level, flags)
 
         total_output = []  # type: List[str]
 
-        for src in package["python_src"]:
+        for chunk in self.get_file_chunks(cached_scan.files_to_scan):
             try:
-                subproc_args = ["pylint", src] + flags
+                subproc_args = ["pylint"] + chunk + flags
                 output = subprocess.check_output(
                     subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
                 )
@@ -54,7 +59,7 @@ class PylintToolPlugin(ToolPlugin):
                 for output in total_output:
                     fname.write(output)
 
-        issues = self.parse_output(total_output)
+        issues = cached_scan.merge(self.parse_output(total_output))
         return issues
 
     def parse_output(self, total_output: List[str]) -> List[Issue]:
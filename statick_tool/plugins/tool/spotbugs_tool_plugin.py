@@ -1,4 +1,5 @@
 """Apply spotbugs tool and gather results."""
+
 import os
 import subprocess
 import xml.etree.ElementTree as etree
@@ -21,6 +22,10 @@ class SpotbugsToolPlugin(ToolPlugin):
         """Get a list of tools that must run before this one."""
         return ["make"]
 
+    def inputs_changed(self, package: Package) -> bool:
+        """Return whether any Java source or Maven POM files have changed."""
+        return self.any_file_changed(package, ["*.java", "pom.xml"])
+
     def scan(self, package: Package, level: str) -> Optional[List[Issue]]:
         """Run tool and gather output."""
         # Sanity check - make sure mvn exists
@@ -49,45 +49,40 @@ class UncrustifyToolPlugin(ToolPlugin):
         if "headers" in package:
             files += package["headers"]
 
-        total_output = []  # type: List[str]
+        format_file_name = self.plugin_context.resources.get_file("uncrustify.cfg")
+
+        def is_formatted(src: str) -> bool:
+            cmd = [uncrustify_bin, "-c", format_file_name, "-f", src]
+            output = subprocess.check_output(
+                cmd,  # type: ignore
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+            )
+            with open(src, "r") as fname:
+                src_output = fname.read()
+            diff = difflib.context_diff(output.splitlines(), src_output.splitlines())
+            for line in diff:
+                if (
+                    line.startswith("---")
+                    or line.startswith("***")
+                    or line.startswith("! Parsing")
+                    or src in line
+                    or line.isspace()
+                ):
+                    continue
+                # This is a bug I can't figure out yet.
+                if "#ifndef" in line or "#define" in line:
+                    continue
+                return False
+            return True
 
         try:
-            format_file_name = self.plugin_context.resources.get_file("uncrustify.cfg")
-
-            for src in files:
-                cmd = [uncrustify_bin, "-c", format_file_name, "-f", src]
-                output = subprocess.check_output(
-                    cmd,  # type: ignore
-                    stderr=subprocess.STDOUT,
-                    universal_newlines=True,
-                )
-                src_cmd = ["cat", src]
-                src_output = subprocess.check_output(
-                    src_cmd, stderr=subprocess.STDOUT, universal_newlines=True
-                )
-                diff = difflib.context_diff(
-                    output.splitlines(), src_output.splitlines()
-                )
-                found_diff = False
-                output = output.split("\n", 1)[1]
-                for line in diff:
-                    if (
-                        line.startswith("---")
-                        or line.startswith("***")
-                        or line.startswith("! Parsing")
-                        or src in line
-                        or line.isspace()
-                    ):
-                        continue
-                    # This is a bug I can't figure out yet.
-                    if "#ifndef" in line or "#define" in line:
-                        continue
-                    found_diff = True
-                if found_diff:
-                    total_output.append(src)
+            formatted = self.map_files(is_formatted, files)
+            total_output = [
+                src for src, src_formatted in zip(files, formatted) if not src_formatted
+            ]
 
         except subprocess.CalledProcessError as ex:
-            output = ex.output
             print("uncrustify failed! Returncode = {}".format(str(ex.returncode)))
             print("{}".format(ex.output))
             return None
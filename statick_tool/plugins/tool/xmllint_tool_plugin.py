@@ -19,10 +19,11 @@ class XmllintToolPlugin(ToolPlugin):
         """Run tool and gather output."""
         flags = []  # type: List[str]
         flags += self.get_user_flags(level)
+        cached_scan = self.get_cached_scan(package["xml"], level, flags)
 
         total_output = []  # type: List[str]
 
-        for xml_file in package["xml"]:
+        for xml_file in cached_scan.files_to_scan:
             try:
                 subproc_args = ["xmllint", xml_file] + flags
                 output = subprocess.check_output(
@@ -50,7 +51,7 @@ class XmllintToolPlugin(ToolPlugin):
                 for output in total_output:
                     f.write(output)
 
-        issues = self.parse_output(total_output)
+        issues = cached_scan.merge(self.parse_output(total_output))
         return issues
 
     def parse_output(self, total_output: List[str]) -> List[Issue]:
@@ -19,10 +19,11 @@ class YamllintToolPlugin(ToolPlugin):
         """Run tool and gather output."""
         flags = ["-f", "parsable"]
         flags += self.get_user_flags(level)
+        cached_scan = self.get_cached_scan(package["yaml"], level, flags)
 
         total_output = []  # type: List[str]
 
-        for yaml_file in package["yaml"]:
+        for yaml_file in cached_scan.files_to_scan:
             try:
                 subproc_args = ["yamllint", yaml_file] + flags
                 output = subprocess.check_output(
@@ -51,7 +52,7 @@ class YamllintToolPlugin(ToolPlugin):
                 for output in total_output:
                     f.write(output)
 
-        issues = self.parse_output(total_output)
+        issues = cached_scan.merge(self.parse_output(total_output))
         return issues
 
     def parse_output(self, total_output: List[str]) -> List[Issue]:
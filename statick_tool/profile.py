@@ -5,6 +5,7 @@ from typing import Any, Union
 import yaml
 
 from statick_tool.package import Package
+from statick_tool.resources import load_yaml
 
 
 class Profile:  # pylint: disable=too-few-public-methods
@@ -14,17 +15,16 @@ class Profile:  # pylint: disable=too-few-public-methods
         """Initialize profile."""
         if not filename:
             raise ValueError("{} is not a valid file".format(filename))
-        with open(filename) as fname:
-            try:
-                self.profile = yaml.safe_load(fname)
-            except yaml.YAMLError as ex:
-                raise ValueError(
-                    "{} is not a valid YAML file: {}".format(filename, ex)
-                ) from ex
-            if self.profile is None:
-                raise ValueError("{} is empty, can't continue!".format(filename))
-            if "default" not in self.profile:
-                raise ValueError("No 'default' key found in {}!".format(filename))
+        try:
+            self.profile = load_yaml(filename)
+        except yaml.YAMLError as ex:
+            raise ValueError(
+                "{} is not a valid YAML file: {}".format(filename, ex)
+            ) from ex
+        if self.profile is None:
+            raise ValueError("{} is empty, can't continue!".format(filename))
+        if "default" not in self.profile:
+            raise ValueError("No 'default' key found in {}!".format(filename))
 
     def get_package_level(self, package: Package) -> Union[str, Any]:
         """Get which scan level to use for a given package."""
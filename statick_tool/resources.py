@@ -2,9 +2,84 @@
 Manages plugin and file lookup chaining.
 
 Handles chaining user directories and the default statick resource directory.
+YAML and plugin mapping files are parsed once per process and parsed again only
+when they change on disk.
 """
+import copy
 import os
-from typing import List, Optional
+import threading
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+# The libyaml loader is much faster, but PyYAML can be built without it.
+YAML_LOADER = getattr(  # pylint: disable=invalid-name
+    yaml, "CSafeLoader", yaml.SafeLoader
+)  # type: Any
+
+# Files parsed by this process, keyed by kind and absolute path, with the
+# modification time, size, and inode of the file when it was parsed.
+FILE_CACHE = {}  # type: Dict[Tuple[str, str], Tuple[Tuple[int, int, int], Any]]
+FILE_CACHE_LOCK = threading.Lock()
+
+
+def load_cached(filename: str, kind: str, parse: Callable[[IO[str]], Any]) -> Any:
+    """
+    Parse a file, or get the result of parsing it before if it hasn't changed.
+
+    The cached result is shared, so callers must not modify it. Results of
+    parsing files that fail to parse are not cached.
+    """
+    path = os.path.abspath(filename)
+    key = (kind, path)
+    with open(path) as fname:
+        # The version is read from the opened file, so it is the version that
+        # is parsed even if the file is replaced in the meantime.
+        stat = os.fstat(fname.fileno())
+        version = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        with FILE_CACHE_LOCK:
+            cached = FILE_CACHE.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        value = parse(fname)
+    with FILE_CACHE_LOCK:
+        FILE_CACHE[key] = (version, value)
+    return value
+
+
+def clear_cache() -> None:
+    """Forget the files parsed by this process."""
+    with FILE_CACHE_LOCK:
+        FILE_CACHE.clear()
+
+
+def load_yaml(filename: str) -> Any:
+    """
+    Load a YAML file, parsing it only if it changed since it was last loaded.
+
+    Each caller gets its own copy of the data. Raises yaml.YAMLError if the
+    file is not valid YAML.
+    """
+    return copy.deepcopy(
+        load_cached(filename, "yaml", lambda fname: yaml.load(fname, YAML_LOADER))
+    )
+
+
+def parse_mapping(mapping_file: IO[str]) -> Dict[str, str]:
+    """Parse a mapping between warnings and identifiers, one pair per line."""
+    warning_mapping = {}  # type: Dict[str, str]
+    for line in mapping_file.readlines():
+        split_line = line.strip().split(":")
+        if len(split_line) != 2:
+            print("Warning: invalid line {} in file {}".format(line, mapping_file.name))
+            continue
+        warning_mapping[split_line[0]] = split_line[1]
+    return warning_mapping
+
+
+def load_mapping(filename: str) -> Dict[str, str]:
+    """Load a mapping between warnings and identifiers, parsing it only if it changed."""
+    return dict(load_cached(filename, "mapping", parse_mapping))
 
 
 class Resources:
@@ -0,0 +1,300 @@
+"""
+Persistent cache of tool results.
+
+Tools that check each file on its own, such as pylint or yamllint, give the
+same issues for a file as long as the file, the tool, and the way the tool is
+run stay the same. The cache stores the issues found in each file under a key
+made from the tool name and version, the resolved flags, the level, and a hash
+of the file contents, so that unchanged files don't have to be scanned again.
+
+Entries are stored as small JSON files. The least recently used entries are
+removed when the cache grows larger than its maximum size. The size of the cache
+is recorded in a file next to the entries and increased by the size of the
+entries each scan writes, so the cache is only walked to remove entries when
+that estimate goes over the maximum size.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional, Sequence, Set
+
+import statick_tool
+from statick_tool.issue import Issue
+
+DEFAULT_MAX_SIZE = 64  # MiB
+
+# File in the cache directory holding the estimated size of the cache in bytes.
+SIZE_FILE = "size"
+# Bytes written to each cache directory by this process since its size was
+# last recorded.
+WRITTEN_SIZES = {}  # type: Dict[str, int]
+# Cache directories this process failed to write to.
+UNWRITABLE_DIRECTORIES = set()  # type: Set[str]
+
+
+def get_default_directory() -> str:
+    """Get the default directory for the result cache."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "statick")
+
+
+def hash_file(path: str) -> Optional[str]:
+    """Get a hash of the contents of the file at path, or None if it can't be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as fname:
+            for block in iter(lambda: fname.read(1 << 16), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Persistent cache of the issues found in individual files."""
+
+    def __init__(self, directory: str, max_size: float = DEFAULT_MAX_SIZE) -> None:
+        """Initialize result cache in directory, limited to max_size MiB."""
+        self.directory = directory
+        self.max_size = int(max_size * 1024 * 1024)
+
+    def get_path(self, key: str) -> str:
+        """Get the path of the entry for key."""
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key: str) -> Optional[List[Issue]]:
+        """Get cached issues for key, or None if there is no valid entry."""
+        path = self.get_path(key)
+        try:
+            with open(path, "r") as fname:
+                entries = json.load(fname)
+            issues = [Issue(*entry) for entry in entries]
+            # Mark the entry as recently used.
+            os.utime(path)
+        except (OSError, ValueError, TypeError):
+            return None
+        return issues
+
+    def put(self, key: str, issues: List[Issue]) -> None:
+        """
+        Store issues for key.
+
+        If the cache can't be written to, such as when the home directory is
+        read-only, that is reported once and the cache is only read from.
+        """
+        if self.directory in UNWRITABLE_DIRECTORIES:
+            return
+        path = self.get_path(key)
+        data = json.dumps([list(issue) for issue in issues])
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.write_file(path, data)
+        except OSError as ex:
+            UNWRITABLE_DIRECTORIES.add(self.directory)
+            print("Unable to write to result cache at {}: {}".format(path, ex))
+            return
+        WRITTEN_SIZES[self.directory] = WRITTEN_SIZES.get(self.directory, 0) + len(data)
+
+    @staticmethod
+    def write_file(path: str, data: str) -> None:
+        """
+        Write a file in the cache.
+
+        Data is written to a temporary file first so that other processes
+        sharing the cache never read a partial file.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w") as fname:
+            fname.write(data)
+        os.replace(tmp_path, path)
+
+    def read_size(self) -> Optional[int]:
+        """Get the recorded size of the cache, or None if it isn't known."""
+        try:
+            with open(os.path.join(self.directory, SIZE_FILE), "r") as fname:
+                return int(fname.read())
+        except (OSError, ValueError):
+            return None
+
+    def write_size(self, size: int) -> None:
+        """Record the size of the cache."""
+        try:
+            self.write_file(os.path.join(self.directory, SIZE_FILE), str(size))
+        except OSError as ex:
+            print(
+                "Unable to write to result cache at {}: {}".format(self.directory, ex)
+            )
+
+    def prune_if_full(self) -> None:
+        """
+        Record the size of the entries this process wrote, and prune if needed.
+
+        The cache is only walked when it has no recorded size or the recorded
+        size goes over the maximum size. Scans that didn't write any entries
+        leave the cache alone.
+        """
+        written = WRITTEN_SIZES.pop(self.directory, 0)
+        if not written:
+            return
+        size = self.read_size()
+        if size is None or size + written > self.max_size:
+            self.prune()
+        else:
+            self.write_size(size + written)
+
+    def prune(self) -> None:
+        """
+        Remove least recently used entries until the cache fits in its size.
+
+        The size of the entries that are left is recorded.
+        """
+        entries = []
+        total_size = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if root == self.directory and name == SIZE_FILE:
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+        if total_size > self.max_size:
+            entries.sort()
+            for _, size, path in entries:
+                try:
+                    os.remove(path)
+                except OSError:
+                    # Another process sharing the cache may have removed it already.
+                    pass
+                total_size -= size
+                if total_size <= self.max_size:
+                    break
+        self.write_size(total_size)
+
+    @staticmethod
+    def get_key(
+        tool: str,
+        version: str,
+        flags: Sequence[str],
+        level: str,
+        path: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Get the key for results of running a tool on the file at path.
+
+        Without a path, the key is for issues that aren't about any one file,
+        such as warnings about the flags. Flags that name existing files, such as
+        configuration files, contribute the contents of those files as well.
+        Returns None if the file can't be read.
+        """
+        file_hash = ""  # type: Optional[str]
+        if path is not None:
+            file_hash = hash_file(path)
+            if file_hash is None:
+                return None
+            path = os.path.abspath(path)
+        flag_file_hashes = []
+        for flag in flags:
+            flag_path = flag.split("=", 1)[-1]
+            if os.path.isfile(flag_path):
+                flag_file_hashes.append(hash_file(flag_path))
+        key = [
+            statick_tool.__version__,
+            tool,
+            version,
+            list(flags),
+            flag_file_hashes,
+            level,
+            path,
+            file_hash,
+        ]
+        return hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+
+
+class CachedScan:
+    """
+    Scan of a list of files that reuses cached results.
+
+    Files with cached results are left out of files_to_scan. After the tool has
+    scanned the rest, merge stores the new issues and combines them with the
+    cached ones.
+    """
+
+    def __init__(
+        self,
+        files: List[str],
+        cache: Optional[ResultCache] = None,
+        keys: Optional[Dict[str, str]] = None,
+        run_key: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize cached scan of files.
+
+        The keys map files to their cache keys, and run_key is the key for issues
+        that aren't about any one file.
+        """
+        self.files = files
+        self.cache = cache
+        self.keys = keys if keys is not None else {}
+        self.run_key = run_key
+        self.cached_issues = {}  # type: Dict[str, List[Issue]]
+        self.cached_run_issues = []  # type: List[Issue]
+        if cache is not None:
+            for path, key in self.keys.items():
+                issues = cache.get(key)
+                if issues is not None:
+                    self.cached_issues[path] = issues
+            if run_key is not None:
+                self.cached_run_issues = cache.get(run_key) or []
+        self.files_to_scan = [
+            path for path in files if path not in self.cached_issues
+        ]  # type: List[str]
+
+    def merge(self, issues: List[Issue]) -> List[Issue]:
+        """
+        Store issues found by scanning files_to_scan and add the cached issues.
+
+        Issues are returned in the order of the files they were found in,
+        followed by issues that aren't about any of the files. Those are only
+        taken from the cache if no files had to be scanned.
+        """
+        if self.cache is None:
+            return issues
+
+        scanned = {
+            os.path.abspath(path): path for path in self.files_to_scan
+        }  # type: Dict[str, str]
+        new_issues = {
+            path: [] for path in self.files_to_scan
+        }  # type: Dict[str, List[Issue]]
+        run_issues = []  # type: List[Issue]
+        for issue in issues:
+            path = scanned.get(os.path.abspath(issue.filename))
+            if path is None:
+                run_issues.append(issue)
+            else:
+                new_issues[path].append(issue)
+
+        for path, file_issues in new_issues.items():
+            key = self.keys.get(path)
+            if key is not None:
+                self.cache.put(key, file_issues)
+        if not self.files_to_scan:
+            run_issues = self.cached_run_issues
+        elif self.run_key is not None:
+            self.cache.put(self.run_key, run_issues)
+
+        merged = []  # type: List[Issue]
+        for path in self.files:
+            if path in self.cached_issues:
+                merged += self.cached_issues[path]
+            elif path in new_issues:
+                merged += new_issues.pop(path)
+        return merged + run_issues
@@ -1,22 +1,32 @@
 """Code analysis front-end."""
 import argparse
 import copy
+import cProfile
 import logging
 import os
-from typing import Any, Dict, List, Optional, Tuple
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-from yapsy.PluginManager import PluginManager
-
-from statick_tool import __version__
+from statick_tool import __version__, git_changes
 from statick_tool.config import Config
 from statick_tool.discovery_plugin import DiscoveryPlugin
 from statick_tool.exceptions import Exceptions
 from statick_tool.issue import Issue
+from statick_tool.issue_store import IssueStore
+from statick_tool.job_server import get_job_server, start_job_server
 from statick_tool.package import Package
 from statick_tool.plugin_context import PluginContext
+from statick_tool.plugin_registry import LazyPlugins, find_plugins
 from statick_tool.profile import Profile
 from statick_tool.reporting_plugin import ReportingPlugin
 from statick_tool.resources import Resources
+from statick_tool.result_cache import (
+    DEFAULT_MAX_SIZE,
+    ResultCache,
+    get_default_directory,
+)
+from statick_tool.timings import Timings
 from statick_tool.tool_plugin import ToolPlugin
 
 logging.basicConfig()
@@ -29,37 +39,23 @@ class Statick:
         """Initialize Statick."""
         self.resources = Resources(user_paths)
 
-        self.manager = PluginManager()
-        self.manager.setPluginPlaces(self.resources.get_plugin_paths())
-        self.manager.setCategoriesFilter(
+        # Plugins are listed from their plugin info files, and only imported
+        # when they are used.
+        plugins = find_plugins(
+            self.resources.get_plugin_paths(),
             {
                 "Discovery": DiscoveryPlugin,
                 "Tool": ToolPlugin,
                 "Reporting": ReportingPlugin,
-            }
+            },
         )
-        self.manager.collectPlugins()
-
-        self.discovery_plugins = {}  # type: Dict[str, Any]
-        for plugin_info in self.manager.getPluginsOfCategory("Discovery"):
-            self.discovery_plugins[
-                plugin_info.plugin_object.get_name()
-            ] = plugin_info.plugin_object
-
-        self.tool_plugins = {}  # type: Dict[str, Any]
-        for plugin_info in self.manager.getPluginsOfCategory("Tool"):
-            self.tool_plugins[
-                plugin_info.plugin_object.get_name()
-            ] = plugin_info.plugin_object
-
-        self.reporting_plugins = {}  # type: Dict[str, Any]
-        for plugin_info in self.manager.getPluginsOfCategory("Reporting"):
-            self.reporting_plugins[
-                plugin_info.plugin_object.get_name()
-            ] = plugin_info.plugin_object
+        self.discovery_plugins = plugins["Discovery"]  # type: Mapping[str, Any]
+        self.tool_plugins = plugins["Tool"]  # type: Mapping[str, Any]
+        self.reporting_plugins = plugins["Reporting"]  # type: Mapping[str, Any]
 
         self.config = None  # type: Optional[Config]
         self.exceptions = None  # type: Optional[Exceptions]
+        self.timings = Timings()
 
     def get_config(self, args: argparse.Namespace) -> None:
         """Get Statick configuration."""
@@ -145,15 +141,79 @@ class Statick:
             type=str,
             help="Suffix to use when searching for CERT mapping files",
         )
+        args.add_argument(
+            "--max-procs",
+            dest="max_procs",
+            type=int,
+            default=1,
+            help="Maximum number of tool plugins to run at the same time",
+        )
+        args.add_argument(
+            "--jobs",
+            dest="jobs",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of jobs that tools can run at the same time, shared by "
+            "all tool plugins and packages (default: the number of CPUs)",
+        )
+        args.add_argument(
+            "--no-cache",
+            dest="no_cache",
+            action="store_true",
+            help="Don't reuse cached tool results for unchanged files",
+        )
+        args.add_argument(
+            "--cache-directory",
+            dest="cache_directory",
+            type=str,
+            default=get_default_directory(),
+            help="Directory to store cached tool results in",
+        )
+        args.add_argument(
+            "--cache-max-size",
+            dest="cache_max_size",
+            type=float,
+            default=DEFAULT_MAX_SIZE,
+            help="Maximum size of the result cache in MiB",
+        )
+        args.add_argument(
+            "--changed-since",
+            dest="changed_since",
+            type=str,
+            help="Only scan files changed in git since the given reference",
+        )
+        args.add_argument(
+            "--changed-lines-only",
+            dest="changed_lines_only",
+            action="store_true",
+            help="Only report issues on lines changed since --changed-since",
+        )
+        args.add_argument(
+            "--timings-output",
+            dest="timings_output",
+            type=str,
+            help="Append the time taken by each plugin and package to a file, "
+            "as one JSON object per line",
+        )
+        args.add_argument(
+            "--cprofile-directory",
+            dest="cprofile_directory",
+            type=str,
+            help="Write a cProfile dump of the scan of each package to this directory",
+        )
 
-        for _, plugin in list(self.discovery_plugins.items()):
-            plugin.gather_args(args)
-
-        for _, plugin in list(self.tool_plugins.items()):
-            plugin.gather_args(args)
-
-        for _, plugin in list(self.reporting_plugins.items()):
-            plugin.gather_args(args)
+        for plugins in [
+            self.discovery_plugins,
+            self.tool_plugins,
+            self.reporting_plugins,
+        ]:
+            names = list(plugins)
+            if isinstance(plugins, LazyPlugins):
+                # Only plugins that add arguments need to be imported here.
+                names = plugins.get_argument_plugins()
+            for name in names:
+                if name in plugins:
+                    plugins[name].gather_args(args)
 
     def get_level(self, path: str, args: argparse.Namespace) -> Optional[str]:
         """Get level to scan package at."""
@@ -182,10 +242,253 @@ class Statick:
 
         return level
 
-    def run(  # pylint: disable=too-many-locals, too-many-return-statements, too-many-branches, too-many-statements
+    def get_tool_plugins_to_run(
+        self, level: str, args: argparse.Namespace
+    ) -> Optional[List[str]]:
+        """
+        Get the tool plugins to run at a level, ordered so dependencies run first.
+
+        Returns None if a plugin can't be found, depends on a plugin that isn't
+        enabled, or is part of a dependency cycle.
+        """
+        assert self.config is not None
+        enabled_plugins = self.config.get_enabled_tool_plugins(level)
+        force_tool_list = None  # type: Optional[List[str]]
+        if args.force_tool_list is not None:
+            force_tool_list = args.force_tool_list.split(",")
+
+        plugins_to_run = copy.copy(enabled_plugins)
+        plugins_ordered = []  # type: List[str]
+        plugins_waiting = []  # type: List[str]
+        plugin_dependencies = []  # type: List[str]
+        while plugins_to_run:
+            plugin_name = plugins_to_run[0]
+
+            if plugin_name not in self.tool_plugins:
+                print("Can't find specified tool plugin {}!".format(plugin_name))
+                return None
+
+            if (
+                force_tool_list is not None
+                and plugin_name not in force_tool_list
+                and plugin_name not in plugin_dependencies
+            ):
+                print("Skipping plugin not in force list {}!".format(plugin_name))
+                plugins_to_run.remove(plugin_name)
+                continue
+
+            dependencies = self.tool_plugins[plugin_name].get_tool_dependencies()
+            dependencies_met = True
+            for dependency_name in dependencies:
+                if dependency_name not in plugins_ordered:
+                    if dependency_name not in enabled_plugins:
+                        print(
+                            "Plugin {} depends on plugin {} which isn't "
+                            "enabled!".format(plugin_name, dependency_name)
+                        )
+                        return None
+                    if dependency_name in plugins_waiting:
+                        print(
+                            "Plugin {} is part of a dependency cycle with plugin "
+                            "{}!".format(plugin_name, dependency_name)
+                        )
+                        return None
+                    plugin_dependencies.append(dependency_name)
+                    if dependency_name in plugins_to_run:
+                        plugins_to_run.remove(dependency_name)
+                    plugins_to_run.insert(0, dependency_name)
+                    dependencies_met = False
+
+            if not dependencies_met:
+                if plugin_name not in plugins_waiting:
+                    plugins_waiting.append(plugin_name)
+                continue
+
+            if plugin_name in plugins_waiting:
+                plugins_waiting.remove(plugin_name)
+            plugins_to_run.remove(plugin_name)
+            plugins_ordered.append(plugin_name)
+
+        return plugins_ordered
+
+    def run_discovery_plugins(
+        self, package: Package, level: str, plugin_context: PluginContext
+    ) -> bool:
+        """
+        Run the discovery plugins of a level against a package.
+
+        Plugins run after the plugins they depend on. Returns False if a plugin
+        can't be found.
+        """
+        assert self.config is not None
+        discovery_plugins = self.config.get_enabled_discovery_plugins(level)
+        if not discovery_plugins:
+            discovery_plugins = list(self.discovery_plugins.keys())
+        plugins_ran = []  # type: List[Any]
+        for plugin_name in discovery_plugins:
+            if plugin_name not in self.discovery_plugins:
+                print("Can't find specified discovery plugin {}!".format(plugin_name))
+                return False
+
+            plugin = self.discovery_plugins[plugin_name]
+            dependencies = plugin.get_discovery_dependencies()
+            for dependency_name in dependencies:
+                dependency_plugin = self.discovery_plugins[dependency_name]
+                if dependency_plugin.get_name() in plugins_ran:
+                    continue
+                dependency_plugin.set_plugin_context(plugin_context)
+                print(
+                    "Running {} discovery plugin...".format(
+                        dependency_plugin.get_name()
+                    )
+                )
+                with self.timings.measure("discovery", dependency_plugin.get_name()):
+                    dependency_plugin.scan(package, level, self.exceptions)
+                print("{} discovery plugin done.".format(dependency_plugin.get_name()))
+                plugins_ran.append(dependency_plugin.get_name())
+
+            if plugin.get_name() not in plugins_ran:
+                plugin.set_plugin_context(plugin_context)
+                print("Running {} discovery plugin...".format(plugin.get_name()))
+                with self.timings.measure("discovery", plugin.get_name()):
+                    plugin.scan(package, level, self.exceptions)
+                print("{} discovery plugin done.".format(plugin.get_name()))
+                plugins_ran.append(plugin.get_name())
+        return True
+
+    @classmethod
+    def run_tool_plugin(
+        cls, plugin: ToolPlugin, package: Package, level: str
+    ) -> Optional[List[Issue]]:
+        """Run a single tool plugin against a package."""
+        if not plugin.inputs_changed(package):
+            print(
+                "Skipping {} tool plugin, none of its files changed.".format(
+                    plugin.get_name()
+                )
+            )
+            return []
+        job_server = get_job_server()
+        if job_server is None:
+            print("Running {} tool plugin...".format(plugin.get_name()))
+            tool_issues = plugin.scan(package, level)
+        else:
+            with job_server.job():
+                print("Running {} tool plugin...".format(plugin.get_name()))
+                tool_issues = plugin.scan(package, level)
+        if tool_issues is not None:
+            print("{} tool plugin done.".format(plugin.get_name()))
+        else:
+            print("{} tool plugin failed".format(plugin.get_name()))
+        return tool_issues
+
+    def run_measured_tool_plugin(
+        self, plugin: ToolPlugin, package: Package, level: str
+    ) -> Optional[List[Issue]]:
+        """Run a single tool plugin against a package, measuring it in timings."""
+        with self.timings.measure("tool", plugin.get_name()):
+            return self.run_tool_plugin(plugin, package, level)
+
+    def run_tool_plugins(
+        self, package: Package, level: str, plugins_to_run: List[str], max_procs: int
+    ) -> Dict[str, Optional[List[Issue]]]:
+        """
+        Run tool plugins, starting each one once all of its dependencies are done.
+
+        Plugins are expected in an order where dependencies come first. Up to
+        max_procs plugins run at the same time; with a single process they run
+        one after another in the given order.
+        """
+        results = {}  # type: Dict[str, Optional[List[Issue]]]
+        if max_procs <= 1:
+            for plugin_name in plugins_to_run:
+                results[plugin_name] = self.run_measured_tool_plugin(
+                    self.tool_plugins[plugin_name], package, level
+                )
+            return results
+
+        pending = list(plugins_to_run)
+        running = {}  # type: Dict[Future[Optional[List[Issue]]], str]
+        with ThreadPoolExecutor(max_workers=max_procs) as executor:
+            while pending or running:
+                for plugin_name in list(pending):
+                    if len(running) >= max_procs:
+                        break
+                    plugin = self.tool_plugins[plugin_name]
+                    if all(
+                        dependency_name in results
+                        for dependency_name in plugin.get_tool_dependencies()
+                    ):
+                        pending.remove(plugin_name)
+                        future = executor.submit(
+                            self.run_measured_tool_plugin, plugin, package, level
+                        )
+                        running[future] = plugin_name
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    results[running.pop(future)] = future.result()
+        return results
+
+    def run_isolated(
+        self, path: str, args: argparse.Namespace
+    ) -> Tuple[Optional[Dict[str, List[Issue]]], bool]:
+        """
+        Run scan tools against targets on path from a private working directory.
+
+        Scanning changes the working directory and some plugins write files into
+        it, so packages scanned at the same time each need a directory of their own.
+        """
+        orig_path = os.getcwd()
+        with tempfile.TemporaryDirectory(prefix="statick-") as work_dir:
+            os.chdir(work_dir)
+            try:
+                return self.run(path, args)
+            finally:
+                os.chdir(orig_path)
+
+    def run(
+        self, path: str, args: argparse.Namespace
+    ) -> Tuple[Optional[Dict[str, List[Issue]]], bool]:
+        """
+        Run scan tools against targets on path.
+
+        The scan is measured in timings, which are appended to --timings-output
+        if given. With --cprofile-directory, the scan is profiled and the profile
+        is written to <package>.prof in that directory.
+        """
+        package_name = os.path.basename(os.path.abspath(path))
+        # Scanning changes the working directory, so resolve the paths first,
+        # and change it back however the scan ends.
+        orig_path = os.getcwd()
+        timings_output = None  # type: Optional[str]
+        if args.timings_output:
+            timings_output = os.path.abspath(args.timings_output)
+        profile_output = None  # type: Optional[str]
+        profiler = None  # type: Optional[cProfile.Profile]
+        if args.cprofile_directory:
+            profile_output = os.path.join(
+                os.path.abspath(args.cprofile_directory), package_name + ".prof"
+            )
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        self.timings.package = package_name
+        first_timing = len(self.timings)
+        try:
+            with self.timings.measure("package", package_name):
+                return self.scan_package(path, args)
+        finally:
+            os.chdir(orig_path)
+            if profiler is not None and profile_output is not None:
+                profiler.disable()
+                profiler.dump_stats(profile_output)
+            if timings_output is not None:
+                self.timings.write(timings_output, first_timing)
+
+    def scan_package(  # pylint: disable=too-many-locals, too-many-return-statements, too-many-branches, too-many-statements
         self, path: str, args: argparse.Namespace
     ) -> Tuple[Optional[Dict[str, List[Issue]]], bool]:
-        """Run scan tools against targets on path."""
+        """Scan the package at path, without measuring the scan."""
         success = True
 
         path = os.path.abspath(path)
@@ -193,6 +496,9 @@ class Statick:
             print("No package found at {}!".format(path))
             return None, False
 
+        if args.jobs:
+            start_job_server(args.jobs)
+
         package = Package(os.path.basename(path), path)
         level = self.get_level(path, args)  # type: Optional[str]
         print("level: {}".format(level))
@@ -247,106 +553,64 @@ class Statick:
         plugin_context = PluginContext(args, self.resources, self.config)
 
         print("---Discovery---")
-        if not DiscoveryPlugin.file_command_exists():
-            print(
-                "file command isn't available, discovery plugins will be less effective"
-            )
 
-        discovery_plugins = self.config.get_enabled_discovery_plugins(level)
-        if not discovery_plugins:
-            discovery_plugins = list(self.discovery_plugins.keys())
-        plugins_ran = []  # type: List[Any]
-        for plugin_name in discovery_plugins:
-            if plugin_name not in self.discovery_plugins:
-                print("Can't find specified discovery plugin {}!".format(plugin_name))
-                return None, False
+        if not self.run_discovery_plugins(package, level, plugin_context):
+            return None, False
+        print("---Discovery---")
 
-            plugin = self.discovery_plugins[plugin_name]
-            dependencies = plugin.get_discovery_dependencies()
-            for dependency_name in dependencies:
-                dependency_plugin = self.discovery_plugins[dependency_name]
-                if dependency_plugin.get_name() in plugins_ran:
-                    continue
-                dependency_plugin.set_plugin_context(plugin_context)
+        if args.changed_since:
+            changed_files = git_changes.get_changed_files(
+                package.path, args.changed_since
+            )
+            if changed_files is None:
                 print(
-                    "Running {} discovery plugin...".format(
-                        dependency_plugin.get_name()
-                    )
+                    "Unable to find files changed since {}".format(args.changed_since)
                 )
-                dependency_plugin.scan(package, level, self.exceptions)
-                print("{} discovery plugin done.".format(dependency_plugin.get_name()))
-                plugins_ran.append(dependency_plugin.get_name())
-
-            if plugin.get_name() not in plugins_ran:
-                plugin.set_plugin_context(plugin_context)
-                print("Running {} discovery plugin...".format(plugin.get_name()))
-                plugin.scan(package, level, self.exceptions)
-                print("{} discovery plugin done.".format(plugin.get_name()))
-                plugins_ran.append(plugin.get_name())
-        print("---Discovery---")
-
-        print("---Tools---")
-        enabled_plugins = self.config.get_enabled_tool_plugins(level)
-        plugins_to_run = copy.copy(enabled_plugins)
-        plugins_ran = []
-        plugin_dependencies = []  # type: List[str]
-        while plugins_to_run:
-            plugin_name = plugins_to_run[0]
-
-            if plugin_name not in self.tool_plugins:
-                print("Can't find specified tool plugin {}!".format(plugin_name))
                 return None, False
+            git_changes.filter_package(package, changed_files)
 
-            if args.force_tool_list is not None:
-                force_tool_list = args.force_tool_list.split(",")
-                if (
-                    plugin_name not in force_tool_list
-                    and plugin_name not in plugin_dependencies
-                ):
-                    print("Skipping plugin not in force list {}!".format(plugin_name))
-                    plugins_to_run.remove(plugin_name)
-                    continue
-
-            plugin = self.tool_plugins[plugin_name]
-            plugin.set_plugin_context(plugin_context)
-
-            dependencies = plugin.get_tool_dependencies()
-            dependencies_met = True
-            for dependency_name in dependencies:
-                if dependency_name not in plugins_ran:
-                    if dependency_name not in enabled_plugins:
-                        print(
-                            "Plugin {} depends on plugin {} which isn't "
-                            "enabled!".format(plugin_name, dependency_name)
-                        )
-                        return None, False
-                    plugin_dependencies.append(dependency_name)
-                    if dependency_name in plugins_to_run:
-                        plugins_to_run.remove(dependency_name)
-                    plugins_to_run.insert(0, dependency_name)
-                    dependencies_met = False
-
-            if not dependencies_met:
-                continue
+        print("---Tools---")
+        plugins_to_run = self.get_tool_plugins_to_run(level, args)
+        if plugins_to_run is None:
+            return None, False
+        for plugin_name in plugins_to_run:
+            self.tool_plugins[plugin_name].set_plugin_context(plugin_context)
 
-            print("Running {} tool plugin...".format(plugin.get_name()))
-            tool_issues = plugin.scan(package, level)
+        tool_results = self.run_tool_plugins(
+            package, level, plugins_to_run, args.max_procs
+        )
+        # Duplicate issues from a tool are only kept once.
+        store = IssueStore()
+        for plugin_name in plugins_to_run:
+            tool_issues = tool_results[plugin_name]
             if tool_issues is not None:
-                issues[plugin_name] = tool_issues
-                print("{} tool plugin done.".format(plugin.get_name()))
+                store.extend(plugin_name, tool_issues)
             else:
-                print("{} tool plugin failed".format(plugin.get_name()))
                 success = False
-
-            plugins_to_run.remove(plugin_name)
-            plugins_ran.append(plugin_name)
+        issues = store.as_dict()
+        if not args.no_cache:
+            ResultCache(args.cache_directory, args.cache_max_size).prune_if_full()
         print("---Tools---")
 
         if self.exceptions is not None:
-            issues = self.exceptions.filter_issues(package, issues)
+            with self.timings.measure("filter", "exceptions"):
+                issues = self.exceptions.filter_issues(package, issues)
 
+        # Tools report relative paths from the directory they ran in.
+        tool_dir = os.getcwd()
         os.chdir(orig_path)
 
+        if args.changed_since and args.changed_lines_only:
+            changed_lines = git_changes.get_changed_lines(
+                package.path, args.changed_since
+            )
+            if changed_lines is None:
+                print(
+                    "Unable to find lines changed since {}".format(args.changed_since)
+                )
+                return None, False
+            issues = git_changes.filter_issues(package, issues, changed_lines, tool_dir)
+
         print("---Reporting---")
         reporting_plugins = self.config.get_enabled_reporting_plugins(level)
         if not reporting_plugins:
@@ -359,9 +623,34 @@ class Statick:
             plugin = self.reporting_plugins[plugin_name]
             plugin.set_plugin_context(plugin_context)
             print("Running {} reporting plugin...".format(plugin.get_name()))
-            plugin.report(package, issues, level)
+            with self.timings.measure("reporting", plugin.get_name()):
+                plugin.report(package, issues, level)
             print("{} reporting plugin done.".format(plugin.get_name()))
         print("---Reporting---")
         print("Done!")
 
         return issues, success
+
+
+# Statick instance used by a worker process when scanning packages in parallel.
+WORKER_STATICK = None  # type: Optional[Statick]
+
+
+def init_package_worker(user_paths: List[str], args: argparse.Namespace) -> None:
+    """
+    Set up a worker process for scanning packages in parallel.
+
+    Plugins can't be pickled, so each worker loads its own.
+    """
+    global WORKER_STATICK  # pylint: disable=global-statement
+    WORKER_STATICK = Statick(user_paths)
+    WORKER_STATICK.get_config(args)
+    WORKER_STATICK.get_exceptions(args)
+
+
+def scan_package_worker(
+    path: str, args: argparse.Namespace
+) -> Tuple[Optional[Dict[str, List[Issue]]], bool]:
+    """Scan a package in a worker process set up by init_package_worker."""
+    assert WORKER_STATICK is not None
+    return WORKER_STATICK.run_isolated(path, args)
@@ -0,0 +1,188 @@
+"""
+Measure where the time of a scan goes.
+
+Every discovery, tool and reporting plugin run by a scan, the exception filter,
+and the scan of each package as a whole are measured. Each measurement records
+the wall time, the CPU time used by Statick and the tool processes it waited
+for, the peak resident set size of Statick and of its largest tool process so
+far, and the number of processes started.
+
+CPU time and process counts are totals for the whole process, so when tool
+plugins run at the same time (--max-procs) each plugin's measurement includes
+the work of the plugins that overlapped with it.
+"""
+import contextlib
+import json
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore  # pylint: disable=invalid-name
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore  # pylint: disable=invalid-name
+
+Timing = NamedTuple(
+    "Timing",
+    [
+        ("package", str),
+        ("phase", str),
+        ("name", str),
+        ("wall_time", float),
+        ("cpu_time", float),
+        ("max_rss", Optional[int]),
+        ("children_max_rss", Optional[int]),
+        ("subprocesses", Optional[int]),
+    ],
+)
+
+# Number of processes started by this process, counted once count_subprocesses
+# has installed its audit hook.
+SUBPROCESS_COUNT = [0]
+SUBPROCESS_COUNT_LOCK = threading.Lock()
+SUBPROCESS_HOOK_INSTALLED = [False]
+
+
+def subprocess_audit_hook(event: str, _args: Any) -> None:
+    """Count processes started with subprocess."""
+    if event == "subprocess.Popen":
+        with SUBPROCESS_COUNT_LOCK:
+            SUBPROCESS_COUNT[0] += 1
+
+
+def count_subprocesses() -> bool:
+    """
+    Start counting processes started with subprocess.
+
+    Audit hooks can't be removed, so the hook is installed once per process.
+    Returns False if processes can't be counted, before Python 3.8.
+    """
+    add_audit_hook = getattr(sys, "addaudithook", None)
+    if add_audit_hook is None:
+        return False
+    if not SUBPROCESS_HOOK_INSTALLED[0]:
+        add_audit_hook(subprocess_audit_hook)
+        SUBPROCESS_HOOK_INSTALLED[0] = True
+    return True
+
+
+def get_usage() -> Dict[str, Any]:
+    """Get the CPU time and peak memory use of this process and its children."""
+    if resource is None:
+        return {
+            "cpu_time": time.process_time(),
+            "max_rss": None,
+            "children_max_rss": None,
+        }
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere.
+    scale = 1024 if sys.platform == "darwin" else 1
+    cpu_time = usage.ru_utime + usage.ru_stime + children.ru_utime + children.ru_stime
+    return {
+        "cpu_time": cpu_time,
+        "max_rss": usage.ru_maxrss // scale,
+        "children_max_rss": children.ru_maxrss // scale,
+    }
+
+
+class Timings:
+    """Measurements of the phases of scans."""
+
+    def __init__(self) -> None:
+        """Initialize timings, counting processes started from now on if possible."""
+        self.timings = []  # type: List[Timing]
+        # Name of the package being scanned, recorded with each measurement.
+        self.package = ""
+        self.lock = threading.Lock()
+        self.count_subprocesses = count_subprocesses()
+
+    def __len__(self) -> int:
+        """Get the number of measurements."""
+        return len(self.timings)
+
+    @contextlib.contextmanager
+    def measure(self, phase: str, name: str) -> Iterator[None]:
+        """Measure the work done inside the context for the current package."""
+        package = self.package
+        start_usage = get_usage()
+        start_subprocesses = SUBPROCESS_COUNT[0]
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start_time
+            end_usage = get_usage()
+            subprocesses = None  # type: Optional[int]
+            if self.count_subprocesses:
+                subprocesses = SUBPROCESS_COUNT[0] - start_subprocesses
+            self.add(
+                Timing(
+                    package,
+                    phase,
+                    name,
+                    wall_time,
+                    end_usage["cpu_time"] - start_usage["cpu_time"],
+                    end_usage["max_rss"],
+                    end_usage["children_max_rss"],
+                    subprocesses,
+                )
+            )
+
+    def add(self, timing: Timing) -> None:
+        """Add a measurement."""
+        with self.lock:
+            self.timings.append(timing)
+
+    def get_timings(
+        self, package: Optional[str] = None, phase: Optional[str] = None
+    ) -> List[Timing]:
+        """Get the measurements, only for a package or phase if given."""
+        with self.lock:
+            return [
+                timing
+                for timing in self.timings
+                if (package is None or timing.package == package)
+                and (phase is None or timing.phase == phase)
+            ]
+
+    def get_slowest(self, count: int, phase: Optional[str] = None) -> List[Timing]:
+        """Get the count measurements with the longest wall time."""
+        return sorted(
+            self.get_timings(phase=phase),
+            key=lambda timing: timing.wall_time,
+            reverse=True,
+        )[:count]
+
+    def write(self, path: str, first: int = 0) -> None:
+        """
+        Append measurements to a file as JSON, one measurement per line.
+
+        Only the measurements from index first on are written. The file is
+        locked while writing, so packages scanned at the same time by different
+        processes can share it.
+        """
+        encode = json.JSONEncoder().encode
+        with self.lock:
+            timings = self.timings[first:]
+        lines = [encode(dict(zip(Timing._fields, timing))) for timing in timings]
+        with open(path, "a") as out:
+            if fcntl is not None:
+                fcntl.lockf(out, fcntl.LOCK_EX)
+            out.write("".join(line + "\n" for line in lines))
+
+
+def read_timings(path: str) -> List[Timing]:
+    """Read measurements written by Timings.write."""
+    timings = []  # type: List[Timing]
+    with open(path, "r") as fname:
+        for line in fname:
+            if line.strip():
+                record = json.loads(line)
+                timings.append(Timing(*[record.get(field) for field in Timing._fields]))
+    return timings
@@ -1,14 +1,31 @@
 """Tool plugin."""
 import argparse
+import fnmatch
 import os
 import shlex
-from typing import Any, Dict, List, Optional, Union
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TextIO, TypeVar, Union
 
 from yapsy.IPlugin import IPlugin
 
 from statick_tool.issue import Issue
+from statick_tool.job_server import get_job_server
 from statick_tool.package import Package
 from statick_tool.plugin_context import PluginContext
+from statick_tool.resources import load_mapping
+from statick_tool.result_cache import CachedScan, ResultCache
+from statick_tool.tool_process import ToolProcess
+
+# Conservative limit on the combined length of file arguments passed to a single
+# tool invocation. Windows limits the whole command line to 32767 characters;
+# other platforms allow far more, but staying well below ARG_MAX leaves room for
+# flags and the environment.
+MAX_ARGS_LENGTH = 30000 if sys.platform == "win32" else 100000
+
+T = TypeVar("T")  # pylint: disable=invalid-name
 
 
 # No stubs available for IPlugin so ignoring type.
@@ -17,6 +34,9 @@ class ToolPlugin(IPlugin):  # type: ignore
 
     plugin_context = None
 
+    # Versions of tools, by tool name, so each tool is only asked once.
+    tool_versions = {}  # type: Dict[str, Optional[str]]
+
     def get_name(self) -> str:
         """Get name of tool."""
         pass  # pylint: disable=unnecessary-pass
@@ -32,6 +52,32 @@ class ToolPlugin(IPlugin):  # type: ignore
     def scan(self, package: Package, level: str) -> Optional[List[Issue]]:
         """Run tool and gather output."""
 
+    def inputs_changed(  # pylint: disable=no-self-use
+        self, package: Package
+    ) -> bool:
+        """
+        Return whether any of the files the tool checks have changed.
+
+        This only matters when scanning files changed in git. Tools that check
+        individual files are only given the changed files, so they always run.
+        Tools that check a whole project override this to skip the project when
+        none of its files changed.
+        """
+        return True
+
+    @staticmethod
+    def any_file_changed(package: Package, globs: List[str]) -> bool:
+        """Return whether a file in package with a name matching globs changed."""
+        if package.changed_files is None:
+            return True
+        package_path = os.path.join(os.path.realpath(package.path), "")
+        for path in package.changed_files:
+            if path.startswith(package_path) and any(
+                fnmatch.fnmatch(os.path.basename(path), glob) for glob in globs
+            ):
+                return True
+        return False
+
     def set_plugin_context(self, plugin_context: Union[None, PluginContext]) -> None:
         """Set the plugin context."""
         self.plugin_context = plugin_context
@@ -58,15 +104,7 @@ class ToolPlugin(IPlugin):  # type: ignore
 
         if full_path is None:
             return {}
-        warning_mapping = {}  # type: Dict[str, str]
-        with open(full_path, "r") as mapping_file:
-            for line in mapping_file.readlines():
-                split_line = line.strip().split(":")
-                if len(split_line) != 2:
-                    print("Warning: invalid line {} in file {}".format(line, file_name))
-                    continue
-                warning_mapping[split_line[0]] = split_line[1]
-        return warning_mapping
+        return load_mapping(full_path)
 
     def get_user_flags(self, level: str, name: Optional[str] = None) -> List[str]:
         """Get the user-defined extra flags for a specific tool/level combination."""
@@ -83,6 +121,139 @@ class ToolPlugin(IPlugin):  # type: ignore
             flags = list(lex)
         return flags
 
+    def get_version(self) -> Optional[str]:
+        """
+        Get the version of the tool.
+
+        Returns None if the version can't be determined. The default
+        implementation runs the tool with the --version flag.
+        """
+        name = self.get_name()
+        if name not in ToolPlugin.tool_versions:
+            try:
+                output = subprocess.check_output(
+                    [name, "--version"],
+                    stderr=subprocess.STDOUT,
+                    universal_newlines=True,
+                )  # type: Optional[str]
+            except (subprocess.CalledProcessError, OSError):
+                output = None
+            ToolPlugin.tool_versions[name] = output
+        return ToolPlugin.tool_versions[name]
+
+    def get_cached_scan(
+        self, files: List[str], level: str, flags: List[str]
+    ) -> CachedScan:
+        """
+        Get a scan of files that reuses results cached by earlier runs.
+
+        Only tools that check each file independently of the others should use
+        the result cache. Caching is skipped if it is disabled with --no-cache or
+        if the version of the tool can't be determined.
+        """
+        if self.plugin_context is None:
+            return CachedScan(files)
+        args = self.plugin_context.args
+        cache_directory = getattr(args, "cache_directory", None)
+        if not cache_directory or getattr(args, "no_cache", False):
+            return CachedScan(files)
+        version = self.get_version()
+        if version is None:
+            return CachedScan(files)
+
+        cache = ResultCache(cache_directory, args.cache_max_size)
+        keys = {}  # type: Dict[str, str]
+        for path in files:
+            key = cache.get_key(self.get_name(), version, flags, level, path)
+            if key is not None:
+                keys[path] = key
+        run_key = cache.get_key(self.get_name(), version, flags, level)
+        return CachedScan(files, cache, keys, run_key)
+
+    def open_log(self) -> TextIO:
+        """
+        Open the log file for the output of the tool.
+
+        Output is only logged when an output directory is given. Otherwise the
+        log is opened on the null device, so the output is discarded.
+        """
+        if self.plugin_context and self.plugin_context.args.output_directory:
+            return open(self.get_name() + ".log", "w")
+        return open(os.devnull, "w")
+
+    def start_process(
+        self, command: List[str], log: Optional[TextIO] = None, **kwargs: Any
+    ) -> ToolProcess:
+        """
+        Start running the tool and read its output as it runs.
+
+        Output is written to log and printed if --show-tool-output is given.
+        Raises OSError if the tool can't be run.
+        """
+        show_output = bool(
+            self.plugin_context
+            and getattr(self.plugin_context.args, "show_tool_output", False)
+        )
+        return ToolProcess(command, log, show_output, **kwargs)
+
+    @staticmethod
+    def map_files(function: Callable[[str], T], files: List[str]) -> List[T]:
+        """
+        Call function on each file on a thread pool and get the results in order.
+
+        Tools that are run once per file spend most of their time waiting for the
+        tool process, so running one process per CPU at a time speeds them up.
+        If function raises an exception, the exception for the first file, in
+        order, that raised one is raised again.
+
+        With a job budget, one file at a time runs on the job held by the tool
+        plugin, and every other file waits for a free job.
+        """
+        workers = min(len(files), os.cpu_count() or 1)
+        if workers <= 1:
+            return [function(filename) for filename in files]
+        job_server = get_job_server()
+        if job_server is None:
+            run_file = function
+        else:
+            held_job = threading.Lock()
+
+            def run_file(filename: str) -> T:
+                if held_job.acquire(blocking=False):
+                    try:
+                        return function(filename)
+                    finally:
+                        held_job.release()
+                with job_server.job():
+                    return function(filename)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run_file, files))
+
+    @staticmethod
+    def get_file_chunks(
+        files: List[str], max_length: int = MAX_ARGS_LENGTH
+    ) -> List[List[str]]:
+        """
+        Split a list of files into chunks that fit on a single command line.
+
+        Tools that accept many files at once can be run once per chunk instead
+        of once per file, avoiding the cost of starting the tool repeatedly.
+        """
+        chunks = []  # type: List[List[str]]
+        chunk = []  # type: List[str]
+        length = 0
+        for filename in files:
+            if chunk and length + len(filename) + 1 > max_length:
+                chunks.append(chunk)
+                chunk = []
+                length = 0
+            chunk.append(filename)
+            length += len(filename) + 1
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
     @staticmethod
     def is_valid_executable(path: str) -> bool:
         """
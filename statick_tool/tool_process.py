@@ -0,0 +1,89 @@
+"""
+Run a tool and read its output while it runs.
+
+Tools such as clang-tidy or make can print hundreds of megabytes on a large
+codebase. Instead of collecting all of the output before parsing it, a tool
+process hands the output to the parser one line at a time. Each line is written
+to the tool log as it is read, and only the last lines are kept in memory so
+they can be shown if the tool fails.
+"""
+import collections
+import subprocess
+from types import TracebackType
+from typing import Any, Deque, Iterator, List, Optional, TextIO, Type
+
+# Number of lines of output kept to show when a tool fails.
+TAIL_LINES = 100
+
+
+class ToolProcess:
+    """Tool process whose combined stdout and stderr is read line by line."""
+
+    def __init__(
+        self,
+        command: List[str],
+        log: Optional[TextIO] = None,
+        show_output: bool = False,
+        **kwargs: Any
+    ) -> None:
+        """
+        Start running command.
+
+        Every line of output is written to log, and printed if show_output is
+        set. Extra keyword arguments are passed on to subprocess.Popen. Raises
+        OSError if the command can't be run.
+        """
+        self.command = command
+        self.log = log
+        self.show_output = show_output
+        self.tail = collections.deque(maxlen=TAIL_LINES)  # type: Deque[str]
+        self.process = subprocess.Popen(  # pylint: disable=consider-using-with
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+            **kwargs
+        )
+
+    def __enter__(self) -> "ToolProcess":
+        """Use tool process as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stop the tool if it is still running, such as after a parser error."""
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        if self.process.stdout is not None:
+            self.process.stdout.close()
+
+    def __iter__(self) -> Iterator[str]:
+        """Get the lines of output, without line endings, as the tool prints them."""
+        assert self.process.stdout is not None
+        for line in self.process.stdout:
+            if self.log is not None:
+                self.log.write(line)
+            if self.show_output:
+                print(line, end="")
+            self.tail.append(line)
+            yield line.rstrip("\n")
+
+    def wait(self) -> int:
+        """
+        Wait for the tool to finish and get its return code.
+
+        Output the parser didn't read is still written to the log, and reading
+        it keeps the tool from blocking on a full pipe.
+        """
+        for _ in self:
+            pass
+        return self.process.wait()
+
+    def get_tail(self) -> str:
+        """Get the last lines of output."""
+        return "".join(self.tail)
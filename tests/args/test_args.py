@@ -1,6 +1,8 @@
 """Unit tests for the Args module."""
 import os
 
+import pytest
+
 from statick_tool.args import Args
 
 
@@ -100,3 +102,20 @@ def test_args_user_paths_present():
         ["--user-paths", os.path.join(os.path.dirname(__file__), "test")]
     )
     assert user_paths == [os.path.join(os.path.dirname(__file__), "test")]
+
+
+def test_args_changed_lines_only_without_changed_since():
+    """
+    Test asking for changed lines without a git reference to compare with.
+
+    Expected result: the arguments are rejected
+    """
+    args = Args("test")
+    args.parser.add_argument("--changed-since", dest="changed_since")
+    args.parser.add_argument(
+        "--changed-lines-only", dest="changed_lines_only", action="store_true"
+    )
+    with pytest.raises(SystemExit):
+        args.get_args(["--changed-lines-only"])
+    parsed_args = args.get_args(["--changed-since", "HEAD", "--changed-lines-only"])
+    assert parsed_args.changed_lines_only
@@ -0,0 +1,123 @@
+"""Unit tests for the benchmark harness."""
+
+import json
+import os
+
+import pytest
+
+from statick_tool.benchmark import (
+    compare_results,
+    generate_package,
+    generate_tool_output,
+    main,
+    parse_mix,
+)
+
+
+def test_parse_mix():
+    """
+    Test parsing a language mix.
+
+    Expected result: languages get their weights, with a default of 1
+    """
+    assert parse_mix("c=3,python") == {"c": 3, "python": 1}
+    with pytest.raises(ValueError):
+        parse_mix("fortran=1")
+
+
+def test_generate_package(tmpdir):
+    """
+    Test generating a synthetic package.
+
+    Expected result: the requested number of files in the mixed languages,
+    no deeper than the requested depth, with NOLINT comments
+    """
+    path = tmpdir.join("package").strpath
+    files = generate_package(path, 30, 2, {"c": 1, "python": 1}, lines=20, seed=1)
+    assert sum(len(value) for value in files.values()) == 30
+    assert set(files) == {"c", "python"}
+    assert all(filename.endswith(".c") for filename in files["c"])
+    assert os.path.isfile(os.path.join(path, "package.xml"))
+    for value in files.values():
+        for filename in value:
+            relative = os.path.relpath(filename, path)
+            assert relative.count(os.sep) <= 2
+    with open(files["python"][0]) as fname:
+        lines = fname.read().splitlines()
+    assert len(lines) == 20
+    assert lines[10] == "VALUE_10 = 10  # NOLINT"
+    assert (
+        generate_package(
+            tmpdir.join("other").strpath, 30, 2, {"c": 1, "python": 1}, lines=20, seed=1
+        ).keys()
+        == files.keys()
+    )
+
+
+def test_generate_tool_output():
+    """
+    Test generating tool output.
+
+    Expected result: one line per issue in files of the tool's languages
+    """
+    files = {"c": ["/pkg/a.c"], "python": ["/pkg/b.py"]}
+    output = generate_tool_output("pylint", files, 3, 10).splitlines()
+    assert len(output) == 3
+    assert all(line.startswith("/pkg/b.py:") for line in output)
+    assert generate_tool_output("yamllint", files, 3, 10) == ""
+
+
+def test_compare_results():
+    """
+    Test comparing benchmark results.
+
+    Expected result: only steps that slowed down past the threshold and the
+    minimum time are regressions
+    """
+    baseline = {
+        "results": {
+            "a": {"min_wall_time": 1.0},
+            "b": {"min_wall_time": 1.0},
+            "c": {"min_wall_time": 0.001},
+        }
+    }
+    current = {
+        "results": {
+            "a": {"min_wall_time": 1.5},
+            "b": {"min_wall_time": 1.1},
+            "c": {"min_wall_time": 0.002},
+            "d": {"min_wall_time": 5.0},
+        }
+    }
+    regressions = compare_results(baseline, current, 0.25)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("a: ")
+
+
+def test_main(tmpdir):
+    """
+    Test running the benchmarks.
+
+    Expected result: every step is timed and compared with a baseline
+    """
+    output = tmpdir.join("results.json").strpath
+    args = ["--files", "20", "--issues", "50", "--repeat", "1", "--output", output]
+    assert main(args) == 0
+    with open(output) as fname:
+        results = json.load(fname)
+    assert results["parameters"]["files"] == 20
+    steps = results["results"]
+    assert steps["discovery/all"]["repeat"] == 1
+    assert steps["discovery/warm"]["repeat"] == 1
+    assert steps["parse_output/pylint"]["issues"] == 50
+    assert "filter/exceptions" in steps
+    assert "reporting/print_to_console" in steps
+    assert "startup/import" in steps
+    assert steps["startup/gather_args"]["imported_plugins"] > 0
+
+    # A baseline every step is slower than.
+    for step in steps.values():
+        step["min_wall_time"] = -1
+    with open(output, "w") as fname:
+        json.dump(results, fname)
+    assert main(args[:-2] + ["--compare", output]) == 1
@@ -0,0 +1,228 @@
+"""Unit tests for the compile_commands module."""
+import json
+import os
+from tempfile import TemporaryDirectory
+
+from statick_tool.compile_commands import (
+    REPLY_DIR,
+    get_include_dirs,
+    load_build_info,
+    read_compile_commands,
+    read_file_api,
+)
+
+
+def write_json(path, data):
+    """Write data to a JSON file, creating its directory."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fname:
+        json.dump(data, fname)
+
+
+def write_compile_commands(build_dir, package_path):
+    """Write a compilation database for a package with two targets."""
+    write_json(
+        os.path.join(build_dir, "compile_commands.json"),
+        [
+            {
+                "directory": build_dir,
+                "command": "/usr/bin/c++ -I{0}/include -isystem /opt/ros/include "
+                "-o CMakeFiles/node.dir/src/node.cpp.o -c {0}/src/node.cpp".format(
+                    package_path
+                ),
+                "file": os.path.join(package_path, "src", "node.cpp"),
+            },
+            {
+                "directory": os.path.join(package_path, "build"),
+                "arguments": [
+                    "/usr/bin/c++",
+                    "-I",
+                    "../include",
+                    "-c",
+                    "../src/lib.cpp",
+                ],
+                "file": "../src/lib.cpp",
+                "output": "CMakeFiles/lib.dir/src/lib.cpp.o",
+            },
+            {
+                "directory": build_dir,
+                "command": "/usr/bin/c++ -o CMakeFiles/node.dir/src/util.cpp.o "
+                "-c {}/src/util.cpp".format(package_path),
+                "file": os.path.join(package_path, "src", "util.cpp"),
+            },
+            {
+                "directory": build_dir,
+                "command": "/usr/bin/c++ -c /elsewhere/other.cpp",
+                "file": "/elsewhere/other.cpp",
+            },
+        ],
+    )
+
+
+def write_file_api_reply(reply_dir, source_root, build_root):
+    """Write a CMake File API reply with a code model."""
+    write_json(
+        os.path.join(reply_dir, "index-2020-01-01T00-00-00-0000.json"),
+        {"objects": [{"kind": "codemodel", "jsonFile": "codemodel-v2-1.json"}]},
+    )
+    write_json(
+        os.path.join(reply_dir, "codemodel-v2-1.json"),
+        {
+            "paths": {"source": source_root, "build": build_root},
+            "configurations": [
+                {
+                    "targets": [
+                        {"name": "node", "jsonFile": "target-node.json"},
+                        {"name": "docs", "jsonFile": "target-docs.json"},
+                    ]
+                }
+            ],
+        },
+    )
+    write_json(
+        os.path.join(reply_dir, "target-node.json"),
+        {
+            "name": "node",
+            "paths": {"source": ".", "build": "."},
+            "sources": [
+                {"path": "src/node.cpp", "compileGroupIndex": 0},
+                {"path": "include/node.h"},
+                {
+                    "path": "build/moc_node.cpp",
+                    "compileGroupIndex": 0,
+                    "isGenerated": True,
+                },
+            ],
+            "compileGroups": [
+                {"includes": [{"path": "include"}, {"path": "/opt/ros"}]}
+            ],
+        },
+    )
+    write_json(
+        os.path.join(reply_dir, "target-docs.json"),
+        {"name": "docs", "paths": {"source": ".", "build": "."}, "sources": []},
+    )
+
+
+def test_get_include_dirs():
+    """
+    Test finding include directories in compiler arguments.
+
+    Expected result: joined and separate include flags relative to directory
+    """
+    arguments = ["c++", "-Iinc", "-isystem", "/sys", "-iquote../quote", "-O2", "-I"]
+    assert get_include_dirs(arguments, "/build") == [
+        "/build/inc",
+        "/sys",
+        "/quote",
+    ]
+
+
+def test_read_compile_commands():
+    """
+    Test reading targets from a compilation database.
+
+    Expected result: sources grouped by target, sources outside the package left out
+    """
+    with TemporaryDirectory() as tmp_dir:
+        package_path = os.path.join(tmp_dir, "pkg")
+        build_dir = os.path.join(tmp_dir, "build", "pkg")
+        write_compile_commands(build_dir, package_path)
+        path = os.path.join(build_dir, "compile_commands.json")
+        build_info = read_compile_commands(path, package_path)
+    assert build_info.bin_dir == build_dir
+    assert build_info.compile_commands == path
+    assert build_info.targets == [
+        {
+            "name": "node",
+            "src_dir": package_path,
+            "include_dirs": [os.path.join(package_path, "include"), "/opt/ros/include"],
+            "src": [
+                os.path.join(package_path, "src", "node.cpp"),
+                os.path.join(package_path, "src", "util.cpp"),
+            ],
+        },
+        {
+            "name": "lib",
+            "src_dir": package_path,
+            "include_dirs": [os.path.join(package_path, "include")],
+            "src": [os.path.join(package_path, "src", "lib.cpp")],
+        },
+    ]
+
+
+def test_read_compile_commands_invalid():
+    """
+    Test reading a compilation database that isn't valid.
+
+    Expected result: None
+    """
+    with TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "compile_commands.json")
+        with open(path, "w") as fname:
+            fname.write("[{")
+        assert read_compile_commands(path, tmp_dir) is None
+        assert read_compile_commands(os.path.join(tmp_dir, "missing"), tmp_dir) is None
+
+
+def test_read_file_api():
+    """
+    Test reading targets from a CMake File API reply.
+
+    Expected result: compiled sources that aren't generated, and include directories
+    """
+    with TemporaryDirectory() as tmp_dir:
+        build_root = os.path.join(tmp_dir, "build")
+        reply_dir = os.path.join(build_root, REPLY_DIR)
+        write_file_api_reply(reply_dir, tmp_dir, build_root)
+        build_info = read_file_api(reply_dir, tmp_dir)
+    assert build_info.bin_dir == build_root
+    assert build_info.compile_commands is None
+    assert build_info.targets == [
+        {
+            "name": "node",
+            "src_dir": tmp_dir,
+            "include_dirs": [os.path.join(tmp_dir, "include"), "/opt/ros"],
+            "src": [os.path.join(tmp_dir, "src", "node.cpp")],
+        }
+    ]
+
+
+def test_read_file_api_no_codemodel():
+    """
+    Test reading a CMake File API reply without a code model.
+
+    Expected result: None
+    """
+    with TemporaryDirectory() as tmp_dir:
+        write_json(os.path.join(tmp_dir, "index-1.json"), {"objects": []})
+        assert read_file_api(tmp_dir, tmp_dir) is None
+
+
+def test_load_build_info():
+    """
+    Test finding the build of a package in a workspace build base.
+
+    Expected result: the File API reply is preferred over compile_commands.json,
+    and the build of the package is found in its subdirectory
+    """
+    with TemporaryDirectory() as tmp_dir:
+        package_path = os.path.join(tmp_dir, "src", "pkg")
+        build_base = os.path.join(tmp_dir, "build")
+        build_dir = os.path.join(build_base, "pkg")
+        write_compile_commands(build_dir, package_path)
+        build_info = load_build_info(build_base, package_path, "pkg")
+        assert [target["name"] for target in build_info.targets] == ["node", "lib"]
+
+        write_file_api_reply(
+            os.path.join(build_dir, REPLY_DIR), package_path, build_dir
+        )
+        build_info = load_build_info(build_base, package_path, "pkg")
+        assert build_info.compile_commands == os.path.join(
+            build_dir, "compile_commands.json"
+        )
+        assert build_info.targets[0]["src"] == [
+            os.path.join(package_path, "src", "node.cpp")
+        ]
+
+        assert load_build_info(build_base, package_path, "other") is None
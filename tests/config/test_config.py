@@ -154,3 +154,57 @@ def test_config_get_reporintg_config():
 
     reporting_config = config.get_reporting_config("write_to_file", "example", "flags")
     assert not reporting_config
+
+
+def test_config_inheritance_cycle():
+    """
+    Test for when a level inherits from itself through other levels.
+
+    Expected result: ValueError is thrown naming the levels in the cycle
+    """
+    with pytest.raises(ValueError) as ex:
+        Config(os.path.join(os.path.dirname(__file__), "rsc", "cycle.yaml"))
+    assert "base -> top -> middle -> base" in str(ex.value)
+
+
+def test_config_deep_inheritance():
+    """
+    Test that inheritance through several levels is flattened.
+
+    Expected result: nearer levels replace the keys of the levels they inherit from
+    """
+    config_file = os.path.join(os.path.dirname(__file__), "rsc", "deep.yaml")
+    config = Config(config_file)
+
+    assert config.get_inheritance_chain("top") == ["top", "middle", "base"]
+    assert config.get_enabled_tool_plugins("top") == ["bandit", "pylint", "pyflakes"]
+    assert config.get_enabled_discovery_plugins("top") == ["python"]
+    assert not config.get_enabled_reporting_plugins("top")
+    assert config.get_tool_config("pylint", "top", "flags") == "--middle"
+    assert config.get_tool_config("pylint", "top", "max_line_length") == "100"
+    assert config.get_tool_config("pylint", "middle", "max_line_length") == "80"
+    assert config.get_tool_config("pyflakes", "top", "flags") == "--base"
+    assert config.get_tool_config("bandit", "middle", "flags", "default") == "default"
+    assert config.get_tool_config("pylint", "not_a_level", "flags", "x") == "x"
+    assert config.get_tool_config("bandit", "orphan", "flags") == "--orphan"
+    with pytest.raises(KeyError):
+        config.get_enabled_tool_plugins("orphan")
+    with pytest.raises(KeyError):
+        config.get_enabled_tool_plugins("not_a_level")
+
+
+def test_config_resolved_level_cache():
+    """
+    Test that levels are resolved once and resolved again when the config is replaced.
+
+    Expected result: the resolved level is reused until the config is replaced
+    """
+    config_file = os.path.join(os.path.dirname(__file__), "rsc", "config.yaml")
+    config = Config(config_file)
+
+    resolved = config.resolve_level("objective_minus_pylint")
+    config.get_enabled_tool_plugins("objective_minus_pylint")
+    assert config.resolve_level("objective_minus_pylint") is resolved
+
+    config.config = {"levels": {"objective_minus_pylint": {"tool": {"a": {}}}}}
+    assert config.get_enabled_tool_plugins("objective_minus_pylint") == ["a"]
@@ -1,9 +1,10 @@
 """Unit tests for the Exceptions module."""
 import os
 
+import mock
 import pytest
 
-from statick_tool.exceptions import Exceptions
+from statick_tool.exceptions import Exceptions, GlobMatcher
 from statick_tool.issue import Issue
 from statick_tool.package import Package
 
@@ -390,3 +391,178 @@ def test_filter_issues_wildcard_exceptions():
 
     issues = exceptions.filter_issues(package, issues)
     assert len(issues["pylint"]) == 1
+
+
+def test_filter_issues_tool_exceptions():
+    """
+    Test that file and regex exceptions only apply to the tools they list.
+
+    Expected result: only the issues matching an exception for their tool are
+    filtered, and the order of the remaining issues is kept.
+    """
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    exceptions = Exceptions(
+        os.path.join(os.path.dirname(__file__), "tool_exceptions.yaml")
+    )
+
+    def make_issue(filename, tool, message):
+        return Issue(
+            os.path.join(package.path, filename), "0", tool, "type", "3", message, None
+        )
+
+    issues = {
+        "pylint": [
+            make_issue("generated/x.py", "pylint", "C0111: Missing docstring"),
+            make_issue("x_pb2.py", "pylint", "C0111: Missing docstring"),
+            make_issue("y.py", "pylint", "W0611: Unused import os"),
+            make_issue("y.py", "pylint", "C0111: Missing docstring"),
+        ],
+        "pyflakes": [
+            make_issue("generated/x.py", "pyflakes", "Unused import os"),
+            make_issue("z.py", "pyflakes", "W0611: Unused import os"),
+        ],
+    }
+    expected = {"pylint": [issues["pylint"][3]], "pyflakes": [issues["pyflakes"][0]]}
+
+    package_exceptions = exceptions.get_exceptions(package)
+    issues = exceptions.filter_file_exceptions(
+        package, package_exceptions["file"], issues
+    )
+    issues = exceptions.filter_regex_exceptions(
+        package_exceptions["message_regex"], issues
+    )
+    assert issues == expected
+
+
+def test_filter_issues_many_issues():
+    """
+    Test that filtering scales to many issues.
+
+    Expected result: issues are filtered in time linear in the number of issues.
+    """
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    exceptions = Exceptions(
+        os.path.join(os.path.dirname(__file__), "tool_exceptions.yaml")
+    )
+
+    issues = {
+        "pylint": [
+            Issue(
+                os.path.join(package.path, "generated", "{}.py".format(i % 100)),
+                "0",
+                "pylint",
+                "type",
+                "3",
+                "C0111: Missing docstring {}".format(i),
+                None,
+            )
+            for i in range(100000)
+        ]
+    }
+    issues = exceptions.filter_file_exceptions(
+        package, exceptions.get_exceptions(package)["file"], issues
+    )
+    assert not issues["pylint"]
+
+
+def test_glob_matcher():
+    """
+    Test matching file names against several globs at once.
+
+    Expected result: names matching any glob match, including relative paths.
+    """
+    matcher = GlobMatcher(["*.py", "build/*", "*/build/*"])
+    assert matcher.match("/src/x.py")
+    assert not matcher.match("/src/x.cpp")
+    assert matcher.match("/src/pkg/build/x.cpp")
+    assert matcher.match("/src/pkg/x.cpp", "build/x.cpp")
+    assert not matcher.match("/home/travis/build/pkg/x.cpp")
+    assert not GlobMatcher(["*.py"]).match("/src/x.py.bak")
+    assert GlobMatcher(["*/build/*"], travis_hack=False).match(
+        "/home/travis/build/pkg/x.cpp"
+    )
+
+
+def test_glob_matcher_normcase():
+    """
+    Test matching globs where file names are normalized, as on Windows.
+
+    Expected result: patterns are normalized the same way as file names, so
+    they still match
+    """
+
+    def normcase(path):
+        return path.lower().replace("/", "\\")
+
+    with mock.patch("os.path.normcase", side_effect=normcase):
+        matcher = GlobMatcher(["*/build/*", "*/Generated/*.PY"])
+        assert matcher.match("C:/src/pkg/build/x.cpp")
+        assert matcher.match("C:/src/pkg/generated/x.py")
+        assert not matcher.match("C:/src/pkg/x.py")
+
+
+def test_filter_nolint_categories():
+    """
+    Test that NOLINT and NOLINTNEXTLINE annotations only suppress listed issue types.
+
+    Expected result: issues are kept unless an annotation on their line, or a
+    NOLINTNEXTLINE on the line before, applies to their type.
+    """
+    exceptions = Exceptions(
+        os.path.join(os.path.dirname(__file__), "valid_exceptions.yaml")
+    )
+    filename = os.path.join(os.path.dirname(__file__), "valid_package", "nolint.cpp")
+
+    def make_issue(line_number, issue_type):
+        return Issue(filename, line_number, "tool", issue_type, "3", "message", None)
+
+    suppressed = [
+        make_issue("1", "whitespace/tab"),
+        make_issue("2", "whitespace/tab"),
+        make_issue("2", "readability/casting"),
+        make_issue("4", "warning/google-explicit-constructor"),
+        make_issue("6", "build/header_guard"),
+    ]
+    kept = [
+        make_issue("2", "build/include"),
+        make_issue("3", "warning/google-explicit-constructor"),
+        make_issue("4", "warning/cert-err58-cpp"),
+        make_issue("7", "whitespace/tab"),
+        make_issue("0", "whitespace/tab"),
+        make_issue("100", "whitespace/tab"),
+    ]
+    issues = {"tool": suppressed + kept}
+
+    issues = exceptions.filter_nolint(issues)
+    assert issues["tool"] == kept
+
+
+def test_filter_nolint_unreadable_files():
+    """
+    Test NOLINT filtering for issues in empty or missing files.
+
+    Expected result: all issues are kept.
+    """
+    exceptions = Exceptions(
+        os.path.join(os.path.dirname(__file__), "valid_exceptions.yaml")
+    )
+    issues = {
+        "tool": [
+            Issue(
+                os.path.join(os.path.dirname(__file__), "valid_package", name),
+                "1",
+                "tool",
+                "type",
+                "3",
+                "message",
+                None,
+            )
+            for name in ["empty.cpp", "missing.cpp"]
+        ]
+    }
+
+    assert len(exceptions.filter_nolint(issues)["tool"]) == 2
@@ -0,0 +1,7 @@
+int a = 0;  // NOLINT
+int b = 0;  // NOLINT(whitespace/tab, readability/*)
+// NOLINTNEXTLINE(google-explicit-constructor)
+int c = 0;
+// NOLINTNEXTLINE
+int d = 0;  // NOLINT(build/include)
+int e = 0;
@@ -0,0 +1,94 @@
+"""Tests for statick_tool.file_classifier."""
+import codecs
+import os
+import tempfile
+
+import pytest
+
+from statick_tool import file_classifier
+from statick_tool.file_classifier import FileClassifier
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (b"#!/usr/bin/python\n", file_classifier.PYTHON),
+        (b"#!/usr/bin/env python3\n", file_classifier.PYTHON),
+        (b"#!/usr/bin/env -S VAR=1 python3.8 -u\n", file_classifier.PYTHON),
+        (b"#!/usr/bin/perl -w\n", file_classifier.PERL),
+        (b"#! /bin/sh\n", file_classifier.SHELL),
+        (b"#!/usr/bin/env bash\n", file_classifier.SHELL),
+        (b"#!/bin/zsh\n", file_classifier.SHELL),
+        (b"#!/usr/bin/env ruby\nclass Foo\nend\n", file_classifier.OTHER),
+        (b"#!\n", None),
+        (b"#!/usr/bin/env\n", None),
+    ],
+)
+def test_file_classifier_classify_shebang(header, expected):
+    """Test that scripts are classified by the interpreter on the shebang line."""
+    assert FileClassifier.classify(header) == expected
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (b"#include <stdio.h>\nint main() {}\n", file_classifier.C),
+        (b"#ifndef FOO_H\n#define FOO_H\n#endif\n", file_classifier.C),
+        (b"struct foo {\n  int bar;\n};\n", file_classifier.C),
+        (b"#include <vector>\nusing namespace std;\n", file_classifier.CPP),
+        (b"namespace foo {\n}\n", file_classifier.CPP),
+        (b"class Foo {\n public:\n  Foo();\n};\n", file_classifier.CPP),
+        (b"import os\n\n\ndef main():\n    pass\n", file_classifier.PYTHON),
+        (b"from os import path\n", file_classifier.PYTHON),
+        (b'"""Module docstring."""\n', file_classifier.PYTHON),
+        (b"package Foo::Bar;\n1;\n", file_classifier.PERL_MODULE),
+        (b"<!DOCTYPE html>\n<html>\n</html>\n", file_classifier.OTHER),
+        (b"[section]\nkey = value\n", None),
+        (b"plain text\n", None),
+        (b"", None),
+    ],
+)
+def test_file_classifier_classify_content(header, expected):
+    """Test that files without a shebang line are classified by their contents."""
+    assert FileClassifier.classify(header) == expected
+
+
+def test_file_classifier_classify_binary():
+    """Test that binary files are not classified as source files."""
+    assert FileClassifier.classify(b"\x7fELF\x02\x01\x01\0\0#include") is None
+
+
+def test_file_classifier_classify_bom():
+    """Test that byte order marks are handled."""
+    assert (
+        FileClassifier.classify(codecs.BOM_UTF8 + b"#!/bin/sh\n")
+        == file_classifier.SHELL
+    )
+    assert (
+        FileClassifier.classify(
+            codecs.BOM_UTF16_LE + "#include <stdio.h>\n".encode("utf-16-le")
+        )
+        == file_classifier.C
+    )
+
+
+def test_file_classifier_get_file_type():
+    """Test that file types are cached until the file changes."""
+    classifier = FileClassifier()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "script")
+        with open(path, "w") as fid:
+            fid.write("#!/bin/bash\n")
+        assert classifier.get_file_type(path) == file_classifier.SHELL
+        assert path in classifier.file_types
+
+        with open(path, "w") as fid:
+            fid.write("#!/usr/bin/env python\n")
+        os.utime(path, ns=(0, 0))
+        assert classifier.get_file_type(path) == file_classifier.PYTHON
+
+
+def test_file_classifier_get_file_type_missing():
+    """Test that files that can't be read are not classified."""
+    classifier = FileClassifier()
+    assert classifier.get_file_type("/nonexistent/path/to/file") is None
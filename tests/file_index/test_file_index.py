@@ -0,0 +1,94 @@
+"""Tests for statick_tool.file_index."""
+import os
+import tempfile
+
+import pytest
+
+from statick_tool import file_classifier
+from statick_tool.discovery_plugin import DiscoveryPlugin
+from statick_tool.exceptions import Exceptions
+from statick_tool.file_index import FileIndex
+from statick_tool.package import Package
+
+
+@pytest.fixture
+def package_dir():
+    """Create a package with files of several types."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.makedirs(os.path.join(tmp_dir, "src", "sub"))
+        os.makedirs(os.path.join(tmp_dir, "build"))
+        files = {
+            "a.py": "",
+            "README.md": "",
+            os.path.join("src", "b.C"): "",
+            os.path.join("src", "script"): "#!/bin/bash\n",
+            os.path.join("src", "setup.cfg"): "#!/usr/bin/env python\n",
+            os.path.join("src", "sub", "c.py"): "",
+            os.path.join("build", "d.py"): "",
+        }
+        for name, contents in files.items():
+            with open(os.path.join(tmp_dir, name), "w") as fid:
+                fid.write(contents)
+        yield tmp_dir
+
+
+def test_file_index_walk(package_dir):
+    """Test that the index lists files in the same order as os.walk."""
+    index = FileIndex(package_dir)
+    expected = [
+        os.path.join(root, name)
+        for root, _, files in os.walk(package_dir)
+        for name in files
+    ]
+    assert index.files == expected
+
+
+def test_file_index_walk_symlink(package_dir):
+    """Test that symbolic links to directories are not followed."""
+    os.symlink(os.path.join(package_dir, "src"), os.path.join(package_dir, "src_link"))
+    index = FileIndex(package_dir)
+    assert not [path for path in index.files if "src_link" in path]
+
+
+def test_file_index_find(package_dir):
+    """Test finding files by glob, extension and file type."""
+    index = FileIndex(package_dir)
+    assert set(index.find(globs=["*.py"])) == {
+        os.path.join(package_dir, "a.py"),
+        os.path.join(package_dir, "src", "sub", "c.py"),
+        os.path.join(package_dir, "build", "d.py"),
+    }
+    assert index.find(extensions=[".c"]) == [os.path.join(package_dir, "src", "b.C")]
+    assert index.find(file_types=[file_classifier.SHELL]) == [
+        os.path.join(package_dir, "src", "script")
+    ]
+    assert index.find(file_types=[file_classifier.PYTHON]) == [
+        os.path.join(package_dir, "src", "setup.cfg")
+    ]
+    assert not index.find(
+        file_types=[file_classifier.PYTHON], unclassified_extensions=[".cfg"]
+    )
+
+
+def test_file_index_exceptions(package_dir):
+    """Test that exceptions for all tools are applied to the index."""
+    index = FileIndex(package_dir)
+    exceptions = Exceptions(
+        os.path.join(
+            os.path.dirname(__file__), "..", "exceptions", "early_exceptions.yaml"
+        )
+    )
+    index.apply_exceptions(Package("test", package_dir), exceptions)
+    assert index.excluded == {os.path.join(package_dir, "build", "d.py")}
+    assert set(index.filter_excluded(index.find(globs=["*.py"]))) == {
+        os.path.join(package_dir, "a.py"),
+        os.path.join(package_dir, "src", "sub", "c.py"),
+    }
+
+
+def test_file_index_shared(package_dir):
+    """Test that discovery plugins share one index per package."""
+    package = Package("test", package_dir)
+    index = DiscoveryPlugin.get_file_index(package)
+    assert DiscoveryPlugin.get_file_index(package) is index
+    assert Package("test", package_dir).file_index is None
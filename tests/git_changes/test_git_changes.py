@@ -0,0 +1,145 @@
+"""Tests for statick_tool.git_changes."""
+import os
+import shutil
+import subprocess
+import tempfile
+
+import pytest
+
+from statick_tool import git_changes
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+from statick_tool.tool_plugin import ToolPlugin
+
+
+def git(path, *args):
+    """Run git in path."""
+    subprocess.check_call(
+        ["git", "-C", path, "-c", "user.name=test", "-c", "user.email=test@test"]
+        + list(args),
+        stdout=subprocess.DEVNULL,
+    )
+
+
+@pytest.fixture
+def repo():
+    """Create a git repository with a commit and some changes since it."""
+    if not shutil.which("git"):
+        pytest.skip("git is not available")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = os.path.realpath(tmp_dir)
+        git(tmp_dir, "init", "-q")
+        os.makedirs(os.path.join(tmp_dir, "pkg"))
+        for name in ["a.py", "b.py", "CMakeLists.txt"]:
+            with open(os.path.join(tmp_dir, "pkg", name), "w") as fid:
+                fid.write("one\ntwo\nthree\n")
+        git(tmp_dir, "add", ".")
+        git(tmp_dir, "commit", "-q", "-m", "initial")
+
+        with open(os.path.join(tmp_dir, "pkg", "b.py"), "w") as fid:
+            fid.write("one\n2\nthree\nfour\n")
+        with open(os.path.join(tmp_dir, "pkg", "c.py"), "w") as fid:
+            fid.write("new\n")
+        yield tmp_dir
+
+
+def test_get_changed_files(repo):
+    """Test that modified and untracked files are found."""
+    assert git_changes.get_changed_files(os.path.join(repo, "pkg"), "HEAD") == {
+        os.path.join(repo, "pkg", "b.py"),
+        os.path.join(repo, "pkg", "c.py"),
+    }
+
+
+def test_get_changed_files_invalid_ref(repo):
+    """Test that an unknown reference is reported as a failure."""
+    assert git_changes.get_changed_files(repo, "no-such-ref") is None
+
+
+def test_get_changed_files_not_repo():
+    """Test that a directory outside of a repository is reported as a failure."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        assert git_changes.get_changed_files(tmp_dir, "HEAD") is None
+
+
+def test_get_changed_lines(repo):
+    """Test that added and modified lines are found."""
+    assert git_changes.get_changed_lines(repo, "HEAD") == {
+        os.path.join(repo, "pkg", "b.py"): {2, 4},
+        os.path.join(repo, "pkg", "c.py"): None,
+    }
+
+
+def test_filter_package(repo):
+    """Test that unchanged files are removed from the package."""
+    package = Package("pkg", os.path.join(repo, "pkg"))
+    files = [os.path.join(package.path, name) for name in ["a.py", "b.py", "c.py"]]
+    package["python_src"] = files
+    package["make_targets"] = [{"name": "target", "src": files}]
+    package["top_poms"] = files
+    changed = git_changes.get_changed_files(package.path, "HEAD")
+    git_changes.filter_package(package, changed)
+    assert package["python_src"] == files[1:]
+    assert package["make_targets"][0]["src"] == files[1:]
+    assert package["top_poms"] == files
+    assert package.changed_files == changed
+
+
+def test_filter_issues(repo):
+    """Test that issues on unchanged lines are removed."""
+    package = Package("pkg", os.path.join(repo, "pkg"))
+
+    def issue(filename, line):
+        return Issue(filename, line, "tool", "type", "5", "message", None)
+
+    issues = {
+        "tool": [
+            issue(os.path.join(package.path, "a.py"), "2"),
+            issue(os.path.join(package.path, "b.py"), "1"),
+            issue(os.path.join(package.path, "b.py"), "2"),
+            issue(os.path.join(package.path, "b.py"), "0"),
+            issue("b.py", "4"),
+            issue(os.path.join(package.path, "c.py"), "1"),
+        ]
+    }
+    changed_lines = git_changes.get_changed_lines(package.path, "HEAD")
+    assert git_changes.filter_issues(package, issues, changed_lines) == {
+        "tool": [issues["tool"][i] for i in [2, 3, 4, 5]]
+    }
+
+
+def test_filter_issues_tool_dir(repo):
+    """
+    Test filtering issues with file names relative to where the tool ran.
+
+    Expected result: names are found in the tool directory, and issues in
+    files that can't be found are kept
+    """
+    package = Package("pkg", os.path.join(repo, "pkg"))
+
+    def issue(filename, line):
+        return Issue(filename, line, "tool", "type", "5", "message", None)
+
+    issues = {
+        "tool": [
+            issue(os.path.join("pkg", "b.py"), "1"),
+            issue(os.path.join("pkg", "b.py"), "2"),
+            issue(os.path.join("pkg", "a.py"), "2"),
+            issue(os.path.join("build", "generated.h"), "1"),
+        ]
+    }
+    changed_lines = git_changes.get_changed_lines(package.path, "HEAD")
+    assert git_changes.filter_issues(package, issues, changed_lines, repo) == {
+        "tool": [issues["tool"][i] for i in [1, 3]]
+    }
+
+
+def test_tool_plugin_any_file_changed(repo):
+    """Test checking whether a whole-project tool needs to run."""
+    package = Package("pkg", os.path.join(repo, "pkg"))
+    assert ToolPlugin.any_file_changed(package, ["CMakeLists.txt"])
+    git_changes.filter_package(
+        package, git_changes.get_changed_files(package.path, "HEAD")
+    )
+    assert ToolPlugin.any_file_changed(package, ["*.py"])
+    assert not ToolPlugin.any_file_changed(package, ["CMakeLists.txt"])
@@ -0,0 +1,48 @@
+"""Unit tests for the IssueSpool module."""
+import os
+
+from statick_tool.issue import Issue
+from statick_tool.issue_spool import IssueSpool
+
+
+def test_issue_spool():
+    """
+    Test collecting the issues of several packages.
+
+    Expected result: issues are read back per tool in the order they were added,
+    and the packages' own issue lists are left alone
+    """
+    first = Issue("a/a.py", "1", "pylint", "type", "3", "message", None)
+    second = Issue("b/b.py", "2", "pylint", "type", "5", "message", "CERT-1")
+    third = Issue("b/b.cpp", "3", "make", "type", "3", "message", None)
+    package_a = {"pylint": [first], "make": []}
+    package_b = {"pylint": [second], "make": [third]}
+    with IssueSpool() as spool:
+        spool.add(package_a)
+        spool.add(package_b)
+        assert spool.count() == 3
+        issues = spool.get_issues()
+        assert list(issues) == ["pylint", "make"]
+        assert len(issues["pylint"]) == 2
+        assert list(issues["pylint"]) == [first, second]
+        # Issues can be read more than once.
+        assert list(issues["pylint"]) == [first, second]
+        assert list(issues["make"]) == [third]
+        spool_dir = spool.tmp_dir.name
+        assert os.path.isdir(spool_dir)
+    assert package_a == {"pylint": [first], "make": []}
+    assert not os.path.exists(spool_dir)
+
+
+def test_issue_spool_empty():
+    """
+    Test a spool of packages without issues.
+
+    Expected result: tools are listed without issues
+    """
+    with IssueSpool() as spool:
+        spool.add({"pylint": []})
+        assert spool.count() == 0
+        issues = spool.get_issues()
+        assert not issues["pylint"]
+        assert list(issues["pylint"]) == []
@@ -0,0 +1,85 @@
+"""Unit tests for the IssueStore module."""
+from statick_tool.issue import Issue
+from statick_tool.issue_store import IssueStore, to_int
+
+
+def make_issue(filename, line_number, tool, severity, message="message"):
+    """Create an issue."""
+    return Issue(filename, line_number, tool, "type", severity, message, None)
+
+
+def test_issue_store_deduplicates():
+    """
+    Test that each tool keeps an issue once.
+
+    Expected result: duplicates from one tool are dropped, the same issue from
+    another tool is kept, and issues keep the order they were added in
+    """
+    first = make_issue("a.py", "1", "pylint", "3")
+    second = make_issue("b.py", "2", "pylint", "5")
+    store = IssueStore()
+    assert store.add("pylint", first)
+    assert store.add("pylint", second)
+    assert not store.add("pylint", make_issue("a.py", "1", "pylint", "3"))
+    assert store.add("other", first)
+    assert len(store) == 3
+    assert store.get_tool("pylint") == [first, second]
+    assert store.get_tool("missing") == []
+
+
+def test_issue_store_as_dict():
+    """
+    Test the dict of lists view of the store.
+
+    Expected result: tools without issues are kept, and the lists are new
+    """
+    issue = make_issue("a.py", "1", "pylint", "3")
+    store = IssueStore({"pylint": [issue, issue], "pyflakes": []})
+    assert store.get_tools() == ["pylint", "pyflakes"]
+    issues = store.as_dict()
+    assert issues == {"pylint": [issue], "pyflakes": []}
+    issues["pylint"].append(issue)
+    assert store.get_tool("pylint") == [issue]
+
+
+def test_issue_store_severities():
+    """
+    Test counting issues by severity.
+
+    Expected result: severities that aren't integers count as 0
+    """
+    issues = [
+        make_issue("a.py", "1", "pylint", "3"),
+        make_issue("b.py", "x", "pylint", "5"),
+        make_issue("a.py", "7", "bandit", "high"),
+    ]
+    store = IssueStore({"pylint": issues[:2], "bandit": issues[2:]})
+    assert list(store.severities) == [3, 5, 0]
+    assert list(store.count_by_severity().items()) == [(0, 1), (3, 1), (5, 1)]
+
+
+def test_issue_store_interns_strings():
+    """
+    Test that strings repeated across issues are shared.
+
+    Expected result: issues from different sources share filename strings
+    """
+    filename = "".join(["dir/", "file.py"])
+    other_filename = "".join(["dir/", "file", ".py"])
+    assert filename is not other_filename
+    store = IssueStore()
+    store.add("pylint", make_issue(filename, "1", "pylint", "3", "one"))
+    store.add("pylint", make_issue(other_filename, "2", "pylint", "3", "two"))
+    first, second = store.get_tool("pylint")
+    assert first.filename is second.filename
+
+
+def test_to_int():
+    """
+    Test converting severities.
+
+    Expected result: values that aren't integers become 0
+    """
+    assert to_int("12") == 12
+    assert to_int("") == 0
+    assert to_int(None) == 0
@@ -0,0 +1,219 @@
+"""Unit tests for the job server module."""
+import os
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+
+import mock
+import pytest
+
+from statick_tool import job_server
+from statick_tool.job_server import (
+    JOB_SERVER_ENV,
+    JobServer,
+    get_job_server,
+    get_make_version,
+    start_job_server,
+)
+
+pytestmark = pytest.mark.skipif(
+    os.name != "posix", reason="Job server requires POSIX pipes"
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_job_server(monkeypatch):
+    """Start each test without a job server."""
+    monkeypatch.delenv(JOB_SERVER_ENV, raising=False)
+    monkeypatch.setattr(job_server, "JOB_SERVER", None)
+    yield
+    os.environ.pop(JOB_SERVER_ENV, None)
+    server = job_server.JOB_SERVER
+    if server is not None:
+        os.close(server.read_fd)
+        os.close(server.write_fd)
+
+
+def count_tokens(server):
+    """Take all free tokens from server, put them back, and count them."""
+    os.set_blocking(server.read_fd, False)
+    try:
+        tokens = os.read(server.read_fd, 1024)
+    except BlockingIOError:
+        tokens = b""
+    finally:
+        os.set_blocking(server.read_fd, True)
+    os.write(server.write_fd, tokens)
+    return len(tokens)
+
+
+def test_job_server_tokens():
+    """
+    Test that jobs take tokens from the budget and put them back.
+
+    Expected result: one token fewer while a job runs
+    """
+    server = start_job_server(3)
+    assert count_tokens(server) == 3
+    with server.job():
+        assert count_tokens(server) == 2
+        with server.job():
+            assert count_tokens(server) == 1
+    assert count_tokens(server) == 3
+
+
+def test_job_server_release_on_error():
+    """
+    Test that a job that fails puts its token back.
+
+    Expected result: all tokens are free after the error
+    """
+    server = start_job_server(2)
+    with pytest.raises(ValueError):
+        with server.job():
+            raise ValueError("mocked error")
+    assert count_tokens(server) == 2
+
+
+def test_job_server_no_budget():
+    """
+    Test getting the job server when no budget was set.
+
+    Expected result: None
+    """
+    assert get_job_server() is None
+
+
+def test_job_server_from_environment():
+    """
+    Test that a job server started by a parent process is reused.
+
+    Expected result: the same pipe is used instead of a new budget
+    """
+    parent = JobServer.create(2)
+    server = start_job_server(8)
+    assert server.get_pass_fds() == parent.get_pass_fds()
+    assert count_tokens(server) == 2
+
+
+def test_job_server_from_environment_invalid(monkeypatch):
+    """
+    Test a job server named in the environment that wasn't inherited.
+
+    Expected result: None
+    """
+    monkeypatch.setenv(JOB_SERVER_ENV, "not,fds")
+    assert JobServer.from_environment() is None
+    read_fd, write_fd = os.pipe()
+    os.close(read_fd)
+    os.close(write_fd)
+    monkeypatch.setenv(JOB_SERVER_ENV, "{},{}".format(read_fd, write_fd))
+    assert JobServer.from_environment() is None
+    with open(__file__) as fname:
+        fd = fname.fileno()
+        monkeypatch.setenv(JOB_SERVER_ENV, "{},{}".format(fd, fd))
+        assert JobServer.from_environment() is None
+
+
+def test_job_server_make_env(monkeypatch):
+    """
+    Test the environment for running make with the job server.
+
+    Expected result: MAKEFLAGS keeps existing flags and names the pipe
+    """
+    monkeypatch.setenv("MAKEFLAGS", "-k")
+    monkeypatch.setattr(job_server, "get_make_version", lambda make: (4, 3))
+    server = JobServer(10, 11)
+    env = server.get_make_env()
+    assert env["MAKEFLAGS"] == "-k -j --jobserver-auth=10,11"
+    assert os.environ["MAKEFLAGS"] == "-k"
+
+
+def test_job_server_make_env_old_make(monkeypatch):
+    """
+    Test the environment for running make before 4.2 with the job server.
+
+    Expected result: MAKEFLAGS names the pipe with the older option
+    """
+    monkeypatch.delenv("MAKEFLAGS", raising=False)
+    monkeypatch.setattr(job_server, "get_make_version", lambda make: (3, 81))
+    env = JobServer(10, 11).get_make_env()
+    assert env["MAKEFLAGS"] == "-j --jobserver-fds=10,11"
+
+
+def test_job_server_make_env_unknown_make(monkeypatch):
+    """
+    Test the environment for running a make of unknown version.
+
+    Expected result: MAKEFLAGS is unchanged, so make doesn't run unlimited jobs
+    """
+    monkeypatch.setenv("MAKEFLAGS", "-k")
+    monkeypatch.setattr(job_server, "get_make_version", lambda make: None)
+    env = JobServer(10, 11).get_make_env()
+    assert env["MAKEFLAGS"] == "-k"
+
+
+@pytest.mark.parametrize(
+    "output, version",
+    [
+        ("GNU Make 4.3\nBuilt for x86_64-pc-linux-gnu\n", (4, 3)),
+        ("GNU Make 3.81\nCopyright (C) 2006\n", (3, 81)),
+        ("make: unknown option\n", None),
+    ],
+)
+@mock.patch("statick_tool.job_server.subprocess.check_output")
+def test_get_make_version(mock_check_output, output, version):
+    """
+    Test reading the version of make.
+
+    Expected result: the major and minor version, or None if it isn't GNU make
+    """
+    mock_check_output.return_value = output
+    get_make_version.cache_clear()
+    try:
+        assert get_make_version("make") == version
+    finally:
+        get_make_version.cache_clear()
+
+
+@mock.patch("statick_tool.job_server.subprocess.check_output")
+def test_get_make_version_missing(mock_check_output):
+    """
+    Test reading the version of a missing make.
+
+    Expected result: None
+    """
+    mock_check_output.side_effect = OSError("mocked error")
+    get_make_version.cache_clear()
+    try:
+        assert get_make_version("make") is None
+    finally:
+        get_make_version.cache_clear()
+
+
+def test_job_server_make():
+    """
+    Test that make runs its jobs within the budget.
+
+    Expected result: make succeeds and puts back every token it took
+    """
+    try:
+        subprocess.check_output(["make", "--version"])
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip("Missing make executable.")
+    server = start_job_server(2)
+    with TemporaryDirectory() as tmp_dir:
+        with open(os.path.join(tmp_dir, "Makefile"), "w") as makefile:
+            makefile.write(
+                "all: a b c\na b c:\n\t@{} -c \"print('$@')\"\n".format(sys.executable)
+            )
+        with server.job():
+            output = subprocess.check_output(
+                ["make", "--output-sync=target"],
+                cwd=tmp_dir,
+                env=server.get_make_env(),
+                pass_fds=server.get_pass_fds(),
+                universal_newlines=True,
+            )
+    assert sorted(output.split()) == ["a", "b", "c"]
+    assert count_tokens(server) == 2
@@ -0,0 +1,98 @@
+"""Unit tests for the package finder."""
+import json
+import os
+
+import mock
+
+from statick_tool.package_finder import find_packages, walk_packages
+
+
+def make_package(path, *markers):
+    """Make a package directory, with marker files."""
+    os.makedirs(path)
+    for filename in ("package.xml",) + markers:
+        open(os.path.join(path, filename), "w").close()
+
+
+def make_workspace(tmpdir):
+    """Make a workspace with packages, ignored trees and build output."""
+    path = tmpdir.join("ws").strpath
+    make_package(os.path.join(path, "src", "a"))
+    make_package(os.path.join(path, "src", "a", "nested"))
+    make_package(os.path.join(path, "src", "group", "b"))
+    make_package(os.path.join(path, "src", "ignored", "c"))
+    open(os.path.join(path, "src", "ignored", "COLCON_IGNORE"), "w").close()
+    make_package(os.path.join(path, "src", "d"), "CATKIN_IGNORE")
+    make_package(os.path.join(path, "src", "d", "e"))
+    make_package(os.path.join(path, "src", "h"), "AMENT_IGNORE")
+    make_package(os.path.join(path, "src", "build"))
+    make_package(os.path.join(path, "build", "a"))
+    make_package(os.path.join(path, "install", "share", "a"))
+    make_package(os.path.join(path, "log", "f"))
+    os.symlink(os.path.join(path, "src", "group"), os.path.join(path, "src", "linked"))
+    return path
+
+
+def test_find_packages(tmpdir):
+    """
+    Test finding the packages in a workspace.
+
+    Expected result: packages are found in the order of os.walk, sorted by name,
+    without ignored trees, build output, or packages below symbolic links
+    """
+    path = make_workspace(tmpdir)
+    src = os.path.join(path, "src")
+    assert find_packages(path) == [
+        ("a", os.path.join(src, "a")),
+        ("build", os.path.join(src, "build")),
+        ("nested", os.path.join(src, "a", "nested")),
+        ("b", os.path.join(src, "group", "b")),
+    ]
+    assert find_packages(src, ["nested", "b"]) == [
+        ("a", os.path.join(src, "a")),
+        ("build", os.path.join(src, "build")),
+    ]
+
+    make_package(os.path.join(src, "pkg_link_target"))
+    os.symlink(os.path.join(src, "pkg_link_target"), os.path.join(src, "z_link"))
+    assert ("z_link", os.path.join(src, "z_link")) in find_packages(path)
+
+
+def test_find_packages_index(tmpdir):
+    """
+    Test keeping the packages of a workspace in an index.
+
+    Expected result: the index is used until a directory in the workspace changes
+    """
+    path = make_workspace(tmpdir)
+    index_file = tmpdir.join("packages.json").strpath
+    packages = find_packages(path, index_file=index_file)
+    with open(index_file) as fname:
+        index = json.load(fname)
+    assert index["path"] == path
+    assert [package[0] for package in index["packages"]] == [
+        "a",
+        "build",
+        "nested",
+        "b",
+    ]
+
+    with mock.patch(
+        "statick_tool.package_finder.walk_packages", side_effect=walk_packages
+    ) as walk:
+        assert find_packages(path, ["a"], index_file) == packages[1:]
+        assert not walk.called
+
+        make_package(os.path.join(path, "src", "group", "g"))
+        os.utime(os.path.join(path, "src", "group"), ns=(0, 0))
+        packages = find_packages(path, index_file=index_file)
+        assert walk.call_count == 1
+        assert ("g", os.path.join(path, "src", "group", "g")) in packages
+
+        find_packages(os.path.join(path, "src"), index_file=index_file)
+        assert walk.call_count == 2
+
+        with open(index_file, "w") as fname:
+            fname.write("not json")
+        assert find_packages(path, index_file=index_file) == packages
+        assert walk.call_count == 3
@@ -0,0 +1,10 @@
+"""Tool plugin whose plugin info file says it is a reporting plugin."""
+from statick_tool.tool_plugin import ToolPlugin
+
+
+class MiscategorizedToolPlugin(ToolPlugin):
+    """Tool plugin whose plugin info file says it is a reporting plugin."""
+
+    def get_name(self):
+        """Get name of tool."""
+        return "miscategorized"
@@ -0,0 +1,2 @@
+"""Tool plugin that can't be imported."""
+import not_a_module  # noqa: F401 # pylint: disable=import-error,unused-import
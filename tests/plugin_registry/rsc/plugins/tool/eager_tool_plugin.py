@@ -0,0 +1,10 @@
+"""Tool plugin without Statick metadata in its plugin info file."""
+from statick_tool.tool_plugin import ToolPlugin
+
+
+class EagerToolPlugin(ToolPlugin):
+    """Tool plugin without Statick metadata in its plugin info file."""
+
+    def get_name(self):
+        """Get name of tool."""
+        return "eager"
@@ -0,0 +1,10 @@
+"""Tool plugin with Statick metadata in its plugin info file."""
+from statick_tool.tool_plugin import ToolPlugin
+
+
+class LazyToolPlugin(ToolPlugin):
+    """Tool plugin with Statick metadata in its plugin info file."""
+
+    def get_name(self):
+        """Get name of tool."""
+        return "lazy"
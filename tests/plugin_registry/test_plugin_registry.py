@@ -0,0 +1,124 @@
+"""Unit tests for the plugin registry."""
+import argparse
+import os
+
+import statick_tool
+from statick_tool.benchmark import run_startup
+from statick_tool.discovery_plugin import DiscoveryPlugin
+from statick_tool.plugin_registry import find_plugins, load_plugin, read_plugin_info
+from statick_tool.reporting_plugin import ReportingPlugin
+from statick_tool.statick import Statick
+from statick_tool.tool_plugin import ToolPlugin
+
+INTERFACES = {
+    "Discovery": DiscoveryPlugin,
+    "Tool": ToolPlugin,
+    "Reporting": ReportingPlugin,
+}
+
+# Generous, so the test only fails when startup slows down a lot.
+MAX_STARTUP_TIME = 5.0
+
+
+def get_plugin_path():
+    """Get the path of the plugins that come with Statick."""
+    return os.path.join(os.path.dirname(statick_tool.__file__), "plugins")
+
+
+def test_find_plugins_lazy():
+    """
+    Test that plugins with Statick metadata are found without importing them.
+
+    Expected result: plugins are imported when they are first used
+    """
+    plugins = find_plugins([get_plugin_path()], INTERFACES)
+    assert "pylint" in list(plugins["Tool"])
+    assert "write_sarif" in list(plugins["Reporting"])
+    assert not any(
+        category.is_loaded(name) for category in plugins.values() for name in category
+    )
+
+    plugin = plugins["Tool"]["pylint"]
+    assert plugin.get_name() == "pylint"
+    assert plugins["Tool"].is_loaded("pylint")
+    assert plugins["Tool"]["pylint"] is plugin
+    assert plugins["Tool"].get("not_a_plugin") is None
+
+
+def test_plugin_metadata():
+    """
+    Test that the Statick metadata of the plugins that come with Statick is right.
+
+    Expected result: each plugin has the name and category in its metadata, and
+    adds arguments only if its metadata says so
+    """
+    for root, _, files in os.walk(get_plugin_path()):
+        for filename in files:
+            if not filename.endswith(".yapsy-plugin"):
+                continue
+            info_file = os.path.join(root, filename)
+            module, info = read_plugin_info(info_file)
+            assert info is not None, info_file
+            category, plugin = load_plugin(info_file, module, INTERFACES)
+            assert info.category == category, info_file
+            assert info.name == plugin.get_name(), info_file
+            adds_arguments = (
+                type(plugin).gather_args is not INTERFACES[category].gather_args
+            )
+            assert info.arguments == adds_arguments, info_file
+
+
+def test_find_plugins_user_paths():
+    """
+    Test finding plugins in user paths.
+
+    Expected result: plugins without Statick metadata are imported when found,
+    and plugins that can't be imported or are in the wrong category are missing
+    """
+    user_path = os.path.join(os.path.dirname(__file__), "rsc", "plugins")
+    plugins = find_plugins([get_plugin_path(), user_path], INTERFACES)
+
+    assert plugins["Tool"].is_loaded("eager")
+    assert "eager" in plugins["Tool"].get_argument_plugins()
+    assert not plugins["Tool"].is_loaded("lazy")
+    assert plugins["Tool"]["lazy"].get_name() == "lazy"
+
+    assert "broken" in list(plugins["Tool"])
+    assert "broken" not in plugins["Tool"]
+    assert "broken" not in list(plugins["Tool"])
+
+    assert "miscategorized" in plugins["Reporting"].get_argument_plugins()
+    assert "miscategorized" not in plugins["Reporting"]
+
+
+def test_statick_gather_args_lazy():
+    """
+    Test that gathering arguments only imports plugins that add arguments.
+
+    Expected result: plugin arguments are added and other plugins aren't imported
+    """
+    statick = Statick([])
+    parser = argparse.ArgumentParser()
+    statick.gather_args(parser)
+    args = parser.parse_args(["--bandit-bin", "bandit3"])
+    assert args.bandit_bin == "bandit3"
+    assert statick.tool_plugins.is_loaded("bandit")
+    assert not statick.tool_plugins.is_loaded("pylint")
+    assert not statick.reporting_plugins.is_loaded("print_to_console")
+
+
+def test_startup_time():
+    """
+    Test the time taken to start Statick in a fresh interpreter.
+
+    Expected result: only plugins that add arguments are imported, and startup
+    takes less than MAX_STARTUP_TIME seconds
+    """
+    startup = run_startup()
+    plugins = find_plugins([get_plugin_path()], INTERFACES)
+    assert startup["imported_plugins"] == sorted(
+        name
+        for category in plugins.values()
+        for name in category.get_argument_plugins()
+    )
+    assert sum(time[0] for time in startup["times"]) < MAX_STARTUP_TIME
@@ -1,7 +1,6 @@
 """Unit tests for the C discovery plugin."""
 import contextlib
 import os
-import subprocess
 
 import mock
 from yapsy.PluginManager import PluginManager
@@ -9,6 +8,7 @@ from yapsy.PluginManager import PluginManager
 import statick_tool
 from statick_tool.discovery_plugin import DiscoveryPlugin
 from statick_tool.exceptions import Exceptions
+from statick_tool.file_classifier import FileClassifier
 from statick_tool.package import Package
 from statick_tool.plugins.discovery.c_discovery_plugin import CDiscoveryPlugin
 
@@ -86,9 +86,9 @@ def test_c_discovery_plugin_scan_valid():
         "test.hxx",
         "test.hpp",
         os.path.join("ignore_this", "ignoreme.c"),
+        "oddextensioncpp.source",
+        "oddextensionc.source",
     ]
-    if cdp.file_command_exists():
-        expected += ["oddextensioncpp.source", "oddextensionc.source"]
     # We have to add the path to each of the above...yuck
     expected_fullpath = [os.path.join(package.path, filename) for filename in expected]
     # Neat trick to verify that two unordered lists are the same
@@ -121,9 +121,9 @@ def test_c_discovery_plugin_scan_exceptions():
         "test.h",
         "test.hxx",
         "test.hpp",
+        "oddextensioncpp.source",
+        "oddextensionc.source",
     ]
-    if cdp.file_command_exists():
-        expected += ["oddextensioncpp.source", "oddextensionc.source"]
     # We have to add the path to each of the above
     expected_fullpath = [os.path.join(package.path, filename) for filename in expected]
     # Neat trick to verify that two unordered lists are the same
@@ -134,8 +134,8 @@ def test_c_discovery_plugin_no_file_cmd():
     """
     Test when file command does not exist.
 
-    Test that files are not discovered with file command output if file
-    command does not exist.
+    Test that files without a recognized extension are still discovered by
+    their contents if the file command does not exist.
     """
     with modified_environ(PATH=""):
         cdp = CDiscoveryPlugin()
@@ -152,6 +152,8 @@ def test_c_discovery_plugin_no_file_cmd():
             "test.hxx",
             "test.hpp",
             os.path.join("ignore_this", "ignoreme.c"),
+            "oddextensioncpp.source",
+            "oddextensionc.source",
         ]
         # We have to add the path to each of the above...yuck
         expected_fullpath = [
@@ -161,19 +163,31 @@ def test_c_discovery_plugin_no_file_cmd():
         assert set(package["c_src"]) == set(expected_fullpath)
 
 
-@mock.patch("statick_tool.plugins.discovery.c_discovery_plugin.subprocess.check_output")
-def test_c_discovery_plugin_scan_calledprocesserror(mock_subprocess_check_output):
+@mock.patch("statick_tool.file_classifier.open", create=True)
+@mock.patch.object(DiscoveryPlugin, "file_classifier", FileClassifier())
+def test_c_discovery_plugin_scan_oserror(mock_open):
     """
-    Test what happens when a CalledProcessError is raised.
+    Test what happens when a file can't be read.
 
-    Expected result: issues is None
+    Expected result: only files with a recognized extension are found
     """
-    mock_subprocess_check_output.side_effect = subprocess.CalledProcessError(
-        1, "", output="mocked error"
-    )
+    mock_open.side_effect = OSError("mocked error")
     cdp = CDiscoveryPlugin()
     package = Package(
         "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
     )
     cdp.scan(package, "level")
-    assert not package["c_src"]
+    expected = [
+        "test.c",
+        "test.cpp",
+        "test.cc",
+        "test.cxx",
+        "test.h",
+        "test.hxx",
+        "test.hpp",
+        os.path.join("ignore_this", "ignoreme.c"),
+    ]
+    # We have to add the path to each of the above...yuck
+    expected_fullpath = [os.path.join(package.path, filename) for filename in expected]
+    # Neat trick to verify that two unordered lists are the same
+    assert set(package["c_src"]) == set(expected_fullpath)
@@ -1,7 +1,10 @@
 """Unit tests for the CMake discovery plugin."""
+
 import argparse
+import json
 import os
 import subprocess
+from tempfile import TemporaryDirectory
 
 import mock
 from yapsy.PluginManager import PluginManager
@@ -238,3 +241,112 @@ def test_cmake_discovery_plugin_scan_oserror(mock_subprocess_check_output):
     cmdp = setup_cmake_discovery_plugin()
     cmdp.scan(package, "level")
     assert not package["make_targets"]
+
+
+@mock.patch(
+    "statick_tool.plugins.discovery.cmake_discovery_plugin.subprocess.check_output"
+)
+def test_cmake_discovery_plugin_scan_build_directory(mock_subprocess_check_output):
+    """
+    Test configuring packages in a build directory that is kept between scans.
+
+    Expected result: CMake only runs again when the CMake files change, and the
+    targets found by the last run are reused otherwise
+    """
+    output = "-- TARGET: [NAME:test][SRC_DIR:/tmp][INCLUDE_DIRS:][SRC:test.c]"
+
+    def run_cmake(args, **kwargs):
+        with open(os.path.join(kwargs["cwd"], "CMakeCache.txt"), "w"):
+            pass
+        return output
+
+    mock_subprocess_check_output.side_effect = run_cmake
+    cmdp = setup_cmake_discovery_plugin()
+    with TemporaryDirectory() as tmp_dir:
+        cmdp.plugin_context.args.cmake_build_directory = os.path.join(tmp_dir, "build")
+        package_dir = os.path.join(tmp_dir, "package")
+        os.mkdir(package_dir)
+        with open(os.path.join(package_dir, "CMakeLists.txt"), "w") as fid:
+            fid.write("project(test)\n")
+
+        for expected_calls in [1, 1]:
+            package = Package("package", package_dir)
+            cmdp.scan(package, "level")
+            assert mock_subprocess_check_output.call_count == expected_calls
+            assert package["make_targets"][0]["src"] == ["/tmp/test.c"]
+            assert package["cmake_build_dir"].startswith(
+                os.path.join(tmp_dir, "build", "package-")
+            )
+            assert os.path.isfile(
+                os.path.join(package["cmake_build_dir"], "CMakeLists.txt")
+            )
+
+        with open(os.path.join(package_dir, "CMakeLists.txt"), "a") as fid:
+            fid.write("add_executable(test test.c)\n")
+        package = Package("package", package_dir)
+        cmdp.scan(package, "level")
+        assert mock_subprocess_check_output.call_count == 2
+
+
+@mock.patch(
+    "statick_tool.plugins.discovery.cmake_discovery_plugin.subprocess.check_output"
+)
+def test_cmake_discovery_plugin_scan_compile_commands(mock_subprocess_check_output):
+    """
+    Test finding targets in an existing build instead of running CMake.
+
+    Expected result: targets, headers and directories come from the compilation
+    database, and CMake only runs for packages that haven't been built
+    """
+    mock_subprocess_check_output.return_value = ""
+    cmdp = setup_cmake_discovery_plugin()
+    with TemporaryDirectory() as tmp_dir:
+        package_dir = os.path.join(tmp_dir, "package")
+        build_dir = os.path.join(tmp_dir, "build", "package")
+        os.makedirs(os.path.join(package_dir, "include", "package"))
+        os.makedirs(build_dir)
+        with open(os.path.join(package_dir, "CMakeLists.txt"), "w") as fid:
+            fid.write("project(package)\n")
+        header = os.path.join(package_dir, "include", "package", "test.h")
+        with open(header, "w") as fid:
+            fid.write("int test();\n")
+        with open(os.path.join(build_dir, "compile_commands.json"), "w") as fid:
+            json.dump(
+                [
+                    {
+                        "directory": build_dir,
+                        "command": "c++ -I{0}/include -o "
+                        "CMakeFiles/test.dir/test.cpp.o -c {0}/test.cpp".format(
+                            package_dir
+                        ),
+                        "file": os.path.join(package_dir, "test.cpp"),
+                    }
+                ],
+                fid,
+            )
+        cmdp.plugin_context.args.cmake_compile_commands = os.path.join(tmp_dir, "build")
+
+        package = Package("package", package_dir)
+        cmdp.scan(package, "level")
+        assert not mock_subprocess_check_output.called
+        assert package["make_targets"] == [
+            {
+                "name": "test",
+                "src_dir": package_dir,
+                "include_dirs": [os.path.join(package_dir, "include")],
+                "src": [os.path.join(package_dir, "test.cpp")],
+            }
+        ]
+        assert package["headers"] == [header]
+        assert package["src_dir"] == package_dir
+        assert package["bin_dir"] == build_dir
+        assert package["compile_commands"] == os.path.join(
+            build_dir, "compile_commands.json"
+        )
+        assert package["cmake_prebuilt"]
+
+        os.rename(package_dir, os.path.join(tmp_dir, "other"))
+        package = Package("other", os.path.join(tmp_dir, "other"))
+        cmdp.scan(package, "level")
+        assert mock_subprocess_check_output.called
+        assert "cmake_prebuilt" not in package
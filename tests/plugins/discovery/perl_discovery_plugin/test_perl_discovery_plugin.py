@@ -1,7 +1,6 @@
 """Unit tests for the Perl discovery plugin."""
 import contextlib
 import os
-import subprocess
 
 import mock
 from yapsy.PluginManager import PluginManager
@@ -9,6 +8,7 @@ from yapsy.PluginManager import PluginManager
 import statick_tool
 from statick_tool.discovery_plugin import DiscoveryPlugin
 from statick_tool.exceptions import Exceptions
+from statick_tool.file_classifier import FileClassifier
 from statick_tool.package import Package
 from statick_tool.plugins.discovery.perl_discovery_plugin import PerlDiscoveryPlugin
 
@@ -77,9 +77,11 @@ def test_perl_discovery_plugin_scan_valid():
         "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
     )
     pldp.scan(package, "level", None)
-    expected = ["test.pl", os.path.join("ignore_this", "ignoreme.pl")]
-    if pldp.file_command_exists():
-        expected += ["oddextensionpl.source"]
+    expected = [
+        "test.pl",
+        os.path.join("ignore_this", "ignoreme.pl"),
+        "oddextensionpl.source",
+    ]
     # We have to add the path to each of the above...yuck
     expected_fullpath = [os.path.join(package.path, filename) for filename in expected]
     # Neat trick to verify that two unordered lists are the same
@@ -107,8 +109,8 @@ def test_perl_discovery_plugin_no_file_cmd():
     """
     Test when file command does not exist.
 
-    Test that files are not discovered with file command output if file
-    command does not exist.
+    Test that files without a recognized extension are still discovered by
+    their contents if the file command does not exist.
     """
     with modified_environ(PATH=""):
         pldp = PerlDiscoveryPlugin()
@@ -116,7 +118,11 @@ def test_perl_discovery_plugin_no_file_cmd():
             "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
         )
         pldp.scan(package, "level")
-        expected = ["test.pl", os.path.join("ignore_this", "ignoreme.pl")]
+        expected = [
+            "test.pl",
+            os.path.join("ignore_this", "ignoreme.pl"),
+            "oddextensionpl.source",
+        ]
         # We have to add the path to each of the above...yuck
         expected_fullpath = [
             os.path.join(package.path, filename) for filename in expected
@@ -125,21 +131,22 @@ def test_perl_discovery_plugin_no_file_cmd():
         assert set(package["perl_src"]) == set(expected_fullpath)
 
 
-@mock.patch(
-    "statick_tool.plugins.discovery.perl_discovery_plugin.subprocess.check_output"
-)
-def test_perl_discovery_plugin_scan_calledprocesserror(mock_subprocess_check_output):
+@mock.patch("statick_tool.file_classifier.open", create=True)
+@mock.patch.object(DiscoveryPlugin, "file_classifier", FileClassifier())
+def test_perl_discovery_plugin_scan_oserror(mock_open):
     """
-    Test what happens when a CalledProcessError is raised.
+    Test what happens when a file can't be read.
 
-    Expected result: issues is None
+    Expected result: only files with a recognized extension are found
     """
-    mock_subprocess_check_output.side_effect = subprocess.CalledProcessError(
-        1, "", output="mocked error"
-    )
+    mock_open.side_effect = OSError("mocked error")
     pldp = PerlDiscoveryPlugin()
     package = Package(
         "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
     )
     pldp.scan(package, "level")
-    assert not package["perl_src"]
+    expected = ["test.pl", os.path.join("ignore_this", "ignoreme.pl")]
+    # We have to add the path to each of the above...yuck
+    expected_fullpath = [os.path.join(package.path, filename) for filename in expected]
+    # Neat trick to verify that two unordered lists are the same
+    assert set(package["perl_src"]) == set(expected_fullpath)
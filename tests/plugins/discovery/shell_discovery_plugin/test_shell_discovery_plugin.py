@@ -1,7 +1,6 @@
 """Unit tests for the Shell discovery plugin."""
 import contextlib
 import os
-import subprocess
 
 import mock
 from yapsy.PluginManager import PluginManager
@@ -9,6 +8,7 @@ from yapsy.PluginManager import PluginManager
 import statick_tool
 from statick_tool.discovery_plugin import DiscoveryPlugin
 from statick_tool.exceptions import Exceptions
+from statick_tool.file_classifier import FileClassifier
 from statick_tool.package import Package
 from statick_tool.plugins.discovery.shell_discovery_plugin import ShellDiscoveryPlugin
 
@@ -77,16 +77,16 @@ def test_shell_discovery_plugin_scan_valid():
         "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
     )
     shdp.scan(package, "level")
-    expected = ["test.sh", os.path.join("ignore_this", "ignoreme.bash")]
-    if shdp.file_command_exists():
-        expected += [
-            "oddextensionsh.source",
-            "oddextensionbash.source",
-            "oddextensionzsh.source",
-            "oddextensioncsh.source",
-            "oddextensionksh.source",
-            "oddextensiondash.source",
-        ]
+    expected = [
+        "test.sh",
+        os.path.join("ignore_this", "ignoreme.bash"),
+        "oddextensionsh.source",
+        "oddextensionbash.source",
+        "oddextensionzsh.source",
+        "oddextensioncsh.source",
+        "oddextensionksh.source",
+        "oddextensiondash.source",
+    ]
     # We have to add the path to each of the above...yuck
     expected_fullpath = [os.path.join(package.path, filename) for filename in expected]
     # Neat trick to verify that two unordered lists are the same
@@ -132,8 +132,8 @@ def test_shell_discovery_plugin_no_file_cmd():
     """
     Test when file command does not exist.
 
-    Test that files are not discovered with file command output if file
-    command does not exist.
+    Test that files without a recognized extension are still discovered by
+    their contents if the file command does not exist.
     """
     with modified_environ(PATH=""):
         shdp = ShellDiscoveryPlugin()
@@ -141,7 +141,16 @@ def test_shell_discovery_plugin_no_file_cmd():
             "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
         )
         shdp.scan(package, "level")
-        expected = ["test.sh", os.path.join("ignore_this", "ignoreme.bash")]
+        expected = [
+            "test.sh",
+            os.path.join("ignore_this", "ignoreme.bash"),
+            "oddextensionsh.source",
+            "oddextensionbash.source",
+            "oddextensionzsh.source",
+            "oddextensioncsh.source",
+            "oddextensionksh.source",
+            "oddextensiondash.source",
+        ]
         # We have to add the path to each of the above...yuck
         expected_fullpath = [
             os.path.join(package.path, filename) for filename in expected
@@ -150,21 +159,22 @@ def test_shell_discovery_plugin_no_file_cmd():
         assert set(package["shell_src"]) == set(expected_fullpath)
 
 
-@mock.patch(
-    "statick_tool.plugins.discovery.shell_discovery_plugin.subprocess.check_output"
-)
-def test_shell_discovery_plugin_scan_calledprocesserror(mock_subprocess_check_output):
+@mock.patch("statick_tool.file_classifier.open", create=True)
+@mock.patch.object(DiscoveryPlugin, "file_classifier", FileClassifier())
+def test_shell_discovery_plugin_scan_oserror(mock_open):
     """
-    Test what happens when a CalledProcessError is raised.
+    Test what happens when a file can't be read.
 
-    Expected result: issues is None
+    Expected result: only files with a recognized extension are found
     """
-    mock_subprocess_check_output.side_effect = subprocess.CalledProcessError(
-        1, "", output="mocked error"
-    )
+    mock_open.side_effect = OSError("mocked error")
     shdp = ShellDiscoveryPlugin()
     package = Package(
         "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
     )
     shdp.scan(package, "level")
-    assert not package["shell_src"]
+    expected = ["test.sh", os.path.join("ignore_this", "ignoreme.bash")]
+    # We have to add the path to each of the above...yuck
+    expected_fullpath = [os.path.join(package.path, filename) for filename in expected]
+    # Neat trick to verify that two unordered lists are the same
+    assert set(package["shell_src"]) == set(expected_fullpath)
@@ -5,6 +5,7 @@ from yapsy.PluginManager import PluginManager
 
 import statick_tool
 from statick_tool.issue import Issue
+from statick_tool.issue_spool import IssueSpool
 from statick_tool.package import Package
 from statick_tool.plugins.reporting.print_to_console_reporting_plugin import (
     PrintToConsoleReportingPlugin,
@@ -57,6 +58,7 @@ def test_console_reporting_plugin_report_cert(capsys):
         "Tool tool_a: 1 unique issues",
         "  test.txt:1: tool_a:type: This is a test (MEM50-CPP) [1]",
         "1 total unique issues",
+        "  severity 1: 1 unique issues",
     ]
 
 
@@ -77,4 +79,69 @@ def test_console_reporting_plugin_report_nocert(capsys):
         "Tool tool_a: 1 unique issues",
         "  test.txt:1: tool_a:type: This is a test [1]",
         "1 total unique issues",
+        "  severity 1: 1 unique issues",
+    ]
+
+
+def test_console_reporting_plugin_report_duplicates(capsys):
+    """Test that duplicate issues from a tool are only printed once."""
+    ptcrp = PrintToConsoleReportingPlugin()
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    issue = Issue("test.txt", "1", "tool_a", "type", "1", "This is a test", None)
+    issues = {"tool_a": [issue, issue], "tool_b": []}
+
+    ptcrp.report(package, issues, "level")
+    captured = capsys.readouterr()
+    output = captured.out.splitlines()
+    assert output == [
+        "Tool tool_a: 1 unique issues",
+        "  test.txt:1: tool_a:type: This is a test [1]",
+        "Tool tool_b: 0 unique issues",
+        "1 total unique issues",
+        "  severity 1: 1 unique issues",
+    ]
+
+
+def test_console_reporting_plugin_report_spooled(capsys):
+    """Test that spooled issues are read back and deduplicated per tool."""
+    ptcrp = PrintToConsoleReportingPlugin()
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    issue = Issue("test.txt", "1", "tool_a", "type", "1", "This is a test", None)
+    with IssueSpool() as spool:
+        spool.add({"tool_a": [issue], "tool_b": []})
+        spool.add({"tool_a": [issue]})
+        ptcrp.report(package, spool.get_issues(), "level")
+    output = capsys.readouterr().out.splitlines()
+    assert output == [
+        "Tool tool_a: 1 unique issues",
+        "  test.txt:1: tool_a:type: This is a test [1]",
+        "Tool tool_b: 0 unique issues",
+        "1 total unique issues",
+        "  severity 1: 1 unique issues",
+    ]
+
+
+def test_console_reporting_plugin_report_severities(capsys):
+    """Test that the number of unique issues with each severity is printed."""
+    ptcrp = PrintToConsoleReportingPlugin()
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    issues = {
+        "tool_a": [
+            Issue("a.txt", "1", "tool_a", "type", "5", "a", None),
+            Issue("b.txt", "2", "tool_a", "type", "1", "b", None),
+        ],
+        "tool_b": [Issue("a.txt", "1", "tool_b", "type", "5", "a", None)],
+    }
+    ptcrp.report(package, issues, "level")
+    output = capsys.readouterr().out.splitlines()
+    assert output[-3:] == [
+        "3 total unique issues",
+        "  severity 1: 1 unique issues",
+        "  severity 5: 2 unique issues",
     ]
@@ -1,5 +1,6 @@
 """Unit tests for the file writing reporting plugin."""
 import argparse
+import gzip
 import json
 import os
 import re
@@ -12,7 +13,9 @@ from statick_tool.issue import Issue
 from statick_tool.package import Package
 from statick_tool.plugin_context import PluginContext
 from statick_tool.plugins.reporting.write_jenkins_warnings_ng_reporting_plugin import (
+    SEVERITIES,
     WriteJenkinsWarningsNGReportingPlugin,
+    get_severity,
 )
 from statick_tool.reporting_plugin import ReportingPlugin
 from statick_tool.resources import Resources
@@ -28,7 +31,7 @@ output_regex = r"^{\"(.*)\": \"(.*)\", \"(.*)\": \"(.*)\", \"(.*)\": (\d+), \"(.
 
 
 def setup_write_jenkins_warnings_ng_reporting_plugin(
-    file_path, use_plugin_context=True
+    file_path, use_plugin_context=True, extra_args=None
 ):
     """Create an instance of the file writer plugin."""
     arg_parser = argparse.ArgumentParser()
@@ -45,9 +48,10 @@ def setup_write_jenkins_warnings_ng_reporting_plugin(
     )
     config = Config(resources.get_file("config.yaml"))
     wfrp = WriteJenkinsWarningsNGReportingPlugin()
+    wfrp.gather_args(arg_parser)
     if use_plugin_context:
         plugin_context = PluginContext(
-            arg_parser.parse_args([file_path]), resources, config
+            arg_parser.parse_args([file_path] + (extra_args or [])), resources, config
         )
         wfrp.set_plugin_context(plugin_context)
     return wfrp
@@ -206,3 +210,93 @@ def test_write_jenkins_warnings_ng_reporting_plugin_report_fileexists():
             )
         )
     assert not success
+
+
+def test_write_jenkins_warnings_ng_reporting_plugin_report_gzip():
+    """Test the compressed output of the reporting plugin."""
+    with TemporaryDirectory() as tmp_dir:
+        wfrp = setup_write_jenkins_warnings_ng_reporting_plugin(
+            tmp_dir, extra_args=["--jenkins-warnings-ng-gzip"]
+        )
+        package = Package(
+            "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+        )
+        issues = {
+            "tool_a": [
+                Issue("test.txt", 1, "tool_a", "type", "1", "This is a test", None)
+            ]
+        }
+        _, success = wfrp.report(package, issues, "level")
+        assert success
+        with gzip.open(
+            os.path.join(
+                tmp_dir, "valid_package-level", "valid_package-level.json.statick.gz"
+            ),
+            "rt",
+        ) as outfile:
+            lines = outfile.read().splitlines()
+    assert lines == [
+        '{"category": "tool_a", "fileName": "test.txt", "lineStart": 1, "message": "This is a test", "severity": "NORMAL", "type": "type"}'
+    ]
+
+
+def test_write_jenkins_warnings_ng_reporting_plugin_report_append():
+    """Test appending the issues of several packages to one file."""
+    with TemporaryDirectory() as tmp_dir:
+        output_file = os.path.join(tmp_dir, "all.json.statick")
+        wfrp = setup_write_jenkins_warnings_ng_reporting_plugin(
+            tmp_dir, extra_args=["--jenkins-warnings-ng-output", output_file]
+        )
+        for name in ["package_a", "package_b"]:
+            package = Package(name, os.path.join(tmp_dir, name))
+            issues = {
+                "tool_a": [
+                    Issue(name + ".txt", 1, "tool_a", "type", "3", "Issue", None)
+                ]
+            }
+            _, success = wfrp.report(package, issues, "level")
+            assert success
+        assert os.listdir(tmp_dir) == ["all.json.statick"]
+        with open(output_file) as outfile:
+            lines = outfile.read().splitlines()
+    assert [json.loads(line)["fileName"] for line in lines] == [
+        "package_a.txt",
+        "package_b.txt",
+    ]
+
+
+def test_write_jenkins_warnings_ng_reporting_plugin_report_append_gzip():
+    """Test appending compressed issues of several packages to one file."""
+    with TemporaryDirectory() as tmp_dir:
+        output_file = os.path.join(tmp_dir, "all.json.statick.gz")
+        wfrp = setup_write_jenkins_warnings_ng_reporting_plugin(
+            tmp_dir,
+            extra_args=[
+                "--jenkins-warnings-ng-output",
+                output_file,
+                "--jenkins-warnings-ng-gzip",
+            ],
+        )
+        for name in ["package_a", "package_b"]:
+            package = Package(name, os.path.join(tmp_dir, name))
+            issues = {
+                "tool_a": [
+                    Issue(name + ".txt", 1, "tool_a", "type", "3", "Issue", None)
+                ]
+            }
+            _, success = wfrp.report(package, issues, "level")
+            assert success
+        with gzip.open(output_file, "rt") as outfile:
+            lines = outfile.read().splitlines()
+    assert [json.loads(line)["severity"] for line in lines] == ["HIGH", "HIGH"]
+
+
+def test_write_jenkins_warnings_ng_reporting_plugin_get_severity():
+    """Test that severities are converted once and then looked up."""
+    assert get_severity("0") == "LOW"
+    assert get_severity(2) == "NORMAL"
+    assert get_severity("4") == "HIGH"
+    assert get_severity(5) == "ERROR"
+    assert get_severity("12") == "ERROR"
+    assert SEVERITIES["12"] == "ERROR"
+    assert get_severity("invalid-severity") == "LOW"
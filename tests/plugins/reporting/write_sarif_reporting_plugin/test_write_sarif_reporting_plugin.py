@@ -0,0 +1,173 @@
+"""Unit tests for the SARIF reporting plugin."""
+import argparse
+import json
+import os
+
+from yapsy.PluginManager import PluginManager
+
+import statick_tool
+from statick_tool.config import Config
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+from statick_tool.plugin_context import PluginContext
+from statick_tool.plugins.reporting.write_sarif_reporting_plugin import (
+    WriteSarifReportingPlugin,
+    get_level,
+)
+from statick_tool.reporting_plugin import ReportingPlugin
+from statick_tool.resources import Resources
+
+try:
+    from tempfile import TemporaryDirectory
+except:  # pylint: disable=bare-except # noqa: E722 # NOLINT
+    from backports.tempfile import (  # pylint: disable=wrong-import-order
+        TemporaryDirectory,
+    )
+
+
+def setup_write_sarif_reporting_plugin(file_path, use_plugin_context=True):
+    """Create an instance of the SARIF writer plugin."""
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("output_directory", nargs="?")
+
+    resources = Resources(
+        [os.path.join(os.path.dirname(statick_tool.__file__), "plugins")]
+    )
+    config = Config(resources.get_file("config.yaml"))
+    wsrp = WriteSarifReportingPlugin()
+    if use_plugin_context:
+        plugin_context = PluginContext(
+            arg_parser.parse_args([file_path] if file_path else []), resources, config
+        )
+        wsrp.set_plugin_context(plugin_context)
+    return wsrp
+
+
+def test_write_sarif_reporting_plugin_found():
+    """Test that the plugin manager finds the SARIF writer plugin."""
+    manager = PluginManager()
+    manager.setPluginPlaces(
+        [os.path.join(os.path.dirname(statick_tool.__file__), "plugins")]
+    )
+    manager.setCategoriesFilter(
+        {
+            "Reporting": ReportingPlugin,
+        }
+    )
+    manager.collectPlugins()
+    assert any(
+        plugin_info.plugin_object.get_name() == "write_sarif"
+        for plugin_info in manager.getPluginsOfCategory("Reporting")
+    )
+    assert any(
+        plugin_info.name == "Write SARIF Reporting Plugin"
+        for plugin_info in manager.getPluginsOfCategory("Reporting")
+    )
+
+
+def test_write_sarif_reporting_plugin_report_no_plugin_context():
+    """Test the output of the reporting plugin without plugin context."""
+    with TemporaryDirectory() as tmp_dir:
+        wsrp = setup_write_sarif_reporting_plugin(tmp_dir, False)
+        package = Package("valid_package", tmp_dir)
+        _, success = wsrp.report(package, {"tool_a": []}, "level")
+    assert not success
+
+
+def test_write_sarif_reporting_plugin_report_no_output_directory():
+    """Test that nothing is written without an output directory."""
+    wsrp = setup_write_sarif_reporting_plugin(None)
+    package = Package("valid_package", os.path.dirname(__file__))
+    _, success = wsrp.report(package, {"tool_a": []}, "level")
+    assert success
+
+
+def test_write_sarif_reporting_plugin_report():
+    """Test the SARIF log written by the reporting plugin."""
+    with TemporaryDirectory() as tmp_dir:
+        wsrp = setup_write_sarif_reporting_plugin(tmp_dir)
+        package_path = os.path.join(tmp_dir, "valid_package")
+        package = Package("valid_package", package_path)
+        issues = {
+            "tool_a": [
+                Issue(
+                    os.path.join(package_path, "src", "a file.c"),
+                    "3",
+                    "tool_a",
+                    "type_a",
+                    "5",
+                    "This is a test",
+                    "EXP33-C",
+                ),
+                Issue("test.txt", 0, "tool_a", "type_b", 1, "Another test", None),
+                Issue("/other/b.c", "x", "tool_a", "type_a", "3", "Test", "EXP34-C"),
+            ],
+            "tool_b": [],
+        }
+        _, success = wsrp.report(package, issues, "level")
+        assert success
+        with open(
+            os.path.join(tmp_dir, "valid_package-level", "valid_package-level.sarif")
+        ) as outfile:
+            log = json.load(outfile)
+
+    assert log["version"] == "2.1.0"
+    assert [run["tool"]["driver"]["name"] for run in log["runs"]] == [
+        "tool_a",
+        "tool_b",
+    ]
+    run = log["runs"][0]
+    assert run["tool"]["driver"]["rules"] == [
+        {"id": "type_a", "properties": {"tags": ["CERT EXP33-C", "CERT EXP34-C"]}},
+        {"id": "type_b"},
+    ]
+    assert run["originalUriBaseIds"]["SRCROOT"]["uri"].endswith("/valid_package/")
+    results = run["results"]
+    assert results[0] == {
+        "ruleId": "type_a",
+        "ruleIndex": 0,
+        "level": "error",
+        "message": {"text": "This is a test"},
+        "locations": [
+            {
+                "physicalLocation": {
+                    "artifactLocation": {
+                        "uri": "src/a%20file.c",
+                        "uriBaseId": "SRCROOT",
+                    },
+                    "region": {"startLine": 3},
+                }
+            }
+        ],
+        "properties": {"severity": "5", "certReference": "EXP33-C"},
+    }
+    assert results[1]["ruleIndex"] == 1
+    assert results[1]["level"] == "note"
+    assert results[1]["locations"][0]["physicalLocation"] == {
+        "artifactLocation": {"uri": "test.txt", "uriBaseId": "SRCROOT"}
+    }
+    assert results[2]["level"] == "warning"
+    assert results[2]["locations"][0]["physicalLocation"] == {
+        "artifactLocation": {"uri": "file:///other/b.c"}
+    }
+    assert log["runs"][1]["results"] == []
+
+
+def test_write_sarif_reporting_plugin_report_fileexists():
+    """Test the output of the reporting plugin if there's a file where the output dir should go."""
+    with TemporaryDirectory() as tmp_dir:
+        wsrp = setup_write_sarif_reporting_plugin(tmp_dir)
+        package = Package("valid_package", tmp_dir)
+        # Makes a file where we expect a dir
+        open(os.path.join(tmp_dir, package.name + "-" + "level"), "w").close()
+        _, success = wsrp.report(package, {"tool_a": []}, "level")
+    assert not success
+
+
+def test_write_sarif_reporting_plugin_get_level():
+    """Test converting Statick severities to SARIF levels."""
+    assert get_level("0") == "note"
+    assert get_level(2) == "note"
+    assert get_level("3") == "warning"
+    assert get_level(5) == "error"
+    assert get_level("invalid-severity") == "warning"
@@ -1,5 +1,6 @@
 """Unit tests for the clang-tidy plugin."""
 import argparse
+import io
 import os
 import subprocess
 
@@ -51,6 +52,15 @@ def setup_clang_tidy_tool_plugin(use_plugin_context=True, binary=None):
     return cttp
 
 
+def mock_process(output, returncode):
+    """Create a mock clang-tidy process that prints output."""
+    process = mock.MagicMock()
+    process.stdout = io.StringIO(output)
+    process.poll.return_value = returncode
+    process.wait.return_value = returncode
+    return process
+
+
 def test_clang_tidy_tool_plugin_found():
     """Test that the plugin manager can find the clang-tidy plugin."""
     manager = PluginManager()
@@ -290,14 +300,14 @@ def test_clang_tidy_tool_plugin_scan_missing_fields():
     assert not issues
 
 
-@mock.patch("statick_tool.plugins.tool.clang_tidy_tool_plugin.subprocess.check_output")
-def test_clang_tidy_tool_plugin_scan_oserror(mock_subprocess_check_output):
+@mock.patch("statick_tool.tool_process.subprocess.Popen")
+def test_clang_tidy_tool_plugin_scan_oserror(mock_subprocess_popen):
     """
     Test what happens when an OSError is raised (usually means clang-tidy doesn't exist).
 
     Expected result: issues is None
     """
-    mock_subprocess_check_output.side_effect = OSError("mocked error")
+    mock_subprocess_popen.side_effect = OSError("mocked error")
     cttp = setup_clang_tidy_tool_plugin()
     with TemporaryDirectory() as bin_dir:
         package = Package(
@@ -314,16 +324,14 @@ def test_clang_tidy_tool_plugin_scan_oserror(mock_subprocess_check_output):
     assert issues is None
 
 
-@mock.patch("statick_tool.plugins.tool.clang_tidy_tool_plugin.subprocess.check_output")
-def test_clang_tidy_tool_plugin_scan_calledprocesserror(mock_subprocess_check_output):
+@mock.patch("statick_tool.tool_process.subprocess.Popen")
+def test_clang_tidy_tool_plugin_scan_calledprocesserror(mock_subprocess_popen):
     """
-    Test what happens when a CalledProcessError is raised (usually means clang-tidy hit an error).
+    Test what happens when clang-tidy exits with an error.
 
     Expected result: issues is None
     """
-    mock_subprocess_check_output.side_effect = subprocess.CalledProcessError(
-        2, "", output="mocked error"
-    )
+    mock_subprocess_popen.return_value = mock_process("mocked error\n", 2)
     cttp = setup_clang_tidy_tool_plugin()
     with TemporaryDirectory() as bin_dir:
         package = Package(
@@ -340,14 +348,14 @@ def test_clang_tidy_tool_plugin_scan_calledprocesserror(mock_subprocess_check_ou
     assert issues is None
 
 
-@mock.patch("statick_tool.plugins.tool.clang_tidy_tool_plugin.subprocess.check_output")
-def test_clang_tidy_tool_plugin_scan_diagnosticerror(mock_subprocess_check_output):
+@mock.patch("statick_tool.tool_process.subprocess.Popen")
+def test_clang_tidy_tool_plugin_scan_diagnosticerror(mock_subprocess_popen):
     """
-    Test that a CalledProcessError is raised when subprocess's output contains 'clang-diagnostic-error'.
+    Test that the scan fails when clang-tidy's output contains 'clang-diagnostic-error'.
 
     Expected result: issues is None
     """
-    mock_subprocess_check_output.return_value = "clang-diagnostic-error"
+    mock_subprocess_popen.return_value = mock_process("clang-diagnostic-error\n", 0)
     cttp = setup_clang_tidy_tool_plugin()
     with TemporaryDirectory() as bin_dir:
         package = Package(
@@ -400,3 +408,153 @@ def test_checkforexceptions_false():
         lambda i: "test.cpp" if i == 1 else "some-other-error" if i == 6 else False
     )
     assert not ClangTidyToolPlugin.check_for_exceptions(mm)
+
+
+@mock.patch("statick_tool.tool_process.subprocess.Popen")
+def test_clang_tidy_tool_plugin_scan_streamed_output(mock_subprocess_popen):
+    """
+    Test that issues are parsed from clang-tidy output as it is read.
+
+    Expected result: issues are found and the output is written to the log
+    """
+    output = (
+        "valid_package/test.c:1:10: warning: Unused variable [misc-unused]\n"
+        "valid_package/test.c:2:10: note: A note [misc-unused]\n"
+        "valid_package/test.c:3:10: warning: Unused variable [misc-unused]\n"
+    )
+    mock_subprocess_popen.return_value = mock_process(output, 1)
+    cttp = setup_clang_tidy_tool_plugin()
+    with TemporaryDirectory() as bin_dir:
+        package = Package(
+            "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+        )
+        package["make_targets"] = [
+            {
+                "src": [
+                    os.path.join(os.path.dirname(__file__), "valid_package", "test.c")
+                ]
+            }
+        ]
+        package["bin_dir"] = bin_dir
+        package["src_dir"] = os.path.join(os.path.dirname(__file__), "valid_package")
+        cwd = os.getcwd()
+        os.chdir(bin_dir)
+        try:
+            issues = cttp.scan(package, "level")
+            with open("clang-tidy.log") as log:
+                assert log.read() == output
+        finally:
+            os.chdir(cwd)
+    assert [issue.line_number for issue in issues] == ["1", "3"]
+
+
+@mock.patch("statick_tool.tool_process.subprocess.Popen")
+def test_clang_tidy_tool_plugin_scan_compile_commands(mock_subprocess_popen):
+    """
+    Test that clang-tidy uses the compilation database of an existing build.
+
+    Expected result: -p names the directory of the compilation database
+    """
+    mock_subprocess_popen.return_value = mock_process("", 0)
+    cttp = setup_clang_tidy_tool_plugin()
+    with TemporaryDirectory() as bin_dir:
+        package = Package(
+            "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+        )
+        package["make_targets"] = [
+            {
+                "src": [
+                    os.path.join(os.path.dirname(__file__), "valid_package", "test.c")
+                ]
+            }
+        ]
+        package["bin_dir"] = bin_dir
+        package["src_dir"] = os.path.join(os.path.dirname(__file__), "valid_package")
+        package["compile_commands"] = os.path.join(
+            bin_dir, "build", "compile_commands.json"
+        )
+        assert cttp.scan(package, "level") == []
+    command = mock_subprocess_popen.call_args[0][0]
+    assert command[command.index("-p") + 1] == os.path.join(bin_dir, "build")
+
+
+def test_clang_tidy_tool_plugin_get_shards():
+    """Test splitting files between clang-tidy processes."""
+    files = ["a.c", "b.c", "c.c", "d.c", "e.c"]
+    assert ClangTidyToolPlugin.get_shards(files, 1) == [files]
+    assert ClangTidyToolPlugin.get_shards(files, 2) == [
+        ["a.c", "b.c", "c.c"],
+        ["d.c", "e.c"],
+    ]
+    assert ClangTidyToolPlugin.get_shards(files[:2], 4) == [["a.c"], ["b.c"]]
+    assert ClangTidyToolPlugin.get_shards([], 4) == [[]]
+
+
+def setup_sharded_scan(mock_subprocess_popen, outputs):
+    """Mock clang-tidy processes that print outputs by source file, and scan."""
+
+    def popen(command, **_):
+        return mock_process(*outputs[command[-1]])
+
+    mock_subprocess_popen.side_effect = popen
+    cttp = setup_clang_tidy_tool_plugin()
+    cttp.plugin_context.args.clang_tidy_jobs = 2
+    with TemporaryDirectory() as bin_dir:
+        package = Package(
+            "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+        )
+        package["make_targets"] = [{"src": sorted(outputs)}]
+        package["bin_dir"] = bin_dir
+        package["src_dir"] = os.path.join(os.path.dirname(__file__), "valid_package")
+        cwd = os.getcwd()
+        os.chdir(bin_dir)
+        try:
+            issues = cttp.scan(package, "level")
+            with open("clang-tidy.log") as log:
+                output = log.read()
+        finally:
+            os.chdir(cwd)
+    return issues, output
+
+
+@mock.patch("statick_tool.tool_process.subprocess.Popen")
+def test_clang_tidy_tool_plugin_scan_sharded(mock_subprocess_popen):
+    """
+    Test running clang-tidy on shards of the source files at the same time.
+
+    Expected result: issues from all shards are found in order, header issues
+    found by several shards are reported once, and the shard logs are combined
+    """
+    header = "valid_package/test.h:1:10: warning: Header issue [misc-header]\n"
+    outputs = {
+        "a.c": (
+            header + "valid_package/a.c:2:10: warning: Unused variable [misc-unused]\n",
+            1,
+        ),
+        "b.c": (
+            header + "valid_package/b.c:3:10: warning: Unused variable [misc-unused]\n",
+            0,
+        ),
+    }
+    issues, output = setup_sharded_scan(mock_subprocess_popen, outputs)
+    assert [(issue.filename, issue.line_number) for issue in issues] == [
+        ("valid_package/test.h", "1"),
+        ("valid_package/a.c", "2"),
+        ("valid_package/b.c", "3"),
+    ]
+    assert output == outputs["a.c"][0] + outputs["b.c"][0]
+
+
+@mock.patch("statick_tool.tool_process.subprocess.Popen")
+def test_clang_tidy_tool_plugin_scan_sharded_diagnosticerror(mock_subprocess_popen):
+    """
+    Test that a clang-diagnostic-error in any shard fails the scan.
+
+    Expected result: issues is None
+    """
+    outputs = {
+        "a.c": ("valid_package/a.c:2:10: warning: Unused [misc-unused]\n", 0),
+        "b.c": ("valid_package/b.c:3:10: error: Bad [clang-diagnostic-error]\n", 0),
+    }
+    issues, _ = setup_sharded_scan(mock_subprocess_popen, outputs)
+    assert issues is None
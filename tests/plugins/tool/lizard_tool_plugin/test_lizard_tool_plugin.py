@@ -162,3 +162,34 @@ def test_lizard_tool_plugin_scan_calledprocesserror(mock_subprocess_check_output
     package["src_dir"] = os.path.join(os.path.dirname(__file__), "valid_package")
     issues = ltp.scan(package, "level")
     assert issues is None
+
+
+@mock.patch("statick_tool.plugins.tool.lizard_tool_plugin.subprocess.check_output")
+def test_lizard_tool_plugin_scan_changed_files(mock_subprocess_check_output):
+    """
+    Test scanning only the files changed in git.
+
+    Expected result: lizard runs on the changed source files of the package,
+    and doesn't run when none of them changed
+    """
+    mock_subprocess_check_output.return_value = ""
+    ltp = setup_lizard_tool_plugin()
+    package_path = os.path.realpath(
+        os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    package = Package("valid_package", package_path)
+    source = os.path.join(package_path, "test.c")
+    package.changed_files = {
+        source,
+        os.path.join(package_path, "CMakeLists.txt"),
+        os.path.join(os.path.dirname(package_path), "other.c"),
+    }
+    assert ltp.inputs_changed(package)
+    assert ltp.scan(package, "level") == []
+    assert mock_subprocess_check_output.call_args[0][0] == ["lizard", "-w", source]
+
+    mock_subprocess_check_output.reset_mock()
+    package.changed_files = {os.path.join(package_path, "CMakeLists.txt")}
+    assert not ltp.inputs_changed(package)
+    assert ltp.scan(package, "level") == []
+    assert not mock_subprocess_check_output.called
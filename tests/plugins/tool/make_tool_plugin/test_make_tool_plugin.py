@@ -1,7 +1,9 @@
 """Unit tests for the make tool plugin."""
 import argparse
+import io
 import os
 import subprocess
+from tempfile import TemporaryDirectory
 
 import mock
 import pytest
@@ -9,6 +11,8 @@ from yapsy.PluginManager import PluginManager
 
 import statick_tool
 from statick_tool.config import Config
+from statick_tool.issue import Issue
+from statick_tool.job_server import JobServer
 from statick_tool.package import Package
 from statick_tool.plugin_context import PluginContext
 from statick_tool.plugins.tool.make_tool_plugin import MakeToolPlugin
@@ -200,6 +204,23 @@ def test_make_tool_plugin_parse_warnings_mapping():
     assert issues[0].cert_reference == "OOP53-CPP"
 
 
+@mock.patch("statick_tool.plugins.tool.make_tool_plugin.subprocess.check_output")
+def test_make_tool_plugin_scan_prebuilt(mock_subprocess_check_output):
+    """
+    Test that packages found in an existing build aren't built again.
+
+    Expected result: make doesn't run and no issues are found
+    """
+    mtp = setup_make_tool_plugin()
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    package["make_targets"] = "make_targets"
+    package["cmake_prebuilt"] = True
+    assert mtp.scan(package, "level") == []
+    assert not mock_subprocess_check_output.called
+
+
 @mock.patch("statick_tool.plugins.tool.make_tool_plugin.subprocess.check_output")
 def test_make_tool_plugin_scan_calledprocesserror(mock_subprocess_check_output):
     """
@@ -234,3 +255,182 @@ def test_make_tool_plugin_scan_oserror(mock_subprocess_check_output):
     package["make_targets"] = "make_targets"
     issues = mtp.scan(package, "level")
     assert issues is None
+
+
+def test_make_tool_plugin_parse_lines():
+    """Verify that make output is parsed one line at a time."""
+    mtp = setup_make_tool_plugin()
+    package = Package("valid_package", "/home/user/valid_package")
+    lines = iter(
+        [
+            "/home/user/valid_package/hello.c:7:3: warning: overloaded-virtual: ",
+            "/home/user/valid_package/hello.c:7:3: warning: second line",
+            "/home/user/valid_package/hello.c:8:3: warning: unused [-Wunused]",
+            "/home/user/valid_package/hello.c:8:3: warning: unused [-Wunused]",
+            "/home/user/valid_package/hello.c:9:3: warning: overloaded-virtual: ",
+        ]
+    )
+    issues = mtp.parse_lines(package, lines)
+    assert [(issue.line_number, issue.message) for issue in issues] == [
+        ("7", "overloaded-virtual: second line"),
+        ("8", "unused [-Wunused]"),
+        ("9", "overloaded-virtual: "),
+    ]
+
+
+@mock.patch("statick_tool.tool_process.subprocess.Popen")
+@mock.patch("statick_tool.plugins.tool.make_tool_plugin.subprocess.check_output")
+def test_make_tool_plugin_scan_make_failed(
+    mock_subprocess_check_output, mock_subprocess_popen
+):
+    """
+    Test what happens when make exits with an error.
+
+    Expected result: issues is None
+    """
+    mock_subprocess_check_output.return_value = ""
+    process = mock.MagicMock()
+    process.stdout = io.StringIO("hello.c:7:3: error: expected ;\n")
+    process.poll.return_value = 2
+    process.wait.return_value = 2
+    mock_subprocess_popen.return_value = process
+    mtp = setup_make_tool_plugin()
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    package["make_targets"] = "make_targets"
+    issues = mtp.scan(package, "level")
+    assert issues is None
+
+
+@mock.patch("statick_tool.job_server.get_make_version")
+@mock.patch("statick_tool.plugins.tool.make_tool_plugin.get_make_version")
+@mock.patch("statick_tool.plugins.tool.make_tool_plugin.get_job_server")
+@mock.patch("statick_tool.tool_process.subprocess.Popen")
+@mock.patch("statick_tool.plugins.tool.make_tool_plugin.subprocess.check_output")
+def test_make_tool_plugin_scan_job_server(
+    mock_subprocess_check_output,
+    mock_subprocess_popen,
+    mock_get_job_server,
+    mock_get_make_version,
+    mock_job_server_make_version,
+):
+    """
+    Test that make builds in parallel when there is a job budget.
+
+    Expected result: make takes its jobs from the job server and syncs the
+    output of each target
+    """
+    mock_get_make_version.return_value = (4, 3)
+    mock_job_server_make_version.return_value = (4, 3)
+    mock_subprocess_check_output.return_value = ""
+    process = mock.MagicMock()
+    process.stdout = io.StringIO("")
+    process.poll.return_value = 0
+    process.wait.return_value = 0
+    mock_subprocess_popen.return_value = process
+    mock_get_job_server.return_value = JobServer(10, 11)
+    mtp = setup_make_tool_plugin()
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    package["make_targets"] = "make_targets"
+    assert mtp.scan(package, "level") == []
+    command = mock_subprocess_popen.call_args[0][0]
+    kwargs = mock_subprocess_popen.call_args[1]
+    assert command == ["make", "statick_cmake_target", "--output-sync=target"]
+    assert kwargs["pass_fds"] == (10, 11)
+    assert kwargs["env"]["MAKEFLAGS"].endswith("-j --jobserver-auth=10,11")
+
+
+@mock.patch("statick_tool.job_server.get_make_version")
+@mock.patch("statick_tool.plugins.tool.make_tool_plugin.get_make_version")
+@mock.patch("statick_tool.plugins.tool.make_tool_plugin.get_job_server")
+@mock.patch("statick_tool.tool_process.subprocess.Popen")
+@mock.patch("statick_tool.plugins.tool.make_tool_plugin.subprocess.check_output")
+def test_make_tool_plugin_scan_job_server_old_make(
+    mock_subprocess_check_output,
+    mock_subprocess_popen,
+    mock_get_job_server,
+    mock_get_make_version,
+    mock_job_server_make_version,
+):
+    """
+    Test building in parallel with a make older than 4.0.
+
+    Expected result: make takes its jobs from the job server without the
+    output sync option it doesn't support
+    """
+    mock_get_make_version.return_value = (3, 81)
+    mock_job_server_make_version.return_value = (3, 81)
+    mock_subprocess_check_output.return_value = ""
+    process = mock.MagicMock()
+    process.stdout = io.StringIO("")
+    process.poll.return_value = 0
+    process.wait.return_value = 0
+    mock_subprocess_popen.return_value = process
+    mock_get_job_server.return_value = JobServer(10, 11)
+    mtp = setup_make_tool_plugin()
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    package["make_targets"] = "make_targets"
+    assert mtp.scan(package, "level") == []
+    command = mock_subprocess_popen.call_args[0][0]
+    kwargs = mock_subprocess_popen.call_args[1]
+    assert command == ["make", "statick_cmake_target"]
+    assert kwargs["env"]["MAKEFLAGS"].endswith("-j --jobserver-fds=10,11")
+
+
+def test_make_tool_plugin_parse_lines_objects():
+    """Verify that issues are grouped by the object file being built."""
+    mtp = setup_make_tool_plugin()
+    package = Package("valid_package", "/home/user/valid_package")
+    lines = [
+        "[ 25%] Building C object build/CMakeFiles/hello.dir/a.c.o",
+        "/home/user/valid_package/a.c:1:3: warning: a [-Wa]",
+        "/home/user/valid_package/hello.h:1:3: warning: header [-Wh]",
+        "[ 50%] Building C object build/CMakeFiles/hello.dir/b.c.o",
+        "/home/user/valid_package/hello.h:1:3: warning: header [-Wh]",
+        "[ 75%] Building C object build/CMakeFiles/hello.dir/c.c.o",
+        "[100%] Linking C executable hello",
+    ]
+    objects = {}
+    issues = mtp.parse_lines(package, lines, objects)
+    assert [issue.message for issue in issues] == ["a [-Wa]", "header [-Wh]"]
+    assert {name: [issue.message for issue in objects[name]] for name in objects} == {
+        "build/CMakeFiles/hello.dir/a.c.o": ["a [-Wa]", "header [-Wh]"],
+        "build/CMakeFiles/hello.dir/b.c.o": ["header [-Wh]"],
+        "build/CMakeFiles/hello.dir/c.c.o": [],
+    }
+
+
+def test_make_tool_plugin_replay_warnings():
+    """Verify that warnings for objects that weren't rebuilt are replayed."""
+    mtp = setup_make_tool_plugin()
+
+    def make_issue(filename):
+        return Issue(filename, "1", "make", "-Wa", "3", "a [-Wa]", None)
+
+    with TemporaryDirectory() as build_dir:
+        for name in ["a.c.o", "b.c.o", "c.c.o"]:
+            with open(os.path.join(build_dir, name), "w"):
+                pass
+        objects = {
+            "a.c.o": [make_issue("a.c")],
+            "b.c.o": [make_issue("b.c")],
+            "c.c.o": [],
+        }
+        issues = [make_issue("a.c"), make_issue("b.c")]
+        assert mtp.replay_warnings(build_dir, issues, objects) == issues
+
+        # Nothing was rebuilt.
+        assert mtp.replay_warnings(build_dir, [], {}) == issues
+
+        # Only b.c was rebuilt, and it no longer has warnings.
+        issues = mtp.replay_warnings(build_dir, [], {"b.c.o": []})
+        assert issues == [make_issue("a.c")]
+
+        # The object for a.c was removed, so its warnings are dropped.
+        os.remove(os.path.join(build_dir, "a.c.o"))
+        assert not mtp.replay_warnings(build_dir, [], {})
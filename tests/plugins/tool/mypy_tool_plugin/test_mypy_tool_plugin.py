@@ -153,3 +153,26 @@ def test_mypy_tool_plugin_scan_calledprocesserror(mock_subprocess_check_output):
     ]
     issues = mtp.scan(package, "level")
     assert not issues
+
+
+@mock.patch("statick_tool.plugins.tool.mypy_tool_plugin.subprocess.check_output")
+def test_mypy_tool_plugin_scan_blocking_error(mock_subprocess_check_output):
+    """
+    Test what happens when mypy reports a blocking error for a batch of files.
+
+    Expected result: each file in the batch is checked on its own
+    """
+    mock_subprocess_check_output.side_effect = [
+        subprocess.CalledProcessError(2, "", output="Duplicate module named 'a'"),
+        "/tmp/a/a.py:1: error: Name 'x' is not defined [name-defined]\n",
+        "/tmp/b/a.py:2: error: Name 'y' is not defined [name-defined]\n",
+    ]
+    mtp = setup_mypy_tool_plugin()
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    package["python_src"] = ["/tmp/a/a.py", "/tmp/b/a.py"]
+    mtp.scan(package, "level")
+    assert mock_subprocess_check_output.call_count == 3
+    assert mock_subprocess_check_output.call_args_list[1][0][0][1] == "/tmp/a/a.py"
+    assert mock_subprocess_check_output.call_args_list[2][0][0][1] == "/tmp/b/a.py"
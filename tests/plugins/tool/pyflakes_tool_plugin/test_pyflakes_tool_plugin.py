@@ -112,6 +112,26 @@ def test_pyflakes_tool_plugin_parse_valid():
     assert issues[0].severity == "5"
 
 
+def test_pyflakes_tool_plugin_split_output_by_file():
+    """Verify that output from several files is attributed to the right file."""
+    pftp = setup_pyflakes_tool_plugin()
+    output = (
+        "b.py:39:34: invalid syntax\n"
+        "print 'No files in %s' % (source_dir)\n"
+        "a.py:4:1 'os' imported but unused\n"
+        "b.py:1:1 'sys' imported but unused\n"
+    )
+    split_output = pftp.split_output_by_file(output, ["a.py", "b.py"])
+    assert len(split_output) == 2
+    assert split_output[0].startswith("b.py:39:34: invalid syntax\nprint")
+    assert "b.py:1:1" in split_output[0]
+    assert split_output[1] == "a.py:4:1 'os' imported but unused\n"
+    issues = pftp.parse_output(split_output)
+    assert len(issues) == 2
+    assert issues[0].filename == "b.py"
+    assert issues[1].filename == "a.py"
+
+
 def test_pyflakes_tool_plugin_parse_invalid():
     """Verify that we can parse the normal output of pyflakes."""
     pftp = setup_pyflakes_tool_plugin()
@@ -150,3 +150,23 @@ def test_pylint_tool_plugin_scan_oserror(mock_subprocess_check_output):
     ]
     issues = pltp.scan(package, "level")
     assert issues is None
+
+
+@mock.patch("statick_tool.plugins.tool.pylint_tool_plugin.subprocess.check_output")
+def test_pylint_tool_plugin_scan_duplicate_code(mock_subprocess_check_output):
+    """
+    Test that checks across files are disabled.
+
+    Expected result: pylint is run with duplicate-code disabled
+    """
+    mock_subprocess_check_output.return_value = ""
+    pltp = setup_pylint_tool_plugin()
+    pltp.plugin_context.args.no_cache = True
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    package["python_src"] = [
+        os.path.join(os.path.dirname(__file__), "valid_package", "basic.py")
+    ]
+    assert pltp.scan(package, "level") == []
+    assert "--disable=duplicate-code" in mock_subprocess_check_output.call_args[0][0]
@@ -242,3 +242,30 @@ def test_uncrustify_tool_plugin_scan_calledprocesserror(mock_subprocess_check_ou
     package["uncrustify"] = "uncrustify"
     issues = utp.scan(package, "level")
     assert issues is None
+
+
+@mock.patch("statick_tool.plugins.tool.uncrustify_tool_plugin.subprocess.check_output")
+def test_uncrustify_tool_plugin_scan_mismatch(mock_subprocess_check_output):
+    """
+    Test comparing uncrustify output with the original files.
+
+    Expected result: only the file that uncrustify changed is reported, and
+    uncrustify is the only process run for each file
+    """
+    src_dir = os.path.join(os.path.dirname(__file__), "valid_package")
+    with open(os.path.join(src_dir, "test.c")) as fname:
+        formatted = fname.read()
+    with open(os.path.join(src_dir, "CMakeLists.txt")) as fname:
+        unformatted = "changed\n" + fname.read()
+    outputs = {"test.c": formatted, "CMakeLists.txt": unformatted}
+    mock_subprocess_check_output.side_effect = lambda cmd, **_: outputs[
+        os.path.basename(cmd[-1])
+    ]
+    utp = setup_uncrustify_tool_plugin()
+    package = Package("valid_package", src_dir)
+    files = [os.path.join(src_dir, name) for name in ["test.c", "CMakeLists.txt"]]
+    package["make_targets"] = [{"src": files}]
+    package["headers"] = []
+    issues = utp.scan(package, "level")
+    assert [issue.filename for issue in issues] == [files[1]]
+    assert mock_subprocess_check_output.call_count == 2
@@ -3,8 +3,12 @@
 import os
 import tempfile
 
+import mock
+import pytest
+import yaml
+
 import statick_tool
-from statick_tool.resources import Resources
+from statick_tool.resources import Resources, clear_cache, load_mapping, load_yaml
 
 try:
     from tempfile import TemporaryDirectory
@@ -126,3 +130,88 @@ def test_resources_get_file_doesnt_exist():
         resources = Resources([tmp_dir])
         os.mkdir(os.path.join(tmp_dir, "rsc"))
         assert resources.get_file("nope") is None
+
+
+def test_resources_load_yaml_cached():
+    """
+    Test that YAML files are parsed once until they change.
+
+    Expected results: unchanged files are not parsed again, changed files are,
+    and callers can't change each other's data
+    """
+    with TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "profile.yaml")
+        with open(filename, "w") as fname:
+            fname.write("default: sei_cert\n")
+        data = load_yaml(filename)
+        assert data == {"default": "sei_cert"}
+        data["default"] = "changed"
+
+        with mock.patch("statick_tool.resources.yaml.load") as load:
+            assert load_yaml(filename) == {"default": "sei_cert"}
+            assert not load.called
+
+        with open(filename, "w") as fname:
+            fname.write("default: objective_minus_pylint\n")
+        os.utime(filename, ns=(0, 0))
+        assert load_yaml(filename) == {"default": "objective_minus_pylint"}
+        clear_cache()
+
+
+def test_resources_load_yaml_replaced():
+    """
+    Test that a file replaced by another one with the same times is parsed again.
+
+    Expected results: the contents of the file that was opened are returned
+    """
+    with TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "profile.yaml")
+        with open(filename, "w") as fname:
+            fname.write("default: sei_cert_a\n")
+        os.utime(filename, ns=(0, 0))
+        assert load_yaml(filename) == {"default": "sei_cert_a"}
+
+        replacement = os.path.join(tmp_dir, "replacement.yaml")
+        with open(replacement, "w") as fname:
+            fname.write("default: sei_cert_b\n")
+        os.utime(replacement, ns=(0, 0))
+        os.replace(replacement, filename)
+        assert load_yaml(filename) == {"default": "sei_cert_b"}
+        clear_cache()
+
+
+def test_resources_load_yaml_invalid():
+    """
+    Test that files that fail to parse are not cached.
+
+    Expected results: yaml.YAMLError is raised each time
+    """
+    with TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "bad.yaml")
+        with open(filename, "w") as fname:
+            fname.write("default: [sei_cert\n")
+        for _ in range(2):
+            with pytest.raises(yaml.YAMLError):
+                load_yaml(filename)
+
+
+def test_resources_load_mapping_cached():
+    """
+    Test that mapping files are parsed once until they change.
+
+    Expected results: invalid lines are skipped and each caller gets its own mapping
+    """
+    with TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "tool.txt")
+        with open(filename, "w") as fname:
+            fname.write("a:TST1-NO\ninvalid\n")
+        mapping = load_mapping(filename)
+        assert mapping == {"a": "TST1-NO"}
+        mapping["b"] = "TST2-NO"
+        assert load_mapping(filename) == {"a": "TST1-NO"}
+
+        with open(filename, "w") as fname:
+            fname.write("b:TST2-NO\n")
+        os.utime(filename, ns=(0, 0))
+        assert load_mapping(filename) == {"b": "TST2-NO"}
+        clear_cache()
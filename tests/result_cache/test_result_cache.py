@@ -0,0 +1,169 @@
+"""Tests for statick_tool.result_cache."""
+import os
+import tempfile
+
+import mock
+import pytest
+
+from statick_tool.issue import Issue
+from statick_tool.result_cache import CachedScan, ResultCache, hash_file
+
+
+def make_issue(filename, line="1"):
+    """Make an issue for a file."""
+    return Issue(filename, line, "tool", "type", "5", "message", None)
+
+
+@pytest.fixture
+def cache_dir():
+    """Create a directory for the cache and files to scan."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in ["a.py", "b.py"]:
+            with open(os.path.join(tmp_dir, name), "w") as fid:
+                fid.write(name)
+        yield tmp_dir
+
+
+def test_result_cache_put_get(cache_dir):
+    """Test that stored issues can be read back."""
+    cache = ResultCache(os.path.join(cache_dir, "cache"))
+    issues = [make_issue("a.py"), make_issue("a.py", "2")]
+    assert cache.get("abcdef") is None
+    cache.put("abcdef", issues)
+    assert cache.get("abcdef") == issues
+    cache.put("abcdef", [])
+    assert cache.get("abcdef") == []
+
+
+def test_result_cache_get_invalid(cache_dir):
+    """Test that invalid entries are treated as missing."""
+    cache = ResultCache(os.path.join(cache_dir, "cache"))
+    os.makedirs(os.path.dirname(cache.get_path("abcdef")))
+    with open(cache.get_path("abcdef"), "w") as fid:
+        fid.write("not json")
+    assert cache.get("abcdef") is None
+
+
+def test_result_cache_prune(cache_dir):
+    """Test that the least recently used entries are removed first."""
+    cache = ResultCache(os.path.join(cache_dir, "cache"))
+    for i, key in enumerate(["aa1", "bb2", "cc3"]):
+        cache.put(key, [make_issue("a.py")])
+        os.utime(cache.get_path(key), (i, i))
+    entry_size = os.path.getsize(cache.get_path("aa1"))
+    # Reading an entry marks it as recently used.
+    assert cache.get("aa1") is not None
+
+    cache.max_size = 2 * entry_size
+    cache.prune()
+    assert cache.get("aa1") is not None
+    assert cache.get("bb2") is None
+    assert cache.get("cc3") is not None
+    assert cache.read_size() == 2 * entry_size
+
+
+def test_result_cache_prune_if_full(cache_dir, monkeypatch):
+    """Test that the cache is only walked when its estimated size is too large."""
+    monkeypatch.setattr("statick_tool.result_cache.WRITTEN_SIZES", {})
+    cache = ResultCache(os.path.join(cache_dir, "cache"))
+    cache.put("aa1", [make_issue("a.py")])
+    entry_size = os.path.getsize(cache.get_path("aa1"))
+    cache.max_size = 3 * entry_size
+    # Without a recorded size, the cache is walked to find it.
+    cache.prune_if_full()
+    assert cache.read_size() == entry_size
+
+    with mock.patch.object(ResultCache, "prune") as prune:
+        cache.prune_if_full()
+        cache.put("bb2", [make_issue("a.py")])
+        cache.prune_if_full()
+        assert not prune.called
+        assert cache.read_size() == 2 * entry_size
+
+        cache.put("cc3", [make_issue("a.py")])
+        cache.put("dd4", [make_issue("a.py")])
+        cache.prune_if_full()
+        assert prune.called
+
+
+def test_result_cache_unwritable(cache_dir, monkeypatch, capsys):
+    """Test that a cache that can't be written to is reported once."""
+    monkeypatch.setattr("statick_tool.result_cache.UNWRITABLE_DIRECTORIES", set())
+    with open(os.path.join(cache_dir, "cache"), "w") as fid:
+        fid.write("not a directory")
+    cache = ResultCache(os.path.join(cache_dir, "cache"))
+    cache.put("aa1", [make_issue("a.py")])
+    cache.put("bb2", [make_issue("a.py")])
+    assert cache.get("aa1") is None
+    assert capsys.readouterr().out.count("Unable to write to result cache") == 1
+
+
+def test_result_cache_get_key(cache_dir):
+    """Test that keys change when anything that affects the results changes."""
+    path = os.path.join(cache_dir, "a.py")
+    config = os.path.join(cache_dir, "b.py")
+    key = ResultCache.get_key("tool", "1.0", ["--rcfile=" + config], "level", path)
+    assert key == ResultCache.get_key(
+        "tool", "1.0", ["--rcfile=" + config], "level", path
+    )
+    assert key != ResultCache.get_key(
+        "other", "1.0", ["--rcfile=" + config], "level", path
+    )
+    assert key != ResultCache.get_key(
+        "tool", "2.0", ["--rcfile=" + config], "level", path
+    )
+    assert key != ResultCache.get_key("tool", "1.0", [], "level", path)
+    assert key != ResultCache.get_key(
+        "tool", "1.0", ["--rcfile=" + config], "other", path
+    )
+    assert key != ResultCache.get_key(
+        "tool", "1.0", ["--rcfile=" + config], "level", None
+    )
+
+    with open(config, "a") as fid:
+        fid.write("changed")
+    assert key != ResultCache.get_key(
+        "tool", "1.0", ["--rcfile=" + config], "level", path
+    )
+    new_key = ResultCache.get_key("tool", "1.0", ["--rcfile=" + config], "level", path)
+    with open(path, "a") as fid:
+        fid.write("changed")
+    assert new_key != ResultCache.get_key(
+        "tool", "1.0", ["--rcfile=" + config], "level", path
+    )
+
+    assert ResultCache.get_key("tool", "1.0", [], "level", "/nonexistent") is None
+    assert hash_file("/nonexistent") is None
+
+
+def test_cached_scan_no_cache():
+    """Test that all files are scanned without a cache."""
+    issues = [make_issue("b.py"), make_issue("a.py")]
+    cached_scan = CachedScan(["a.py", "b.py"])
+    assert cached_scan.files_to_scan == ["a.py", "b.py"]
+    assert cached_scan.merge(issues) == issues
+
+
+def test_cached_scan(cache_dir):
+    """Test that only files without cached results are scanned."""
+    cache = ResultCache(os.path.join(cache_dir, "cache"))
+    files = [os.path.join(cache_dir, name) for name in ["a.py", "b.py"]]
+    keys = {path: path[-4] + "0" * 10 for path in files}
+    run_issue = make_issue("Command line")
+
+    cached_scan = CachedScan(files, cache, keys, "run")
+    assert cached_scan.files_to_scan == files
+    issues = cached_scan.merge([make_issue(files[1]), run_issue, make_issue(files[0])])
+    assert issues == [make_issue(files[0]), make_issue(files[1]), run_issue]
+
+    # Nothing has to be scanned, and all issues come from the cache.
+    cached_scan = CachedScan(files, cache, keys, "run")
+    assert not cached_scan.files_to_scan
+    assert cached_scan.merge([]) == issues
+
+    # Only the file with a new key is scanned.
+    keys[files[1]] = "c" + "0" * 10
+    cached_scan = CachedScan(files, cache, keys, "run")
+    assert cached_scan.files_to_scan == [files[1]]
+    assert cached_scan.merge([]) == [make_issue(files[0])]
+    assert cache.get(keys[files[1]]) == []
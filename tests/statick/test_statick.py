@@ -11,7 +11,9 @@ import pytest
 
 from statick_tool.args import Args
 from statick_tool.plugins.tool.clang_tidy_tool_plugin import ClangTidyToolPlugin
-from statick_tool.statick import Statick
+from statick_tool.statick import Statick, init_package_worker, scan_package_worker
+from statick_tool.timings import read_timings
+from statick_tool.tool_plugin import ToolPlugin
 
 
 # From https://stackoverflow.com/questions/2059482/python-temporarily-modify-the-current-processs-environment
@@ -73,6 +75,7 @@ def test_gather_args(init_statick):
     parsed_args = args.get_args(sys.argv)
     assert "path" in parsed_args
     assert "output_directory" in parsed_args
+    assert parsed_args.jobs == (os.cpu_count() or 1)
 
 
 # The Profile module has more in-depth test cases, this test module is just
@@ -261,6 +264,46 @@ def test_run():
         print("Error: {}".format(ex))
 
 
+def test_run_timings(tmpdir):
+    """
+    Test writing the timings and profile of a scan.
+
+    Expected result: each phase is measured and written, and a profile is dumped
+    """
+    args = Args("Statick tool")
+    args.parser.add_argument("--path", help="Path of package to scan")
+
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    timings_output = tmpdir.join("timings.jsonl").strpath
+    sys.argv = [
+        "--output-directory",
+        tmpdir.strpath,
+        "--path",
+        os.path.dirname(__file__),
+        "--force-tool-list",
+        "bandit",
+        "--timings-output",
+        timings_output,
+        "--cprofile-directory",
+        tmpdir.strpath,
+    ]
+    parsed_args = args.get_args(sys.argv)
+    path = parsed_args.path
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+    issues, _ = statick.run(path, parsed_args)
+    assert issues is not None
+
+    timings = read_timings(timings_output)
+    assert timings == statick.timings.get_timings()
+    assert [timing.name for timing in timings if timing.phase == "tool"] == ["bandit"]
+    assert "discovery" in [timing.phase for timing in timings]
+    assert "reporting" in [timing.phase for timing in timings]
+    assert (timings[-1].package, timings[-1].phase) == ("statick", "package")
+    assert os.path.isfile(tmpdir.join("statick.prof").strpath)
+
+
 def test_run_missing_path(init_statick):
     """Test running Statick against a package that does not exist."""
     args = Args("Statick tool")
@@ -353,6 +396,58 @@ def test_run_force_tool_list(init_statick):
         print("Error: {}".format(ex))
 
 
+@mock.patch("statick_tool.statick.ResultCache.prune_if_full")
+def test_run_prunes_cache(mock_prune_if_full, tmpdir):
+    """Test that the result cache is checked for pruning unless it is disabled."""
+    args = Args("Statick tool")
+    args.parser.add_argument("--path", help="Path of package to scan")
+
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    argv = [
+        "--path",
+        os.path.dirname(__file__),
+        "--force-tool-list",
+        "bandit",
+        "--cache-directory",
+        tmpdir.strpath,
+    ]
+    for no_cache in [False, True]:
+        mock_prune_if_full.reset_mock()
+        parsed_args = args.get_args(argv + (["--no-cache"] if no_cache else []))
+        statick.get_config(parsed_args)
+        statick.get_exceptions(parsed_args)
+        issues, _ = statick.run(parsed_args.path, parsed_args)
+        assert issues is not None
+        assert mock_prune_if_full.called != no_cache
+
+
+def test_run_changed_since_invalid_ref(tmpdir):
+    """Test that a failed scan changes back to the original working directory."""
+    args = Args("Statick tool")
+    args.parser.add_argument("--path", help="Path of package to scan")
+
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    parsed_args = args.get_args(
+        [
+            "--path",
+            os.path.dirname(__file__),
+            "--output-directory",
+            tmpdir.strpath,
+            "--changed-since",
+            "no-such-ref",
+        ]
+    )
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+    cwd = os.getcwd()
+    issues, success = statick.run(parsed_args.path, parsed_args)
+    assert issues is None
+    assert not success
+    assert os.getcwd() == cwd
+
+
 def test_run_package_is_ignored(init_statick):
     """
     Test that ignored package is ignored.
@@ -689,8 +784,8 @@ def test_run_file_cmd_does_not_exist(init_statick):
     """
     Test when file command does not exist.
 
-    Expected results: no issues found even though Python file without extension does
-    have issues
+    Expected results: no issues found and no errors, since discovery doesn't need the
+    file command
     """
     with modified_environ(PATH=""):
         args = Args("Statick tool")
@@ -752,3 +847,172 @@ def test_run_called_process_error(mock_subprocess_check_output):
         shutil.rmtree(os.path.join(os.path.dirname(__file__), "statick-sei_cert"))
     except OSError as ex:
         print("Error: {}".format(ex))
+
+
+def test_run_max_procs(init_statick):
+    """
+    Test running tool plugins at the same time.
+
+    Expected results: the same issues and success as a serial run
+    """
+    args = Args("Statick tool")
+    args.parser.add_argument("--path", help="Path of package to scan")
+
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    sys.argv = [
+        "--output-directory",
+        os.path.dirname(__file__),
+        "--path",
+        os.path.dirname(__file__),
+        "--max-procs",
+        "4",
+    ]
+    parsed_args = args.get_args(sys.argv)
+    path = parsed_args.path
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+    issues, success = statick.run(path, parsed_args)
+    parsed_args.max_procs = 1
+    serial_issues, serial_success = statick.run(path, parsed_args)
+    assert list(issues) == list(serial_issues)
+    assert issues == serial_issues
+    assert success == serial_success
+    try:
+        shutil.rmtree(os.path.join(os.path.dirname(__file__), "statick-sei_cert"))
+    except OSError as ex:
+        print("Error: {}".format(ex))
+
+
+class MockToolPlugin(ToolPlugin):
+    """Tool plugin with configurable dependencies that records when it runs."""
+
+    def __init__(self, name, dependencies, ran):
+        """Initialize mock plugin."""
+        super().__init__()
+        self.name = name
+        self.dependencies = dependencies
+        self.ran = ran
+
+    def get_name(self):
+        """Get name of tool."""
+        return self.name
+
+    def get_tool_dependencies(self):
+        """Get a list of tools that must run before this one."""
+        return self.dependencies
+
+    def scan(self, package, level):
+        """Record that the plugin ran."""
+        for dependency in self.dependencies:
+            assert dependency in self.ran
+        self.ran.append(self.name)
+        if self.name == "failing":
+            return None
+        return []
+
+
+def test_run_tool_plugins_dependency_order(init_statick):
+    """
+    Test that tool plugins run after their dependencies in parallel mode.
+
+    Expected results: dependencies finish first and failures are reported as None
+    """
+    ran = []
+    init_statick.tool_plugins = {
+        "make": MockToolPlugin("make", [], ran),
+        "clang-tidy": MockToolPlugin("clang-tidy", ["make"], ran),
+        "failing": MockToolPlugin("failing", ["clang-tidy"], ran),
+        "other": MockToolPlugin("other", [], ran),
+    }
+    plugins = ["make", "clang-tidy", "failing", "other"]
+    results = init_statick.run_tool_plugins(None, "level", plugins, 3)
+    assert sorted(ran) == sorted(plugins)
+    assert results["make"] == []
+    assert results["failing"] is None
+
+
+def test_run_tool_plugin_inputs_unchanged(init_statick):
+    """
+    Test that a tool plugin is skipped when none of its inputs changed.
+
+    Expected results: the plugin does not run and no issues are returned
+    """
+    ran = []
+    plugin = MockToolPlugin("make", [], ran)
+    plugin.inputs_changed = lambda package: False
+    assert init_statick.run_tool_plugin(plugin, None, "level") == []
+    assert not ran
+
+
+@mock.patch("statick_tool.statick.get_job_server")
+def test_run_tool_plugin_job_server(mock_get_job_server, init_statick):
+    """
+    Test that a tool plugin holds a job from the job budget while it runs.
+
+    Expected results: the plugin runs inside a job
+    """
+    ran = []
+    jobs = []
+
+    @contextlib.contextmanager
+    def job():
+        jobs.append("start")
+        yield
+        jobs.append("end")
+
+    plugin = MockToolPlugin("make", [], ran)
+    plugin.scan = lambda package, level: jobs.append("scan") or []
+    mock_get_job_server.return_value.job = job
+    assert init_statick.run_tool_plugin(plugin, None, "level") == []
+    assert jobs == ["start", "scan", "end"]
+
+
+def test_get_tool_plugins_to_run_cycle(init_statick):
+    """
+    Test that a dependency cycle between tool plugins is detected.
+
+    Expected results: None is returned
+    """
+    args = Args("Statick tool")
+    init_statick.gather_args(args.parser)
+    parsed_args = args.get_args([])
+    init_statick.get_config(parsed_args)
+    init_statick.config.config = {"levels": {"level": {"tool": {"a": {}, "b": {}}}}}
+    init_statick.tool_plugins = {
+        "a": MockToolPlugin("a", ["b"], []),
+        "b": MockToolPlugin("b", ["a"], []),
+    }
+    assert init_statick.get_tool_plugins_to_run("level", parsed_args) is None
+
+    init_statick.tool_plugins["b"] = MockToolPlugin("b", [], [])
+    assert init_statick.get_tool_plugins_to_run("level", parsed_args) == ["b", "a"]
+
+
+def test_scan_package_worker():
+    """
+    Test scanning a package the way a parallel statick_ws worker does.
+
+    Expected results: issues match a normal run and the working directory is restored
+    """
+    args = Args("Statick tool")
+    args.parser.add_argument("--path", help="Path of package to scan")
+
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    sys.argv = [
+        "--path",
+        os.path.dirname(__file__),
+        "--force-tool-list",
+        "bandit",
+    ]
+    parsed_args = args.get_args(sys.argv)
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+
+    orig_path = os.getcwd()
+    init_package_worker([], parsed_args)
+    issues, success = scan_package_worker(parsed_args.path, parsed_args)
+    assert os.getcwd() == orig_path
+    assert success
+    assert issues == statick.run(parsed_args.path, parsed_args)[0]
@@ -0,0 +1,93 @@
+"""Unit tests for the timings module."""
+import subprocess
+import sys
+
+import pytest
+
+from statick_tool.timings import Timing, Timings, read_timings
+
+
+def test_timings_measure():
+    """
+    Test measuring work done for a package.
+
+    Expected result: one measurement for the current package with its phase
+    and name
+    """
+    timings = Timings()
+    timings.package = "package"
+    with timings.measure("tool", "pylint"):
+        sum(range(1000))
+    assert len(timings) == 1
+    timing = timings.get_timings()[0]
+    assert (timing.package, timing.phase, timing.name) == ("package", "tool", "pylint")
+    assert timing.wall_time >= 0
+    assert timing.cpu_time >= 0
+
+
+def test_timings_measure_exception():
+    """
+    Test measuring work that raises an exception.
+
+    Expected result: the exception is raised and the work is still measured
+    """
+    timings = Timings()
+    with pytest.raises(ValueError):
+        with timings.measure("discovery", "C"):
+            raise ValueError("failed")
+    assert [timing.name for timing in timings.get_timings()] == ["C"]
+
+
+@pytest.mark.skipif(
+    not hasattr(sys, "addaudithook"), reason="processes are counted from Python 3.8"
+)
+def test_timings_measure_subprocesses():
+    """
+    Test counting the processes started while measuring.
+
+    Expected result: the processes started inside the context are counted
+    """
+    timings = Timings()
+    subprocess.check_output([sys.executable, "-c", "pass"])
+    with timings.measure("tool", "tool_a"):
+        subprocess.check_output([sys.executable, "-c", "pass"])
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+    assert timings.get_timings()[0].subprocesses == 2
+
+
+def test_timings_get_timings():
+    """
+    Test getting the measurements of a package or phase.
+
+    Expected result: measurements are filtered and sorted by wall time
+    """
+    timings = Timings()
+    timings.add(Timing("a", "tool", "pylint", 3.0, 1.0, None, None, 1))
+    timings.add(Timing("a", "reporting", "write_sarif", 1.0, 1.0, None, None, 0))
+    timings.add(Timing("b", "tool", "pylint", 2.0, 1.0, None, None, 1))
+    assert [timing.package for timing in timings.get_timings(phase="tool")] == [
+        "a",
+        "b",
+    ]
+    assert [timing.name for timing in timings.get_timings(package="a")] == [
+        "pylint",
+        "write_sarif",
+    ]
+    assert [timing.wall_time for timing in timings.get_slowest(2)] == [3.0, 2.0]
+
+
+def test_timings_write(tmpdir):
+    """
+    Test writing measurements to a file.
+
+    Expected result: measurements are appended and read back unchanged
+    """
+    output = tmpdir.join("timings.jsonl").strpath
+    timings = Timings()
+    first = Timing("a", "tool", "pylint", 3.0, 1.5, 1024, 2048, 1)
+    second = Timing("b", "tool", "pylint", 2.0, 1.0, None, None, None)
+    timings.add(first)
+    timings.write(output)
+    timings.add(second)
+    timings.write(output, 1)
+    assert read_timings(output) == [first, second]
@@ -4,10 +4,14 @@ import os
 import stat
 import sys
 import tempfile
+import threading
+import time
 
 import pytest
 
+from statick_tool import tool_plugin
 from statick_tool.config import Config
+from statick_tool.job_server import JobServer
 from statick_tool.plugin_context import PluginContext
 from statick_tool.resources import Resources
 from statick_tool.tool_plugin import ToolPlugin
@@ -200,6 +204,135 @@ def test_tool_dependencies():
     assert tp.get_tool_dependencies() == []
 
 
+def test_tool_plugin_get_file_chunks():
+    """Test that files are split into chunks that fit on a command line."""
+    files = ["a.py", "bb.py", "ccc.py", "dddd.py"]
+    assert ToolPlugin.get_file_chunks(files) == [files]
+    assert ToolPlugin.get_file_chunks(files, 12) == [
+        ["a.py", "bb.py"],
+        ["ccc.py"],
+        ["dddd.py"],
+    ]
+    # A single file longer than the limit still gets its own chunk.
+    assert ToolPlugin.get_file_chunks(["long_filename.py"], 4) == [
+        ["long_filename.py"]
+    ]
+    assert ToolPlugin.get_file_chunks([]) == []
+
+
+def test_tool_plugin_map_files():
+    """Test that functions called on a thread pool give results in order."""
+    files = ["{}.py".format(i) for i in range(20)]
+    assert ToolPlugin.map_files(lambda filename: filename + "c", files) == [
+        filename + "c" for filename in files
+    ]
+    assert ToolPlugin.map_files(len, []) == []
+
+    def fail(filename):
+        if filename in ("3.py", "7.py"):
+            raise ValueError(filename)
+        return filename
+
+    with pytest.raises(ValueError, match="3.py"):
+        ToolPlugin.map_files(fail, files)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="Job server requires POSIX pipes")
+def test_tool_plugin_map_files_job_server(monkeypatch):
+    """Test that files run on a thread pool stay within the job budget."""
+    read_fd, write_fd = os.pipe()
+    server = JobServer(read_fd, write_fd)
+    # A budget of two jobs, one of them held by the tool plugin.
+    os.write(write_fd, b"+")
+    monkeypatch.setattr(tool_plugin, "get_job_server", lambda: server)
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def run(filename):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return filename
+
+    files = ["{}.py".format(i) for i in range(8)]
+    try:
+        assert ToolPlugin.map_files(run, files) == files
+        assert os.read(read_fd, 2) == b"+"
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+    assert running[1] <= 2
+
+
+def test_tool_plugin_get_cached_scan(monkeypatch):
+    """Test that cached results are only used when the cache is enabled."""
+    monkeypatch.setattr(ToolPlugin, "get_name", lambda self: "tool")
+    monkeypatch.setattr(ToolPlugin, "get_version", lambda self: "1.0")
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--no-cache", dest="no_cache", action="store_true")
+    arg_parser.add_argument("--cache-directory", dest="cache_directory")
+    arg_parser.add_argument(
+        "--cache-max-size", dest="cache_max_size", type=float, default=1
+    )
+    with TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "a.py")
+        with open(path, "w") as fid:
+            fid.write("a = 1\n")
+        cache_args = ["--cache-directory", os.path.join(tmp_dir, "cache")]
+
+        tp = ToolPlugin()
+        assert tp.get_cached_scan([path], "level", []).cache is None
+
+        tp.set_plugin_context(
+            PluginContext(arg_parser.parse_args(cache_args), None, None)
+        )
+        cached_scan = tp.get_cached_scan([path], "level", [])
+        assert cached_scan.files_to_scan == [path]
+        cached_scan.merge([])
+        assert not tp.get_cached_scan([path], "level", []).files_to_scan
+
+        tp.set_plugin_context(
+            PluginContext(
+                arg_parser.parse_args(cache_args + ["--no-cache"]), None, None
+            )
+        )
+        assert tp.get_cached_scan([path], "level", []).files_to_scan == [path]
+
+
+def test_tool_plugin_start_process(monkeypatch):
+    """Test that tool output is logged only when there is an output directory."""
+    monkeypatch.setattr(ToolPlugin, "get_name", lambda self: "tool")
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--output-directory", dest="output_directory")
+    arg_parser.add_argument(
+        "--show-tool-output", dest="show_tool_output", action="store_true"
+    )
+    with TemporaryDirectory() as tmp_dir:
+        monkeypatch.chdir(tmp_dir)
+        tp = ToolPlugin()
+        tp.set_plugin_context(PluginContext(arg_parser.parse_args([]), None, None))
+        with tp.open_log() as log, tp.start_process(
+            [sys.executable, "-c", "print('output')"], log
+        ) as process:
+            assert list(process) == ["output"]
+        assert not os.path.exists("tool.log")
+
+        tp.set_plugin_context(
+            PluginContext(
+                arg_parser.parse_args(["--output-directory", tmp_dir]), None, None
+            )
+        )
+        with tp.open_log() as log, tp.start_process(
+            [sys.executable, "-c", "print('output')"], log
+        ) as process:
+            assert process.wait() == 0
+        with open("tool.log") as log:
+            assert log.read() == "output\n"
+
+
 def test_tool_plugin_is_valid_executable_extension_nopathext(monkeypatch):
     """
     Test that is_valid_executable works correctly with .exe appended, no PATHEXT
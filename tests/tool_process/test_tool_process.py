@@ -0,0 +1,73 @@
+"""Unit tests for the ToolProcess module."""
+import io
+import sys
+
+import pytest
+
+from statick_tool.tool_process import TAIL_LINES, ToolProcess
+
+
+def python_command(code):
+    """Get a command that runs Python code."""
+    return [sys.executable, "-c", code]
+
+
+def test_tool_process_lines():
+    """
+    Test that output is read line by line and written to the log.
+
+    Expected result: lines without line endings, including stderr, and the
+    full output in the log
+    """
+    log = io.StringIO()
+    command = python_command(
+        "import sys; print('one'); sys.stdout.flush(); "
+        "print('two', file=sys.stderr); sys.exit(3)"
+    )
+    with ToolProcess(command, log) as process:
+        assert list(process) == ["one", "two"]
+        assert process.wait() == 3
+    assert log.getvalue() == "one\ntwo\n"
+    assert process.get_tail() == "one\ntwo\n"
+
+
+def test_tool_process_wait_reads_remaining_output():
+    """
+    Test that waiting reads output the parser didn't.
+
+    Expected result: all output is logged and only the last lines are kept
+    """
+    log = io.StringIO()
+    count = TAIL_LINES * 100
+    command = python_command("for i in range({}): print(i)".format(count))
+    with ToolProcess(command, log) as process:
+        assert next(iter(process)) == "0"
+        assert process.wait() == 0
+    assert log.getvalue().splitlines() == [str(i) for i in range(count)]
+    assert process.get_tail().splitlines() == [
+        str(i) for i in range(count - TAIL_LINES, count)
+    ]
+
+
+def test_tool_process_stopped_on_error():
+    """
+    Test that the tool is stopped if parsing its output fails.
+
+    Expected result: the process is no longer running
+    """
+    command = python_command("import time; print('start', flush=True); time.sleep(60)")
+    with pytest.raises(ValueError):
+        with ToolProcess(command) as process:
+            for line in process:
+                raise ValueError(line)
+    assert process.process.poll() is not None
+
+
+def test_tool_process_missing_command():
+    """
+    Test running a command that doesn't exist.
+
+    Expected result: OSError is raised
+    """
+    with pytest.raises(OSError):
+        ToolProcess(["statick-command-that-does-not-exist"])